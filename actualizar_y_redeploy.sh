@@ -29,6 +29,9 @@ fi
 echo "🔄 Re-deploying con Docker Compose..."
 docker-compose down --remove-orphans --volumes --rmi all
 docker-compose up --build -d
+
+echo "🗂️  Aplicando índices pendientes a la base existente..."
+docker-compose exec -T api python -m app.migrations
 docker-compose logs -f --tail=50
 
 echo "✅ Proceso completado con éxito."
@@ -5,6 +5,26 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+    # Base para las lecturas (p. ej. una réplica). Vacío: la misma base en modo solo lectura
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")
+
+    # Perfil de SQLite (se aplica en cada conexión nueva)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", 32 * 1024))
+
+    # Hilos para endpoints síncronos (anyio usa 40 por defecto) y pool de conexiones a juego
+    SYNC_THREADPOOL_SIZE: int = int(os.getenv("SYNC_THREADPOOL_SIZE", 40))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", SYNC_THREADPOOL_SIZE))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    # Pool del engine asíncrono (aiosqlite); no depende del threadpool
+    ASYNC_DB_POOL_SIZE: int = int(os.getenv("ASYNC_DB_POOL_SIZE", 20))
+
+    # Group commit: agrupa las inserciones concurrentes de crud en un solo commit
+    GROUP_COMMIT_ENABLED: bool = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() in ("1", "true", "yes")
+    GROUP_COMMIT_WINDOW_MS: float = float(os.getenv("GROUP_COMMIT_WINDOW_MS", 2))
+    GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 64))
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret-key-that-should-be-changed")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -18,6 +38,57 @@ class Settings:
     # Configuración de Rate Limiting
     RATE_LIMIT_MAX_REQUESTS: int = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", 100))
     RATE_LIMIT_INTERVAL_SECONDS: int = int(os.getenv("RATE_LIMIT_INTERVAL_SECONDS", 60))
+    RATE_LIMIT_MAX_TRACKED_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_TRACKED_KEYS", 100000))
+    # "memory" (por proceso) o "sqlite" (compartido entre workers del mismo host)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SHARED_PATH: str = os.getenv(
+        "RATE_LIMIT_SHARED_PATH",
+        "/dev/shm/kerapido_rate_limit.db" if os.path.isdir("/dev/shm") else "./rate_limit.db",
+    )
+    # Backend "sqlite": espera máxima por el lock de escritura y qué hacer si se agota
+    # o la base falla: "allow" (deja pasar la petición) o "deny" (429 con Retry-After: 1)
+    RATE_LIMIT_SHARED_BUSY_TIMEOUT_MS: int = int(os.getenv("RATE_LIMIT_SHARED_BUSY_TIMEOUT_MS", 50))
+    RATE_LIMIT_SHARED_ON_ERROR: str = os.getenv("RATE_LIMIT_SHARED_ON_ERROR", "allow")
+    # Coste por prefijo de ruta ("prefijo=coste,..."); el resto de rutas cuesta 1
+    RATE_LIMIT_ROUTE_COSTS: str = os.getenv(
+        "RATE_LIMIT_ROUTE_COSTS", "/auth/token=10,/auth/signup=5,/registro=5,/catalogos=0.5"
+    )
+
+    # Máximo de elementos por petición en los endpoints /bulk
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", 5000))
+
+    # Máximo de ids por petición en los endpoints /batch
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", 500))
+
+    # Difusión de notificaciones: usuarios por INSERT ... SELECT y trabajos en segundo plano
+    DIFUSION_CHUNK_SIZE: int = int(os.getenv("DIFUSION_CHUNK_SIZE", 5000))
+    TRABAJOS_WORKERS: int = int(os.getenv("TRABAJOS_WORKERS", 2))
+    TRABAJOS_MAX_HISTORIAL: int = int(os.getenv("TRABAJOS_MAX_HISTORIAL", 1000))
+    # Sin progreso en este tiempo, un trabajo en_curso se da por abandonado (worker caído) y otro lo retoma
+    TRABAJOS_CONCESION_S: int = int(os.getenv("TRABAJOS_CONCESION_S", 60))
+
+    # Caché de catálogos (/catalogos/*): la versión por tabla invalida al escribir en este
+    # proceso; el TTL acota cuánto tarda en verse una escritura hecha desde otro worker
+    CATALOGO_CACHE_TTL_SECONDS: int = int(os.getenv("CATALOGO_CACHE_TTL_SECONDS", 300))
+
+    # Caché de respuestas GET (@cache_respuesta): entradas por proceso y TTL por defecto.
+    # Un acierto no vuelve a autenticar: una baja hecha en otro worker tarda hasta el TTL en notarse aquí
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 10000))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+
+    # Compresión de respuestas (gzip, y brotli si está instalado): por debajo de este
+    # tamaño la cabecera y el coste de CPU no compensan
+    COMPRESION_MIN_BYTES: int = int(os.getenv("COMPRESION_MIN_BYTES", 500))
+
+    # Caché de usuarios autenticados (get_current_user). Una escritura en usuarios la
+    # invalida en este proceso; en los demás workers el cambio (p. ej. desactivar un
+    # usuario) tarda como mucho PRINCIPAL_CACHE_TTL_SECONDS en verse
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+
+    # Pool dedicado para verificar contraseñas en /auth/token
+    LOGIN_HASH_WORKERS: int = int(os.getenv("LOGIN_HASH_WORKERS", 4))
+    LOGIN_HASH_QUEUE_DEPTH: int = int(os.getenv("LOGIN_HASH_QUEUE_DEPTH", 32))
 
 
 settings = Settings()
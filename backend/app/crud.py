@@ -1,17 +1,69 @@
-from sqlalchemy.orm import Session
+from typing import Optional, Sequence
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from . import models, schemas
+from .config import settings
 from .security import get_password_hash
 from .exceptions import NotFoundException, ConflictException, ForbiddenException
 from .utils.logging_config import logger
+from .utils.campos import opciones_carga
+from .utils.group_commit import group_commit_writer
+from .utils.paginacion import paginar
+from .utils.principal_cache import principal_cache
+
+
+# Claves de orden de los listados paginados por cursor (la última columna es la PK)
+ORDEN_USUARIOS = (models.Usuario.id_usuario,)
+ORDEN_CONDUCTORES = (models.Conductor.id_conductor,)
+ORDEN_RUTAS = (models.Ruta.id_ruta,)
+ORDEN_SOLICITUDES = (models.Solicitud.fecha_solicitud, models.Solicitud.id_solicitud)
+
+# Parámetros por consulta IN (...): muy por debajo del límite de variables de SQLite
+_BLOQUE_IN = 500
+
+
+def _persistir(db: Session, db_obj):
+    """
+    Inserta `db_obj` y confirma. Con GROUP_COMMIT_ENABLED el commit lo hace el
+    escritor de group commit junto con las inserciones concurrentes de otros
+    hilos; el objeto devuelto queda en la sesión `db` como si se hubiera
+    insertado en ella.
+    """
+    if group_commit_writer is None:
+        db.add(db_obj)
+        db.commit()
+        return db_obj
+    insertado = group_commit_writer.run(lambda session: session.add(db_obj) or db_obj)
+    return db.merge(insertado, load=False)
 
 
 # --- CRUD para Usuario ---
 
 
-def get_usuario(db: Session, usuario_id: int):
-    """Obtiene un usuario por su ID."""
+def _consulta(db: Session, modelo, campos: Optional[Sequence[str]], obligatorias=()):
+    """Consulta de `modelo`; con `campos`, solo lee esas columnas (ver app.utils.campos)."""
+    query = db.query(modelo)
+    if campos is not None:
+        query = query.options(*opciones_carga(modelo, campos, obligatorias))
+    return query
+
+
+def _por_ids(db: Session, modelo, columna, ids: Sequence[int], campos: Optional[Sequence[str]], obligatorias=()) -> dict:
+    """Filas de `modelo` cuyo `columna` está en `ids`, con IN por bloques. Devuelve {id: fila}."""
+    ids = list(dict.fromkeys(ids))
+    encontrados = {}
+    for i in range(0, len(ids), _BLOQUE_IN):
+        query = _consulta(db, modelo, campos, obligatorias).filter(columna.in_(ids[i:i + _BLOQUE_IN]))
+        encontrados.update((getattr(fila, columna.key), fila) for fila in query)
+    return encontrados
+
+
+def get_usuario(db: Session, usuario_id: int, campos: Optional[Sequence[str]] = None):
+    """Obtiene un usuario por su ID. Con `campos`, solo carga esos atributos (y la PK)."""
     logger.info(f"Obteniendo usuario con id: {usuario_id}")
-    db_usuario = db.query(models.Usuario).filter(models.Usuario.id_usuario == usuario_id).first()
+    db_usuario = _consulta(db, models.Usuario, campos).filter(models.Usuario.id_usuario == usuario_id).first()
     if not db_usuario:
         raise NotFoundException(detail=f"Usuario con id {usuario_id} no encontrado.")
     return db_usuario
@@ -23,21 +75,64 @@ def get_usuario_by_email(db: Session, email: str):
     return db.query(models.Usuario).filter(models.Usuario.email == email).first()
 
 
-def get_usuarios(db: Session, skip: int = 0, limit: int = 100):
-    """Obtiene una lista de todos los usuarios."""
-    logger.info(f"Obteniendo lista de usuarios, skip={skip}, limit={limit}")
-    return db.query(models.Usuario).offset(skip).limit(limit).all()
+def get_usuarios(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, campos: Optional[Sequence[str]] = None
+):
+    """
+    Obtiene una lista de todos los usuarios, ordenada por ID.
+    Con `cursor` continúa tras la última página (y se ignora `skip`).
+    Con `campos`, solo carga esos atributos (y los del orden).
+    """
+    logger.info(f"Obteniendo lista de usuarios, skip={skip}, limit={limit}, cursor={cursor}")
+    query = paginar(_consulta(db, models.Usuario, campos, ORDEN_USUARIOS), ORDEN_USUARIOS, cursor)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def get_usuarios_by_ids(db: Session, ids: Sequence[int], campos: Optional[Sequence[str]] = None):
+    """Obtiene varios usuarios por ID en una consulta. Devuelve {id: usuario} con los que existen."""
+    logger.info(f"Obteniendo {len(ids)} usuarios por id")
+    return _por_ids(db, models.Usuario, models.Usuario.id_usuario, ids, campos)
+
+
+# Columnas únicas de usuarios y el mensaje de conflicto de cada una
+_DUPLICADOS_USUARIO = {
+    "email": "El correo electrónico ya está registrado.",
+    "telefono": "El teléfono ya está registrado.",
+    "carnet_identidad": "El carnet de identidad ya está registrado.",
+}
+
+
+def _conflicto_usuario(exc: IntegrityError) -> ConflictException:
+    """Traduce la violación de una restricción UNIQUE de usuarios en un 409."""
+    mensaje = str(exc.orig)
+    for columna, detalle in _DUPLICADOS_USUARIO.items():
+        if columna in mensaje:
+            return ConflictException(detail=detalle)
+    return ConflictException(detail="El usuario ya está registrado.")
+
+
+def _guardar_usuario(db: Session, db_usuario: models.Usuario):
+    """
+    Inserta el usuario (y lo que cuelgue de él) en un solo commit. Los
+    duplicados los detectan los índices únicos de la base, sin lecturas
+    previas que además no protegen frente a dos altas simultáneas.
+    """
+    db.add(db_usuario)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if "UNIQUE" not in str(exc.orig).upper():
+            raise
+        raise _conflicto_usuario(exc) from exc
+    return db_usuario
 
 
-def create_usuario(db: Session, usuario: schemas.UsuarioCreate):
-    """Crea un nuevo usuario en la base de datos."""
-    logger.info(f"Creando nuevo usuario con email: {usuario.email}")
-    db_usuario = get_usuario_by_email(db, email=usuario.email)
-    if db_usuario:
-        raise ConflictException(detail="El correo electrónico ya está registrado.")
-    
+def _nuevo_usuario(usuario: schemas.UsuarioCreate) -> models.Usuario:
     hashed_password = get_password_hash(usuario.password)
-    db_usuario = models.Usuario(
+    return models.Usuario(
         email=usuario.email,
         nombre=usuario.nombre,
         apellidos=usuario.apellidos,
@@ -50,10 +145,23 @@ def create_usuario(db: Session, usuario: schemas.UsuarioCreate):
         domicilio_actual=usuario.domicilio_actual,
         codigo_postal=usuario.codigo_postal,
     )
-    db.add(db_usuario)
-    db.commit()
-    db.refresh(db_usuario)
-    return db_usuario
+
+
+def create_usuario(db: Session, usuario: schemas.UsuarioCreate):
+    """Crea un nuevo usuario en la base de datos."""
+    logger.info(f"Creando nuevo usuario con email: {usuario.email}")
+    return _guardar_usuario(db, _nuevo_usuario(usuario))
+
+
+def create_usuario_cliente(db: Session, usuario: schemas.UsuarioCreate, id_tipo_cliente: Optional[int] = None):
+    """
+    Registra un usuario junto con su perfil de cliente en una sola
+    transacción: o se crean los dos o ninguno.
+    """
+    logger.info(f"Registrando nuevo cliente con email: {usuario.email}")
+    db_usuario = _nuevo_usuario(usuario)
+    db_usuario.cliente = models.Cliente(id_tipo_cliente=id_tipo_cliente)
+    return _guardar_usuario(db, db_usuario)
 
 
 def update_usuario(db: Session, usuario_id: int, usuario: schemas.UsuarioUpdate):
@@ -61,14 +169,15 @@ def update_usuario(db: Session, usuario_id: int, usuario: schemas.UsuarioUpdate)
     logger.info(f"Actualizando usuario con id: {usuario_id}")
     db_usuario = get_usuario(db, usuario_id)
     # The get_usuario function already raises NotFoundException if the user doesn't exist.
-    
+    principal_cache.invalidate(db_usuario.email)
+
     for key, value in usuario.model_dump(exclude_unset=True).items():
         if key == "password":
             db_usuario.password_hash = get_password_hash(value)
         else:
             setattr(db_usuario, key, value)
     db.commit()
-    db.refresh(db_usuario)
+    principal_cache.invalidate(db_usuario.email)
     return db_usuario
 
 
@@ -80,6 +189,7 @@ def delete_usuario(db: Session, usuario_id: int):
     
     db.delete(db_usuario)
     db.commit()
+    principal_cache.invalidate(db_usuario.email)
     return db_usuario
 
 
@@ -105,22 +215,44 @@ def create_cliente(db: Session, cliente: schemas.ClienteCreate):
     db_cliente = models.Cliente(**cliente.model_dump())
     db.add(db_cliente)
     db.commit()
-    db.refresh(db_cliente)
     return db_cliente
 
 
+def get_cliente_by_user_id(db: Session, usuario_id: int):
+    """Obtiene el perfil de cliente de un usuario, o None si no lo tiene."""
+    logger.info(f"Obteniendo cliente del usuario con id: {usuario_id}")
+    return db.query(models.Cliente).filter(models.Cliente.id_usuario == usuario_id).first()
+
+
 # --- CRUD para Conductor ---
 
 
-def get_conductor(db: Session, conductor_id: int):
-    """Obtiene un conductor por su ID."""
+def get_conductor(db: Session, conductor_id: int, campos: Optional[Sequence[str]] = None):
+    """Obtiene un conductor por su ID. Con `campos`, solo carga esos atributos (y la PK)."""
     logger.info(f"Obteniendo conductor con id: {conductor_id}")
-    db_conductor = db.query(models.Conductor).filter(models.Conductor.id_conductor == conductor_id).first()
+    db_conductor = (
+        _consulta(db, models.Conductor, campos).filter(models.Conductor.id_conductor == conductor_id).first()
+    )
     if not db_conductor:
         raise NotFoundException(detail=f"Conductor con id {conductor_id} no encontrado.")
     return db_conductor
 
 
+def get_conductores_by_ids(db: Session, ids: Sequence[int], campos: Optional[Sequence[str]] = None):
+    """
+    Obtiene varios conductores por ID en una consulta. Devuelve {id: conductor}
+    con los que existen; siempre carga id_usuario (para los permisos).
+    """
+    logger.info(f"Obteniendo {len(ids)} conductores por id")
+    return _por_ids(db, models.Conductor, models.Conductor.id_conductor, ids, campos, (models.Conductor.id_usuario,))
+
+
+def get_conductor_by_user_id(db: Session, usuario_id: int):
+    """Obtiene el perfil de conductor de un usuario, o None si no lo tiene."""
+    logger.info(f"Obteniendo conductor del usuario con id: {usuario_id}")
+    return db.query(models.Conductor).filter(models.Conductor.id_usuario == usuario_id).first()
+
+
 def create_conductor(db: Session, conductor: schemas.ConductorCreate):
     """Crea un nuevo conductor asociado a un usuario."""
     logger.info(f"Creando nuevo conductor para el usuario {conductor.id_usuario}")
@@ -131,14 +263,22 @@ def create_conductor(db: Session, conductor: schemas.ConductorCreate):
     db_conductor = models.Conductor(**conductor.model_dump())
     db.add(db_conductor)
     db.commit()
-    db.refresh(db_conductor)
     return db_conductor
 
 
-def get_conductores(db: Session, skip: int = 0, limit: int = 100):
-    """Obtiene una lista de todos los conductores."""
-    logger.info(f"Obteniendo lista de conductores, skip={skip}, limit={limit}")
-    return db.query(models.Conductor).offset(skip).limit(limit).all()
+def get_conductores(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, campos: Optional[Sequence[str]] = None
+):
+    """
+    Obtiene una lista de todos los conductores, ordenada por ID.
+    Con `cursor` continúa tras la última página (y se ignora `skip`).
+    Con `campos`, solo carga esos atributos (y los del orden).
+    """
+    logger.info(f"Obteniendo lista de conductores, skip={skip}, limit={limit}, cursor={cursor}")
+    query = paginar(_consulta(db, models.Conductor, campos, ORDEN_CONDUCTORES), ORDEN_CONDUCTORES, cursor)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 # --- CRUD para Vehiculo ---
@@ -153,6 +293,12 @@ def get_vehiculo(db: Session, vehiculo_id: int):
     return db_vehiculo
 
 
+def get_vehiculos_by_ids(db: Session, ids: Sequence[int]):
+    """Obtiene varios vehículos por ID en una consulta. Devuelve {id: vehiculo} con los que existen."""
+    logger.info(f"Obteniendo {len(ids)} vehículos por id")
+    return _por_ids(db, models.Vehiculo, models.Vehiculo.id_vehiculo, ids, None)
+
+
 def get_vehiculos_by_conductor(db: Session, conductor_id: int):
     """Obtiene todos los vehículos de un conductor específico."""
     logger.info(f"Obteniendo vehículos para el conductor con id: {conductor_id}")
@@ -161,30 +307,63 @@ def get_vehiculos_by_conductor(db: Session, conductor_id: int):
 
 def create_vehiculo(db: Session, vehiculo: schemas.VehiculoCreate):
     """Crea un nuevo vehículo para un conductor."""
-    logger.info(f"Creando nuevo vehículo con placa: {vehiculo.placa}")
-    db_vehiculo = db.query(models.Vehiculo).filter(models.Vehiculo.placa == vehiculo.placa).first()
+    logger.info(f"Creando nuevo vehículo con matrícula: {vehiculo.matricula}")
+    db_vehiculo = db.query(models.Vehiculo).filter(models.Vehiculo.matricula == vehiculo.matricula).first()
     if db_vehiculo:
-        raise ConflictException(detail="Ya existe un vehículo con esa placa.")
+        raise ConflictException(detail="Ya existe un vehículo con esa matrícula.")
         
     db_vehiculo = models.Vehiculo(**vehiculo.model_dump())
     db.add(db_vehiculo)
     db.commit()
-    db.refresh(db_vehiculo)
     return db_vehiculo
 
 
 # --- CRUD para Solicitud ---
 
 
-def get_solicitud(db: Session, solicitud_id: int):
-    """Obtiene una solicitud por su ID."""
+def get_solicitud(db: Session, solicitud_id: int, campos: Optional[Sequence[str]] = None):
+    """Obtiene una solicitud por su ID. Con `campos`, solo carga esos atributos (y la PK)."""
     logger.info(f"Obteniendo solicitud con id: {solicitud_id}")
-    db_solicitud = db.query(models.Solicitud).filter(models.Solicitud.id_solicitud == solicitud_id).first()
+    db_solicitud = (
+        _consulta(db, models.Solicitud, campos).filter(models.Solicitud.id_solicitud == solicitud_id).first()
+    )
     if not db_solicitud:
         raise NotFoundException(detail=f"Solicitud con id {solicitud_id} no encontrada.")
     return db_solicitud
 
 
+def get_solicitudes(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, campos: Optional[Sequence[str]] = None
+):
+    """
+    Obtiene todas las solicitudes, de la más reciente a la más antigua.
+    Con `cursor` continúa tras la última página (y se ignora `skip`).
+    Con `campos`, solo carga esos atributos (y los del orden).
+
+    Las solicitudes sin fecha_solicitud (filas antiguas) no se listan en
+    ninguna página: un NULL no tiene posición en el orden por (fecha, id).
+    """
+    logger.info(f"Obteniendo lista de solicitudes, skip={skip}, limit={limit}, cursor={cursor}")
+    query = _consulta(db, models.Solicitud, campos, ORDEN_SOLICITUDES).filter(
+        models.Solicitud.fecha_solicitud.isnot(None)
+    )
+    query = paginar(query, ORDEN_SOLICITUDES, cursor, descendente=True)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def get_solicitudes_by_ids(db: Session, ids: Sequence[int], campos: Optional[Sequence[str]] = None):
+    """
+    Obtiene varias solicitudes por ID en una consulta. Devuelve {id: solicitud}
+    con las que existen; siempre carga id_cliente (para los permisos).
+    """
+    logger.info(f"Obteniendo {len(ids)} solicitudes por id")
+    return _por_ids(
+        db, models.Solicitud, models.Solicitud.id_solicitud, ids, campos, (models.Solicitud.id_cliente,)
+    )
+
+
 def get_solicitudes_by_cliente(db: Session, cliente_id: int):
     """Obtiene todas las solicitudes de un cliente específico."""
     logger.info(f"Obteniendo solicitudes para el cliente con id: {cliente_id}")
@@ -195,9 +374,29 @@ def create_solicitud(db: Session, solicitud: schemas.SolicitudCreate):
     """Crea una nueva solicitud de servicio."""
     logger.info(f"Creando nueva solicitud para el cliente {solicitud.id_cliente}")
     db_solicitud = models.Solicitud(**solicitud.model_dump())
-    db.add(db_solicitud)
-    db.commit()
-    db.refresh(db_solicitud)
+    return _persistir(db, db_solicitud)
+
+
+def get_viaje(db: Session, solicitud_id: int):
+    """
+    Obtiene una solicitud con todo su viaje en una sola consulta: cliente,
+    asignación, conductor (con su usuario), vehículo y pago.
+    """
+    logger.info(f"Obteniendo viaje de la solicitud con id: {solicitud_id}")
+    asignacion = joinedload(models.Solicitud.asignacion)
+    db_solicitud = (
+        db.query(models.Solicitud)
+        .options(
+            joinedload(models.Solicitud.cliente),
+            asignacion.joinedload(models.Asignacion.conductor).joinedload(models.Conductor.usuario),
+            asignacion.joinedload(models.Asignacion.vehiculo),
+            asignacion.joinedload(models.Asignacion.pago),
+        )
+        .filter(models.Solicitud.id_solicitud == solicitud_id)
+        .first()
+    )
+    if not db_solicitud:
+        raise NotFoundException(detail=f"Solicitud con id {solicitud_id} no encontrada.")
     return db_solicitud
 
 
@@ -213,6 +412,27 @@ def get_asignacion(db: Session, asignacion_id: int):
     return db_asignacion
 
 
+def get_asignacion_detalle(db: Session, asignacion_id: int):
+    """
+    Obtiene una asignación junto con su solicitud, el cliente de la solicitud
+    y el conductor, en una sola consulta. Basta para comprobar quién participa
+    en la asignación sin consultas adicionales.
+    """
+    logger.info(f"Obteniendo detalle de la asignación con id: {asignacion_id}")
+    db_asignacion = (
+        db.query(models.Asignacion)
+        .options(
+            joinedload(models.Asignacion.solicitud).joinedload(models.Solicitud.cliente),
+            joinedload(models.Asignacion.conductor),
+        )
+        .filter(models.Asignacion.id_asignacion == asignacion_id)
+        .first()
+    )
+    if not db_asignacion:
+        raise NotFoundException(detail=f"Asignación con id {asignacion_id} no encontrada.")
+    return db_asignacion
+
+
 def get_asignaciones_by_conductor(db: Session, conductor_id: int):
     """Obtiene todas las asignaciones de un conductor."""
     logger.info(f"Obteniendo asignaciones para el conductor con id: {conductor_id}")
@@ -227,21 +447,19 @@ def create_asignacion(db: Session, asignacion: schemas.AsignacionCreate):
         raise ConflictException(detail=f"La solicitud con id {asignacion.id_solicitud} ya tiene una asignación.")
         
     db_asignacion = models.Asignacion(**asignacion.model_dump())
-    db.add(db_asignacion)
-    db.commit()
-    db.refresh(db_asignacion)
-    return db_asignacion
+    return _persistir(db, db_asignacion)
 
 
 def update_asignacion_precio(db: Session, asignacion_id: int, precio_final: float):
     """Actualiza el precio final de una asignación."""
     logger.info(f"Actualizando precio final de la asignación {asignacion_id}")
-    db_asignacion = get_asignacion(db, asignacion_id)
-    # The get_asignacion function already raises NotFoundException if the assignment doesn't exist.
-    
+    # db.get reutiliza la asignación si la sesión ya la cargó (p. ej. para autorizar)
+    db_asignacion = db.get(models.Asignacion, asignacion_id)
+    if not db_asignacion:
+        raise NotFoundException(detail=f"Asignación con id {asignacion_id} no encontrada.")
+
     db_asignacion.precio_final = precio_final
     db.commit()
-    db.refresh(db_asignacion)
     return db_asignacion
 
 
@@ -260,11 +478,9 @@ def get_transaccion_pago(db: Session, transaccion_id: int):
 def create_transaccion_pago(db: Session, pago: schemas.TransaccionPagoCreate):
     """Crea una nueva transacción de pago."""
     logger.info(f"Creando nueva transacción de pago para el usuario {pago.id_usuario}")
-    db_pago = models.TransaccionPago(**pago.model_dump())
-    db.add(db_pago)
-    db.commit()
-    db.refresh(db_pago)
-    return db_pago
+    # `id_usuario` identifica al pagador en la petición; la tabla no lo guarda
+    db_pago = models.TransaccionPago(**pago.model_dump(exclude={"id_usuario"}))
+    return _persistir(db, db_pago)
 
 
 # --- CRUD para Notificacion ---
@@ -280,10 +496,69 @@ def create_notificacion(db: Session, notificacion: schemas.NotificacionCreate):
     """Crea una nueva notificación para un usuario."""
     logger.info(f"Creando nueva notificación para el usuario {notificacion.id_usuario}")
     db_notificacion = models.Notificacion(**notificacion.model_dump())
-    db.add(db_notificacion)
-    db.commit()
-    db.refresh(db_notificacion)
-    return db_notificacion
+    return _persistir(db, db_notificacion)
+
+
+def _consulta_segmento(segmento: schemas.SegmentoNotificacion, *columnas):
+    """SELECT de `columnas` sobre los usuarios del segmento."""
+    consulta = select(*columnas).select_from(models.Usuario)
+    for campo in ("es_cliente", "es_conductor", "es_admin"):
+        valor = getattr(segmento, campo)
+        if valor is not None:
+            consulta = consulta.where(getattr(models.Usuario, campo) == valor)
+    if segmento.id_tipo_cliente is not None:
+        consulta = consulta.join(models.Cliente, models.Cliente.id_usuario == models.Usuario.id_usuario).where(
+            models.Cliente.id_tipo_cliente == segmento.id_tipo_cliente
+        )
+    if segmento.id_estados_conductor:
+        consulta = consulta.join(models.Conductor, models.Conductor.id_usuario == models.Usuario.id_usuario).where(
+            models.Conductor.id_estado_conductor.in_(segmento.id_estados_conductor)
+        )
+    return consulta
+
+
+def difundir_notificacion(db: Session, difusion: schemas.DifusionCreate, trabajo=None, tamano_bloque: Optional[int] = None):
+    """
+    Crea la notificación para todos los usuarios del segmento sin cargarlos en
+    Python: un INSERT ... SELECT por rango de `tamano_bloque` ids de usuario,
+    con un commit por rango para no retener el lock de escritura.
+
+    Con un `trabajo` (Ejecucion de app.utils.trabajos) es reanudable: empieza
+    después de `trabajo.ultimo_id` y cada rango registra su progreso con
+    `trabajo.avanzar` en la misma transacción que sus notificaciones, así que
+    retomarlo no duplica ni pierde ninguna. Devuelve el número de
+    notificaciones creadas en esta ejecución.
+    """
+    tamano_bloque = tamano_bloque or settings.DIFUSION_CHUNK_SIZE
+    id_usuario = models.Usuario.id_usuario
+    total, primero, ultimo = db.execute(
+        _consulta_segmento(difusion.segmento, func.count(), func.min(id_usuario), func.max(id_usuario))
+    ).one()
+    logger.info(f"Difundiendo notificación '{difusion.titulo}' a {total} usuarios")
+    if trabajo is not None:
+        trabajo.fijar_total(db, total)
+        if trabajo.ultimo_id is not None and primero is not None:
+            primero = max(primero, trabajo.ultimo_id + 1)
+
+    creadas = 0
+    if not total:
+        return creadas
+    seleccion = _consulta_segmento(
+        difusion.segmento, literal(difusion.titulo), literal(difusion.mensaje), id_usuario
+    )
+    for desde in range(primero, ultimo + 1, tamano_bloque):
+        hasta = min(desde + tamano_bloque, ultimo + 1) - 1
+        resultado = db.execute(
+            insert(models.Notificacion).from_select(
+                ["titulo", "mensaje", "id_usuario"],
+                seleccion.where(id_usuario >= desde, id_usuario <= hasta),
+            )
+        )
+        if trabajo is not None:
+            trabajo.avanzar(db, hasta, resultado.rowcount)
+        db.commit()
+        creadas += resultado.rowcount
+    return creadas
 
 
 # --- CRUD para Incidente ---
@@ -302,10 +577,7 @@ def create_incidente(db: Session, incidente: schemas.IncidenteCreate):
     """Crea un nuevo incidente."""
     logger.info(f"Creando nuevo incidente para el usuario {incidente.id_usuario}")
     db_incidente = models.Incidente(**incidente.model_dump())
-    db.add(db_incidente)
-    db.commit()
-    db.refresh(db_incidente)
-    return db_incidente
+    return _persistir(db, db_incidente)
 
 
 # --- CRUD para Ruta ---
@@ -320,19 +592,24 @@ def get_ruta(db: Session, ruta_id: int):
     return db_ruta
 
 
-def get_rutas(db: Session, skip: int = 0, limit: int = 100):
-    """Obtiene todas las rutas disponibles."""
-    logger.info(f"Obteniendo rutas, skip={skip}, limit={limit}")
-    return db.query(models.Ruta).offset(skip).limit(limit).all()
+def get_rutas(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """
+    Obtiene todas las rutas disponibles, ordenadas por ID.
+    Con `cursor` continúa tras la última página (y se ignora `skip`).
+    """
+    logger.info(f"Obteniendo rutas, skip={skip}, limit={limit}, cursor={cursor}")
+    query = paginar(db.query(models.Ruta), ORDEN_RUTAS, cursor)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 def create_ruta(db: Session, ruta: schemas.RutaCreate):
     """Crea una nueva ruta."""
-    logger.info(f"Creando nueva ruta con origen: {ruta.origen} y destino: {ruta.destino}")
+    logger.info(f"Creando nueva ruta: {ruta.nombre}")
     db_ruta = models.Ruta(**ruta.model_dump())
     db.add(db_ruta)
     db.commit()
-    db.refresh(db_ruta)
     return db_ruta
 
 
@@ -352,7 +629,6 @@ def create_conductor_servicio(db: Session, servicio: schemas.ConductorServicioCr
     db_servicio = models.ConductorServicio(**servicio.model_dump())
     db.add(db_servicio)
     db.commit()
-    db.refresh(db_servicio)
     return db_servicio
 
 
@@ -362,6 +638,165 @@ def get_servicios_by_conductor(db: Session, conductor_id: int):
     return db.query(models.ConductorServicio).filter(models.ConductorServicio.id_conductor == conductor_id).all()
 
 
+# --- Operaciones en lote ---
+
+def _ids_existentes(db: Session, columna, ids) -> set:
+    """Los valores de `ids` que existen en `columna`, consultados en bloques."""
+    ids = list(set(ids))
+    existentes = set()
+    for i in range(0, len(ids), _BLOQUE_IN):
+        bloque = ids[i:i + _BLOQUE_IN]
+        existentes.update(db.execute(select(columna).where(columna.in_(bloque))).scalars())
+    return existentes
+
+
+def _error_lote(indice: int, error: str) -> schemas.ResultadoLote:
+    return schemas.ResultadoLote(indice=indice, ok=False, error=error)
+
+
+def _ejecutar_insert(db: Session, modelo, valores: list, columna_id=None) -> list:
+    """
+    INSERT de varias filas en la transacción en curso; devuelve sus ids en el
+    orden de `valores` (o Nones si no se pide `columna_id`).
+
+    SQLite no puede devolver RETURNING ordenado por parámetro en lotes (SQLAlchemy
+    cae a una sentencia por fila), así que ahí se usa executemany y los ids se
+    deducen del máximo: desde el primer INSERT la transacción tiene el lock de
+    escritura y cada fila recibe rowid = máximo + 1, consecutivos.
+    """
+    if columna_id is None:
+        db.execute(insert(modelo), valores)
+        return [None] * len(valores)
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(insert(modelo), valores)
+        ultimo = db.execute(select(func.max(columna_id))).scalar_one()
+        return list(range(ultimo - len(valores) + 1, ultimo + 1))
+    stmt = insert(modelo).returning(columna_id, sort_by_parameter_order=True)
+    return db.execute(stmt, valores).scalars().all()
+
+
+def _insertar_lote(db: Session, modelo, filas, resultados, columna_id=None):
+    """
+    Inserta `filas` ([(indice, valores)]) en una sola transacción. Si aun así
+    alguna fila viola una restricción (p. ej. por una escritura concurrente
+    tras la validación), se repite fila a fila para aislar las que fallan.
+    """
+    if not filas:
+        return
+    try:
+        ids = _ejecutar_insert(db, modelo, [valores for _, valores in filas], columna_id)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.warning(f"Lote de {modelo.__tablename__} rechazado; se reintenta fila a fila.")
+        for indice, valores in filas:
+            try:
+                (id_fila,) = _ejecutar_insert(db, modelo, [valores], columna_id)
+                db.commit()
+            except IntegrityError as exc:
+                db.rollback()
+                resultados[indice] = _error_lote(indice, str(exc.orig))
+            else:
+                resultados[indice] = schemas.ResultadoLote(indice=indice, ok=True, id=id_fila)
+        return
+    for (indice, _), id_fila in zip(filas, ids):
+        resultados[indice] = schemas.ResultadoLote(indice=indice, ok=True, id=id_fila)
+
+
+def _respuesta_lote(resultados) -> schemas.RespuestaLote:
+    creados = sum(1 for r in resultados if r.ok)
+    return schemas.RespuestaLote(creados=creados, fallidos=len(resultados) - creados, resultados=resultados)
+
+
+def create_solicitudes_bulk(db: Session, solicitudes: list[schemas.SolicitudCreate]):
+    """
+    Crea varias solicitudes en una sola transacción. Las que referencian un
+    cliente, tipo de servicio o estado inexistente se rechazan una a una y
+    el resto se inserta.
+    """
+    logger.info(f"Creando {len(solicitudes)} solicitudes en lote")
+    clientes = _ids_existentes(db, models.Cliente.id_cliente, [s.id_cliente for s in solicitudes])
+    tipos = _ids_existentes(db, models.TipoServicio.id_tipo_servicio, [s.id_tipo_servicio for s in solicitudes])
+    estados = _ids_existentes(db, models.EstadoSolicitud.id_estado_solicitud, [s.id_estado_solicitud for s in solicitudes])
+
+    resultados = [None] * len(solicitudes)
+    filas = []
+    for indice, solicitud in enumerate(solicitudes):
+        if solicitud.id_cliente not in clientes:
+            resultados[indice] = _error_lote(indice, f"Cliente con id {solicitud.id_cliente} no encontrado.")
+        elif solicitud.id_tipo_servicio not in tipos:
+            resultados[indice] = _error_lote(indice, f"Tipo de servicio {solicitud.id_tipo_servicio} no encontrado.")
+        elif solicitud.id_estado_solicitud not in estados:
+            resultados[indice] = _error_lote(indice, f"Estado de solicitud {solicitud.id_estado_solicitud} no encontrado.")
+        else:
+            filas.append((indice, solicitud.model_dump()))
+
+    _insertar_lote(db, models.Solicitud, filas, resultados, models.Solicitud.id_solicitud)
+    return _respuesta_lote(resultados)
+
+
+def create_notificaciones_bulk(db: Session, notificaciones: list[schemas.NotificacionCreate]):
+    """Crea varias notificaciones en una sola transacción; las de usuarios inexistentes se rechazan."""
+    logger.info(f"Creando {len(notificaciones)} notificaciones en lote")
+    usuarios = _ids_existentes(db, models.Usuario.id_usuario, [n.id_usuario for n in notificaciones])
+
+    resultados = [None] * len(notificaciones)
+    filas = []
+    for indice, notificacion in enumerate(notificaciones):
+        if notificacion.id_usuario not in usuarios:
+            resultados[indice] = _error_lote(indice, f"Usuario con id {notificacion.id_usuario} no encontrado.")
+        else:
+            filas.append((indice, notificacion.model_dump()))
+
+    _insertar_lote(db, models.Notificacion, filas, resultados, models.Notificacion.id_notificacion)
+    return _respuesta_lote(resultados)
+
+
+def create_conductor_servicios_bulk(
+    db: Session,
+    servicios: list[schemas.ConductorServicioCreate],
+    id_conductor_permitido: Optional[int] = None,
+):
+    """
+    Asocia varios servicios a conductores en una sola transacción. Con
+    `id_conductor_permitido`, los elementos de otros conductores se rechazan.
+    """
+    logger.info(f"Asociando {len(servicios)} servicios a conductores en lote")
+    conductores = _ids_existentes(db, models.Conductor.id_conductor, [s.id_conductor for s in servicios])
+    tipos = _ids_existentes(db, models.TipoServicio.id_tipo_servicio, [s.id_tipo_servicio for s in servicios])
+    # Pares ya asociados de esos conductores (prefijo de la PK compuesta; el IN de tuplas recorre la tabla)
+    existentes = set()
+    ids_conductor = list(conductores)
+    for i in range(0, len(ids_conductor), _BLOQUE_IN):
+        existentes.update(
+            tuple(fila)
+            for fila in db.execute(
+                select(models.ConductorServicio.id_conductor, models.ConductorServicio.id_tipo_servicio).where(
+                    models.ConductorServicio.id_conductor.in_(ids_conductor[i:i + _BLOQUE_IN])
+                )
+            )
+        )
+
+    resultados = [None] * len(servicios)
+    filas = []
+    for indice, servicio in enumerate(servicios):
+        par = (servicio.id_conductor, servicio.id_tipo_servicio)
+        if id_conductor_permitido is not None and servicio.id_conductor != id_conductor_permitido:
+            resultados[indice] = _error_lote(indice, "No autorizado.")
+        elif servicio.id_conductor not in conductores:
+            resultados[indice] = _error_lote(indice, f"Conductor con id {servicio.id_conductor} no encontrado.")
+        elif servicio.id_tipo_servicio not in tipos:
+            resultados[indice] = _error_lote(indice, f"Tipo de servicio {servicio.id_tipo_servicio} no encontrado.")
+        elif par in existentes:
+            resultados[indice] = _error_lote(indice, "Este servicio ya está asociado a este conductor.")
+        else:
+            existentes.add(par)  # también rechaza pares repetidos dentro del lote
+            filas.append((indice, servicio.model_dump()))
+
+    _insertar_lote(db, models.ConductorServicio, filas, resultados)
+    return _respuesta_lote(resultados)
+
+
 # --- CRUD para tablas de catálogo ---
 
 
@@ -0,0 +1,98 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models, schemas
+from .exceptions import NotFoundException
+from .utils.logging_config import logger
+
+
+# Versiones asíncronas de las funciones más usadas de crud.py, para los
+# routers que ya trabajan con `get_async_db`. Mismo contrato que sus
+# equivalentes síncronas.
+
+
+# --- CRUD para Usuario ---
+
+
+async def get_usuario_by_email(db: AsyncSession, email: str):
+    """Obtiene un usuario por su email."""
+    logger.info(f"Obteniendo usuario con email: {email}")
+    result = await db.execute(select(models.Usuario).where(models.Usuario.email == email))
+    return result.scalars().first()
+
+
+# --- CRUD para Solicitud ---
+
+
+async def get_solicitud(db: AsyncSession, solicitud_id: int):
+    """Obtiene una solicitud por su ID."""
+    logger.info(f"Obteniendo solicitud con id: {solicitud_id}")
+    result = await db.execute(
+        select(models.Solicitud).where(models.Solicitud.id_solicitud == solicitud_id)
+    )
+    db_solicitud = result.scalars().first()
+    if not db_solicitud:
+        raise NotFoundException(detail=f"Solicitud con id {solicitud_id} no encontrada.")
+    return db_solicitud
+
+
+async def create_solicitud(db: AsyncSession, solicitud: schemas.SolicitudCreate):
+    """Crea una nueva solicitud de servicio."""
+    logger.info(f"Creando nueva solicitud para el cliente {solicitud.id_cliente}")
+    db_solicitud = models.Solicitud(**solicitud.model_dump())
+    db.add(db_solicitud)
+    await db.commit()
+    return db_solicitud
+
+
+# --- CRUD para Asignacion ---
+
+
+async def get_asignacion(db: AsyncSession, asignacion_id: int):
+    """Obtiene una asignación por su ID."""
+    logger.info(f"Obteniendo asignación con id: {asignacion_id}")
+    result = await db.execute(
+        select(models.Asignacion).where(models.Asignacion.id_asignacion == asignacion_id)
+    )
+    db_asignacion = result.scalars().first()
+    if not db_asignacion:
+        raise NotFoundException(detail=f"Asignación con id {asignacion_id} no encontrada.")
+    return db_asignacion
+
+
+# --- CRUD para tablas de catálogo ---
+
+
+async def get_tipos_cliente(db: AsyncSession):
+    """Obtiene todos los tipos de cliente."""
+    logger.info("Obteniendo todos los tipos de cliente.")
+    return (await db.execute(select(models.TipoCliente))).scalars().all()
+
+
+async def get_estados_conductor(db: AsyncSession):
+    """Obtiene todos los estados de conductor."""
+    logger.info("Obteniendo todos los estados de conductor.")
+    return (await db.execute(select(models.EstadoConductor))).scalars().all()
+
+
+async def get_tipos_vehiculo(db: AsyncSession):
+    """Obtiene todos los tipos de vehículo."""
+    logger.info("Obteniendo todos los tipos de vehículo.")
+    return (await db.execute(select(models.TipoVehiculo))).scalars().all()
+
+
+async def get_estados_vehiculo(db: AsyncSession):
+    """Obtiene todos los estados de vehículo."""
+    logger.info("Obteniendo todos los estados de vehículo.")
+    return (await db.execute(select(models.EstadoVehiculo))).scalars().all()
+
+
+async def get_tipos_servicio(db: AsyncSession):
+    """Obtiene todos los tipos de servicio."""
+    logger.info("Obteniendo todos los tipos de servicio.")
+    return (await db.execute(select(models.TipoServicio))).scalars().all()
+
+
+async def get_estados_solicitud(db: AsyncSession):
+    """Obtiene todos los estados de solicitud."""
+    logger.info("Obteniendo todos los estados de solicitud.")
+    return (await db.execute(select(models.EstadoSolicitud))).scalars().all()
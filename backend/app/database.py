@@ -1,14 +1,139 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+
+def _is_sqlite_memory(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record=None):
+    """
+    Perfil de producción de SQLite, aplicado a cada conexión nueva:
+    WAL para que los lectores no bloqueen al escritor, synchronous=NORMAL
+    (seguro en WAL, sin fsync por commit), busy_timeout en lugar de fallar
+    con "database is locked", mmap y caché de páginas, y claves foráneas.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def configure_sqlite_read_connection(dbapi_connection, connection_record=None):
+    """
+    Perfil de las conexiones de solo lectura: no tocan el modo de journal
+    (requiere escribir) y `query_only` impide cualquier escritura accidental.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.close()
+
+
+def _sqlite_read_only_url(url):
+    """Abre el fichero como URI `mode=ro`: en WAL lee en paralelo sin pedir nunca el lock de escritura."""
+    database = url.database if url.database.startswith("file:") else f"file:{url.database}"
+    return url.set(database=database, query={**url.query, "mode": "ro", "uri": "true"})
+
+
+def build_engine(database_url: str, read_only: bool = False):
+    """
+    Crea el engine de la aplicación. Para SQLite en fichero aplica el perfil
+    de producción y dimensiona el pool para el threadpool de los endpoints
+    síncronos, de modo que ningún hilo espere por una conexión.
+
+    Con `read_only=True` devuelve el engine de lecturas, o None si la base
+    no admite un pool de solo lectura separado (SQLite en memoria).
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            database_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+
+    if _is_sqlite_memory(url):
+        if read_only:
+            return None
+        return create_engine(database_url, connect_args={"check_same_thread": False})
+
+    sqlite_engine = create_engine(
+        _sqlite_read_only_url(url) if read_only else url,
+        connect_args={"check_same_thread": False},
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+    event.listen(
+        sqlite_engine,
+        "connect",
+        configure_sqlite_read_connection if read_only else configure_sqlite_connection,
+    )
+    return sqlite_engine
+
+
+def build_async_engine(database_url: str, read_only: bool = False):
+    """
+    Engine asíncrono sobre la misma base. Para SQLite usa aiosqlite con el
+    mismo perfil de conexión que el engine síncrono.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, pool_size=settings.ASYNC_DB_POOL_SIZE)
+
+    async_url = url.set(drivername="sqlite+aiosqlite")
+    if _is_sqlite_memory(url):
+        if read_only:
+            return None
+        return create_async_engine(async_url)
+    if read_only:
+        async_url = _sqlite_read_only_url(async_url)
+
+    # aiosqlite usa NullPool por defecto: se fuerza un pool para reutilizar conexiones
+    sqlite_engine = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+    )
+    event.listen(
+        sqlite_engine.sync_engine,
+        "connect",
+        configure_sqlite_read_connection if read_only else configure_sqlite_connection,
+    )
+    return sqlite_engine
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
+# Sin expirar en commit: las claves generadas y los valores por defecto ya
+# vuelven en el INSERT ... RETURNING, así que un refresh sería un SELECT de más.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+async_engine = build_async_engine(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Lecturas: pool propio en solo lectura (o la réplica de DATABASE_READ_URL).
+# Si no hay pool separado posible, las lecturas usan el engine principal.
+SQLALCHEMY_READ_DATABASE_URL = settings.DATABASE_READ_URL or SQLALCHEMY_DATABASE_URL
+read_engine = build_engine(SQLALCHEMY_READ_DATABASE_URL, read_only=True) or engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_read_engine = build_async_engine(SQLALCHEMY_READ_DATABASE_URL, read_only=True) or async_engine
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, expire_on_commit=False
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -18,3 +143,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Sesión para endpoints de solo lectura (GET)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,17 +1,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from .database import get_db
-from . import models, crud, security
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_async_read_db
+from . import models, crud_async, security
 from jose import JWTError, jwt
 from .config import settings
 from app.models import Usuario
+from app.utils.principal_cache import principal_cache
 
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+async def get_current_user(db: AsyncSession = Depends(get_async_read_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -25,12 +26,20 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         token_data = security.schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = crud.get_usuario_by_email(db, email=token_data.username)
+
+    user = principal_cache.get(token_data.username)
+    if user is not None:
+        return user
+
+    # La generación se toma antes de leer: si el usuario cambia mientras tanto, no se cachea
+    generacion = principal_cache.generacion()
+    user = await crud_async.get_usuario_by_email(db, email=token_data.username)
     if user is None:
         raise credentials_exception
+    principal_cache.set(token_data.username, user, generacion, token_exp=payload.get("exp"))
     return user
 
-def get_current_active_user(current_user: models.Usuario = Depends(get_current_user)):
+async def get_current_active_user(current_user: models.Usuario = Depends(get_current_user)):
     if not current_user.email_verificado:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
@@ -5,6 +5,13 @@ class APIException(HTTPException):
     def __init__(self, status_code: int, detail: str = "Error interno del servidor"):
         super().__init__(status_code=status_code, detail=detail)
 
+class BadRequestException(APIException):
+    def __init__(self, detail: str = "Petición inválida"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+
 class UnauthorizedException(APIException):
     def __init__(self, detail: str = "Credenciales inválidas"):
         super().__init__(
@@ -32,3 +39,11 @@ class ConflictException(APIException):
             status_code=status.HTTP_409_CONFLICT,
             detail=detail,
         )
+
+class ServiceUnavailableException(APIException):
+    def __init__(self, detail: str = "Servicio saturado, intente más tarde", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+        )
+        self.headers = {"Retry-After": str(retry_after)}
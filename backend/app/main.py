@@ -1,5 +1,8 @@
 # app/main.py
 
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from app.utils.logging_config import setup_logging
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,19 +19,48 @@ from app.routers import (
     asignaciones,
     pagos,
     emergencias,
+    viajes,
+    notificaciones,
 )
+from app.middleware.compresion import CompresionMiddleware
 from app.middleware.rate_limiter import RateLimiterMiddleware
 from app.utils.logging_config import setup_logging
 from app.config import settings
+from app.utils.login_pool import login_executor
+from app.utils.group_commit import group_commit_writer
+from app.utils.trabajos import trabajos
+from app.utils.serializacion import RespuestaJSON
+from app.database import engine
 
 
 # Inicializa el sistema de logs
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El threadpool de los endpoints síncronos se dimensiona igual que el pool de conexiones
+    to_thread.current_default_thread_limiter().total_tokens = settings.SYNC_THREADPOOL_SIZE
+    # La primera conexión es de escritura para fijar el modo WAL antes de abrir las de solo lectura
+    # Los índices nuevos no se crean aquí: es un paso de despliegue (python -m app.migrations)
+    with engine.connect():
+        pass
+    # Difusiones que un worker detenido o caído dejó a medias
+    await to_thread.run_sync(trabajos.reanudar)
+    yield
+    login_executor.shutdown()
+    trabajos.shutdown()
+    if group_commit_writer is not None:
+        group_commit_writer.shutdown()
+
+
 app = FastAPI(
     title="KE RÁPIDO",
     description="API ligera para servicios de transporte urbano",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson si está instalado; los listados grandes usan además respuesta_modelo
+    default_response_class=RespuestaJSON,
 )
 
 # CORS Middleware (importantísimo para frontend)
@@ -38,8 +70,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compresión gzip/brotli de las respuestas de texto y JSON a partir de COMPRESION_MIN_BYTES
+app.add_middleware(CompresionMiddleware)
+
 # Middleware de Rate Limiting (debe ir antes de los routers)
 app.add_middleware(RateLimiterMiddleware)
 
@@ -53,6 +89,8 @@ app.include_router(solicitudes.router)
 app.include_router(asignaciones.router)
 app.include_router(pagos.router)
 app.include_router(emergencias.router)
+app.include_router(viajes.router)
+app.include_router(notificaciones.router)
 app.include_router(registro.router)
 
 
@@ -0,0 +1,118 @@
+# app/middleware/compresion.py
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.compresion import comprimir, compresor, elegir_codificacion
+
+# Tipos que merece la pena comprimir; el resto (imágenes, binarios) ya suele estarlo
+_TIPOS_COMPRIMIBLES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def _comprimible(cabeceras: Headers) -> bool:
+    if "content-encoding" in cabeceras:  # p. ej. /catalogos/snapshot, ya comprimido en caché
+        return False
+    return cabeceras.get("content-type", "").startswith(_TIPOS_COMPRIMIBLES)
+
+
+def _anadir_vary(cabeceras: MutableHeaders):
+    vary = cabeceras.get("vary")
+    if not vary:
+        cabeceras["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        cabeceras["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompresionMiddleware:
+    """
+    Middleware ASGI puro de compresión (gzip, y brotli si está instalado).
+
+    La codificación se negocia con Accept-Encoding. Solo se comprimen tipos de
+    texto/JSON a partir de COMPRESION_MIN_BYTES, y nunca una respuesta que ya
+    trae Content-Encoding: las cachés de catálogos y de respuestas guardan
+    sus cuerpos ya comprimidos y los sirven tal cual. Un ETag fuerte pasa a
+    débil al comprimir, porque los bytes ya no son los del ETag.
+    """
+
+    def __init__(self, app: ASGIApp, min_bytes: Optional[int] = None):
+        self.app = app
+        self.min_bytes = settings.COMPRESION_MIN_BYTES if min_bytes is None else min_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding"))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+        await _Respuesta(self.app, codificacion, self.min_bytes)(scope, receive, send)
+
+
+class _Respuesta:
+    """Estado de una petición: retiene el inicio de la respuesta hasta ver el primer trozo del cuerpo."""
+
+    def __init__(self, app: ASGIApp, codificacion: str, min_bytes: int):
+        self.app = app
+        self.codificacion = codificacion
+        self.min_bytes = min_bytes
+        self.inicio: Message = None
+        self.compresor = None
+        self.pasar = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.enviar)
+
+    async def enviar(self, mensaje: Message):
+        tipo = mensaje["type"]
+        if tipo == "http.response.start":
+            self.inicio = mensaje
+            self.pasar = not _comprimible(Headers(raw=mensaje["headers"]))
+            if self.pasar:
+                await self.send(mensaje)
+            return
+        if tipo != "http.response.body" or self.pasar:
+            await self.send(mensaje)
+            return
+
+        cuerpo = mensaje.get("body", b"")
+        mas = mensaje.get("more_body", False)
+        if self.compresor is not None:
+            trozo = self.compresor.compress(cuerpo) if cuerpo else b""
+            if not mas:
+                trozo += self.compresor.finish()
+            await self.send({"type": "http.response.body", "body": trozo, "more_body": mas})
+            return
+
+        # Primer trozo del cuerpo: aquí se decide
+        cabeceras = MutableHeaders(raw=self.inicio["headers"])
+        if not mas:
+            if len(cuerpo) < self.min_bytes:
+                self.pasar = True
+                await self.send(self.inicio)
+                await self.send(mensaje)
+                return
+            cuerpo = comprimir(cuerpo, self.codificacion)
+            self._cabeceras_comprimidas(cabeceras)
+            cabeceras["Content-Length"] = str(len(cuerpo))
+            await self.send(self.inicio)
+            await self.send({"type": "http.response.body", "body": cuerpo})
+            return
+
+        # Streaming: se comprime trozo a trozo y se descarta Content-Length
+        self.compresor = compresor(self.codificacion)
+        self._cabeceras_comprimidas(cabeceras)
+        del cabeceras["Content-Length"]
+        await self.send(self.inicio)
+        await self.send({"type": "http.response.body", "body": self.compresor.compress(cuerpo), "more_body": True})
+
+    def _cabeceras_comprimidas(self, cabeceras: MutableHeaders):
+        cabeceras["Content-Encoding"] = self.codificacion
+        _anadir_vary(cabeceras)
+        etag = cabeceras.get("etag")
+        if etag and not etag.startswith("W/"):
+            cabeceras["ETag"] = f"W/{etag}"
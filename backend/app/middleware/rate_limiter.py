@@ -1,38 +1,329 @@
 # app/middleware/rate_limiter.py
 
+import asyncio
+import math
+import os
+import sqlite3
 import time
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings  # ← import corregido
+from app.utils.logging_config import logger
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class TokenBucketLimiter:
+    """
+    Limitador token-bucket con memoria acotada.
+
+    Cada clave recibe `capacity` fichas que se recargan a `refill_rate` por
+    segundo, así no hay ráfagas dobles en el borde de una ventana fija. Los
+    buckets se guardan en orden de último uso: los que llevan más de
+    `idle_seconds` sin actividad (ya estarían llenos) se descartan
+    periódicamente y, si aun así se supera `max_keys`, se expulsa el menos
+    reciente.
+
+    No usa locks: está pensado para llamarse solo desde el event loop.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        max_keys: int,
+        sweep_interval: float = 10.0,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self.idle_seconds = capacity / refill_rate
+        self.sweep_interval = sweep_interval
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._next_sweep = 0.0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def consume(self, key: str, cost: float = 1.0, now: float = None) -> float:
+        """
+        Descuenta `cost` fichas de `key`.
+        Devuelve 0 si la petición se permite, o los segundos a esperar si no.
+        """
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        cost = min(cost, self.capacity)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket = _Bucket(self.capacity, now)
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(
+                self.capacity, bucket.tokens + (now - bucket.updated) * self.refill_rate
+            )
+            bucket.updated = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return 0.0
+        return (cost - bucket.tokens) / self.refill_rate
+
+    async def consume_async(self, key: str, cost: float = 1.0) -> float:
+        # Todo en memoria: microsegundos, se queda en el event loop
+        return self.consume(key, cost)
+
+    def _sweep(self, now: float):
+        limite = now - self.idle_seconds
+        buckets = self._buckets
+        while buckets:
+            key = next(iter(buckets))
+            if buckets[key].updated > limite:
+                break
+            del buckets[key]
+        self._next_sweep = now + self.sweep_interval
+
+
+class SQLiteTokenBucketLimiter:
+    """
+    Token-bucket compartido entre los workers de un mismo host.
+
+    El estado vive en una base SQLite (idealmente en /dev/shm) en modo WAL y
+    sin fsync: los contadores son efímeros. Cada comprobación es un único
+    UPSERT ... RETURNING que recarga, descuenta y decide de forma atómica.
+
+    Las claves ya bloqueadas se rechazan localmente hasta su `Retry-After`
+    sin tocar SQLite: esa comprobación es la única que corre en el event
+    loop. El UPSERT y la limpieza periódica se ejecutan en un hilo propio
+    (`consume_async`), así la espera por el lock de escritura compartido no
+    bloquea el loop.
 
-# Este diccionario almacena peticiones por IP.
-# ¡No usar en producción real! No es persistente ni distribuido.
-request_counts = defaultdict(lambda: {"count": 0, "last_reset": time.time()})
+    Si SQLite falla o no da el lock en `busy_timeout_ms`, `on_error` decide:
+    "allow" deja pasar la petición (el limitador no tumba la API) y "deny"
+    la rechaza con un Retry-After de 1 s. Los fallos se registran como
+    warning como mucho una vez cada `sweep_interval`, con su número.
+    """
 
+    _UPSERT = """
+        INSERT INTO buckets (clave, fichas, actualizado, permitido)
+        VALUES (:clave, :capacidad - :coste, :ahora, 1)
+        ON CONFLICT (clave) DO UPDATE SET
+            fichas = CASE
+                WHEN min(:capacidad, fichas + max(0, :ahora - actualizado) * :tasa) >= :coste
+                THEN min(:capacidad, fichas + max(0, :ahora - actualizado) * :tasa) - :coste
+                ELSE min(:capacidad, fichas + max(0, :ahora - actualizado) * :tasa)
+            END,
+            permitido = min(:capacidad, fichas + max(0, :ahora - actualizado) * :tasa) >= :coste,
+            actualizado = max(actualizado, :ahora)
+        RETURNING fichas, permitido
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: float,
+        refill_rate: float,
+        max_keys: int,
+        sweep_interval: float = 10.0,
+        busy_timeout_ms: int = 50,
+        on_error: str = "allow",
+    ):
+        if on_error not in ("allow", "deny"):
+            raise ValueError(f"on_error desconocido: {on_error}")
+        self.path = path
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self.idle_seconds = capacity / refill_rate
+        self.sweep_interval = sweep_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.on_error = on_error
+        self._errores = 0
+        self._proximo_aviso = 0.0
+        # Un solo hilo: serializa el uso de la conexión y deja libre el event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+        self._conn = None
+        self._pid = None
+        self._blocked: "OrderedDict[str, float]" = OrderedDict()
+        self._next_sweep = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Tras un fork la conexión heredada no es utilizable: se abre otra.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " clave TEXT PRIMARY KEY,"
+                " fichas REAL NOT NULL,"
+                " actualizado REAL NOT NULL,"
+                " permitido INTEGER NOT NULL DEFAULT 1"
+                ") WITHOUT ROWID"
+            )
+            # Para la limpieza: sin él, cada barrido recorre la tabla entera
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_buckets_actualizado ON buckets (actualizado)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def blocked(self, key: str, now: float = None) -> float:
+        """Segundos que le quedan a `key` bloqueada localmente, o 0. Solo lee: apto para el event loop."""
+        blocked_until = self._blocked.get(key)
+        if blocked_until is None:
+            return 0.0
+        return max(0.0, blocked_until - (time.time() if now is None else now))
+
+    async def consume_async(self, key: str, cost: float = 1.0) -> float:
+        retry_after = self.blocked(key)
+        if retry_after:
+            return retry_after
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.consume, key, cost)
+
+    def consume(self, key: str, cost: float = 1.0, now: float = None) -> float:
+        """Comprobación completa contra SQLite. Bloqueante: desde el event loop, usar `consume_async`."""
+        if now is None:
+            now = time.time()
+
+        retry_after = self.blocked(key, now)
+        if retry_after:
+            return retry_after
+
+        try:
+            conn = self._connection()
+            if now >= self._next_sweep:
+                self._sweep(conn, now)
+            tokens, allowed = conn.execute(
+                self._UPSERT,
+                {
+                    "clave": key,
+                    "coste": min(cost, self.capacity),
+                    "capacidad": self.capacity,
+                    "tasa": self.refill_rate,
+                    "ahora": now,
+                },
+            ).fetchone()
+        except sqlite3.Error as exc:
+            return self._fallo(exc, now)
+
+        if allowed:
+            self._blocked.pop(key, None)
+            return 0.0
+        retry_after = (min(cost, self.capacity) - tokens) / self.refill_rate
+        self._blocked[key] = now + retry_after
+        if len(self._blocked) > self.max_keys:
+            self._blocked.popitem(last=False)
+        return retry_after
+
+    def _fallo(self, exc: sqlite3.Error, now: float) -> float:
+        # "database is locked" incluido: se agotó busy_timeout_ms esperando el lock de escritura
+        self._errores += 1
+        if now >= self._proximo_aviso:
+            accion = "se permiten" if self.on_error == "allow" else "se rechazan"
+            logger.warning(
+                f"Rate limiter compartido no disponible ({exc}); {accion} las peticiones afectadas "
+                f"({self._errores} fallos desde el último aviso)."
+            )
+            self._errores = 0
+            self._proximo_aviso = now + self.sweep_interval
+        return 0.0 if self.on_error == "allow" else 1.0
+
+    def _sweep(self, conn: sqlite3.Connection, now: float):
+        self._next_sweep = now + self.sweep_interval
+        # Ambos DELETE recorren ix_buckets_actualizado, no la tabla
+        conn.execute("DELETE FROM buckets WHERE actualizado < ?", (now - self.idle_seconds,))
+        conn.execute(
+            "DELETE FROM buckets WHERE actualizado < ("
+            " SELECT actualizado FROM buckets ORDER BY actualizado DESC LIMIT 1 OFFSET ?)",
+            (self.max_keys - 1,),
+        )
+        for key in [k for k, hasta in self._blocked.items() if hasta <= now]:
+            del self._blocked[key]
+
+
+def build_limiter():
+    """Crea el limitador según RATE_LIMIT_BACKEND ("memory" o "sqlite")."""
+    capacity = settings.RATE_LIMIT_MAX_REQUESTS
+    refill_rate = settings.RATE_LIMIT_MAX_REQUESTS / settings.RATE_LIMIT_INTERVAL_SECONDS
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteTokenBucketLimiter(
+            path=settings.RATE_LIMIT_SHARED_PATH,
+            capacity=capacity,
+            refill_rate=refill_rate,
+            max_keys=settings.RATE_LIMIT_MAX_TRACKED_KEYS,
+            busy_timeout_ms=settings.RATE_LIMIT_SHARED_BUSY_TIMEOUT_MS,
+            on_error=settings.RATE_LIMIT_SHARED_ON_ERROR,
+        )
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"RATE_LIMIT_BACKEND desconocido: {settings.RATE_LIMIT_BACKEND}")
+    return TokenBucketLimiter(
+        capacity=capacity,
+        refill_rate=refill_rate,
+        max_keys=settings.RATE_LIMIT_MAX_TRACKED_KEYS,
+    )
+
+
+def parse_route_costs(raw: str) -> list[tuple[str, float]]:
+    """Convierte "prefijo=coste,..." en una lista ordenada del prefijo más largo al más corto."""
+    costs = []
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        prefix, cost = item.split("=", 1)
+        costs.append((prefix.strip(), float(cost)))
+    return sorted(costs, key=lambda pc: len(pc[0]), reverse=True)
+
+
+class RateLimiterMiddleware:
+    """
+    Middleware ASGI puro: no envuelve la petición ni la respuesta en tareas y
+    streams adicionales como `BaseHTTPMiddleware`.
+    """
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
+        self.limiter = build_limiter()
+        self.route_costs = parse_route_costs(settings.RATE_LIMIT_ROUTE_COSTS)
+
+    def route_cost(self, path: str) -> float:
+        for prefix, cost in self.route_costs:
+            if path.startswith(prefix):
+                return cost
+        return 1.0
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        current_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Reinicia contador si se supera el intervalo
-        if current_time - request_counts[client_ip]["last_reset"] > settings.RATE_LIMIT_INTERVAL_SECONDS:
-            request_counts[client_ip]["count"] = 0
-            request_counts[client_ip]["last_reset"] = current_time
+        client = scope.get("client")
+        client_ip = client[0] if client else "desconocido"
+        retry_after = await self.limiter.consume_async(client_ip, self.route_cost(scope["path"]))
 
-        # Incrementa y verifica límite
-        request_counts[client_ip]["count"] += 1
-        if request_counts[client_ip]["count"] > settings.RATE_LIMIT_MAX_REQUESTS:
-            raise HTTPException(
+        if retry_after:
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Demasiadas peticiones. Intente más tarde."
+                content={"detail": "Demasiadas peticiones. Intente más tarde."},
+                headers={"Retry-After": str(math.ceil(retry_after))},
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -0,0 +1,113 @@
+# app/migrations.py
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from . import models  # noqa: F401  (registra las tablas en Base.metadata)
+from .database import Base, engine
+from .utils.logging_config import logger
+
+
+def ensure_indexes(bind=engine) -> list[str]:
+    """
+    Crea en una base existente los índices declarados en `models.py` que aún
+    no tenga. Es idempotente: los índices presentes (por nombre) se saltan,
+    y también los de tablas o columnas que esa base no tiene.
+
+    Es un paso explícito de despliegue (`python -m app.migrations`), no se
+    ejecuta al arrancar la API: en una base grande, construir un índice
+    retrasaría el arranque y retendría el lock de escritura. SQLite lo
+    construye sin bloquear a los lectores (WAL); los escritores esperan lo
+    que dure cada índice. Un índice que no se puede crear se registra y se
+    sigue con los demás.
+    """
+    inspector = inspect(bind)
+    tablas = set(inspector.get_table_names())
+    creados = []
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tablas:
+            continue
+        columnas = {c["name"] for c in inspector.get_columns(table.name)}
+        existentes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+
+        clave_primaria = set(table.primary_key.columns)
+        for index in table.indexes:
+            # `index=True` en la clave primaria es redundante: SQLite ya la indexa
+            if index.name in existentes or set(index.columns) <= clave_primaria:
+                continue
+            faltan = [c.name for c in index.columns if c.name not in columnas]
+            if faltan:
+                logger.warning(f"Índice {index.name} omitido: {table.name} no tiene {', '.join(faltan)}.")
+                continue
+            try:
+                index.create(bind, checkfirst=True)
+            except (IntegrityError, OperationalError) as exc:
+                logger.warning(f"No se pudo crear el índice {index.name}: {exc.orig}")
+                continue
+            logger.info(f"Índice creado: {index.name}")
+            creados.append(index.name)
+
+    if creados and bind.dialect.name == "sqlite":
+        # Actualiza las estadísticas del planificador para los índices nuevos
+        with bind.begin() as conn:
+            conn.execute(text("PRAGMA optimize"))
+    return creados
+
+
+# Tablas añadidas después de init.sql que una base existente puede no tener
+_TABLAS_NUEVAS = [models.Trabajo.__table__]
+
+
+def ensure_tables(bind=engine) -> list[str]:
+    """Crea las tablas de `_TABLAS_NUEVAS` que falten (con sus índices). Idempotente."""
+    tablas = set(inspect(bind).get_table_names())
+    creadas = [t.name for t in _TABLAS_NUEVAS if t.name not in tablas]
+    Base.metadata.create_all(bind, tables=_TABLAS_NUEVAS)
+    for nombre in creadas:
+        logger.info(f"Tabla creada: {nombre}")
+    return creadas
+
+
+# Columnas que son clave de un cursor de paginación (app.utils.paginacion)
+_COLUMNAS_CURSOR = [(models.Solicitud.__tablename__, "fecha_solicitud")]
+
+
+def normalizar_fechas_cursor(bind=engine) -> int:
+    """
+    Reescribe en el formato de SQLAlchemy ('YYYY-MM-DD HH:MM:SS.ffffff') las
+    fechas que CURRENT_TIMESTAMP guardó sin fracción en las columnas usadas
+    como cursor. El cursor se compara como texto: una fila de ese segundo
+    con el formato corto quedaría siempre "antes" del cursor y la
+    paginación devolvería la misma página sin fin. Idempotente.
+
+    Avisa también de las filas sin fecha, que los listados por cursor excluyen.
+    """
+    if bind.dialect.name != "sqlite":
+        return 0
+    inspector = inspect(bind)
+    tablas = set(inspector.get_table_names())
+    total = 0
+    with bind.begin() as conn:
+        for tabla, columna in _COLUMNAS_CURSOR:
+            if tabla not in tablas or columna not in {c["name"] for c in inspector.get_columns(tabla)}:
+                continue
+            total += conn.execute(
+                text(f"UPDATE {tabla} SET {columna} = {columna} || '.000000' WHERE length({columna}) = 19")
+            ).rowcount
+            sin_fecha = conn.execute(text(f"SELECT count(*) FROM {tabla} WHERE {columna} IS NULL")).scalar()
+            if sin_fecha:
+                logger.warning(f"{tabla}: {sin_fecha} filas sin {columna}; no aparecen en los listados por cursor.")
+    if total:
+        logger.info(f"Fechas normalizadas para la paginación por cursor: {total}")
+    return total
+
+
+if __name__ == "__main__":
+    from .utils.logging_config import setup_logging
+
+    setup_logging()
+    ensure_tables()
+    creados = ensure_indexes()
+    logger.info(f"Migración de índices completada ({len(creados)} nuevos).")
+    normalizar_fechas_cursor()
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import (
     Boolean,
     Column,
@@ -8,6 +10,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     Text,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -69,7 +72,7 @@ class Conductor(Base):
     fecha_vencimiento_licencia = Column(Date)
     calificacion_promedio = Column(Float, default=0.0)
     id_estado_conductor = Column(
-        Integer, ForeignKey("estados_conductor.id_estado_conductor")
+        Integer, ForeignKey("estados_conductor.id_estado_conductor"), index=True
     )
     id_usuario = Column(Integer, ForeignKey("usuarios.id_usuario"), unique=True)
 
@@ -99,9 +102,9 @@ class Vehiculo(Base):
     capacidad_volumen = Column(Float)
     id_tipo_vehiculo = Column(Integer, ForeignKey("tipos_vehiculo.id_tipo_vehiculo"))
     id_estado_vehiculo = Column(
-        Integer, ForeignKey("estados_vehiculo.id_estado_vehiculo")
+        Integer, ForeignKey("estados_vehiculo.id_estado_vehiculo"), index=True
     )
-    id_conductor = Column(Integer, ForeignKey("conductores.id_conductor"))
+    id_conductor = Column(Integer, ForeignKey("conductores.id_conductor"), index=True)
 
     tipo_vehiculo = relationship("TipoVehiculo")
     estado = relationship("EstadoVehiculo")
@@ -114,6 +117,12 @@ class Solicitud(Base):
     """
 
     __tablename__ = "solicitudes"
+    __table_args__ = (
+        # Historial por cliente: filtra por id_cliente y ordena por fecha
+        Index("ix_solicitudes_id_cliente_fecha", "id_cliente", "fecha_solicitud"),
+        # Listado general paginado por cursor sobre (fecha, id)
+        Index("ix_solicitudes_fecha_id", "fecha_solicitud", "id_solicitud"),
+    )
 
     id_solicitud = Column(Integer, primary_key=True, index=True)
     origen_lat = Column(Float, nullable=False)
@@ -124,16 +133,23 @@ class Solicitud(Base):
     direccion_destino = Column(String)
     comentarios = Column(Text)
     precio_sugerido = Column(Float)
-    id_cliente = Column(Integer, ForeignKey("clientes.id_cliente"))
+    # Índice propio además del compuesto: en bases cuya columna de fecha tiene otro
+    # nombre (db/sql_app.db) el compuesto no se puede crear y este sí
+    id_cliente = Column(Integer, ForeignKey("clientes.id_cliente"), index=True)
     id_tipo_servicio = Column(Integer, ForeignKey("tipos_servicio.id_tipo_servicio"))
     id_estado_solicitud = Column(
-        Integer, ForeignKey("estados_solicitud.id_estado_solicitud")
+        Integer, ForeignKey("estados_solicitud.id_estado_solicitud"), index=True
     )
-    fecha_solicitud = Column(DateTime, default=func.now())
+    # Valor por defecto en Python (UTC, como CURRENT_TIMESTAMP) y no func.now(): SQLite
+    # guardaría 'YYYY-MM-DD HH:MM:SS' sin fracción y SQLAlchemy compara con
+    # '... HH:MM:SS.ffffff'. Es la clave del cursor de get_solicitudes: el texto de la
+    # fila y el del cursor deben coincidir o la paginación no avanza.
+    fecha_solicitud = Column(DateTime, default=datetime.utcnow)
 
     cliente = relationship("Cliente")
     tipo_servicio = relationship("TipoServicio")
     estado = relationship("EstadoSolicitud")
+    asignacion = relationship("Asignacion", back_populates="solicitud", uselist=False)
 
 
 class Asignacion(Base):
@@ -142,6 +158,9 @@ class Asignacion(Base):
     """
 
     __tablename__ = "asignaciones"
+    __table_args__ = (
+        Index("ix_asignaciones_id_conductor_fecha", "id_conductor", "fecha_hora_asignacion"),
+    )
 
     id_asignacion = Column(Integer, primary_key=True, index=True)
     fecha_hora_asignacion = Column(DateTime, default=func.now(), nullable=False)
@@ -149,10 +168,11 @@ class Asignacion(Base):
     fecha_hora_fin_servicio = Column(DateTime)
     precio_final = Column(Float)
     id_solicitud = Column(Integer, ForeignKey("solicitudes.id_solicitud"), unique=True)
-    id_conductor = Column(Integer, ForeignKey("conductores.id_conductor"))
-    id_vehiculo = Column(Integer, ForeignKey("vehiculos.id_vehiculo"))
+    # Como en solicitudes.id_cliente: no depende de la columna de fecha del compuesto
+    id_conductor = Column(Integer, ForeignKey("conductores.id_conductor"), index=True)
+    id_vehiculo = Column(Integer, ForeignKey("vehiculos.id_vehiculo"), index=True)
 
-    solicitud = relationship("Solicitud")
+    solicitud = relationship("Solicitud", back_populates="asignacion")
     conductor = relationship("Conductor")
     vehiculo = relationship("Vehiculo")
     pago = relationship("TransaccionPago", back_populates="asignacion", uselist=False)
@@ -176,7 +196,7 @@ class TransaccionPago(Base):
         Integer, ForeignKey("tipos_metodo_pago.id_tipo_metodo_pago")
     )
     id_canal_pago = Column(Integer, ForeignKey("canales_pago.id_canal_pago"))
-    id_estado_pago = Column(Integer, ForeignKey("estados_pago.id_estado_pago"))
+    id_estado_pago = Column(Integer, ForeignKey("estados_pago.id_estado_pago"), index=True)
 
     asignacion = relationship("Asignacion", back_populates="pago")
     moneda = relationship("Moneda")
@@ -191,6 +211,9 @@ class Notificacion(Base):
     """
 
     __tablename__ = "notificaciones"
+    __table_args__ = (
+        Index("ix_notificaciones_id_usuario_fecha", "id_usuario", "fecha_hora"),
+    )
 
     id_notificacion = Column(Integer, primary_key=True, index=True)
     titulo = Column(String, nullable=False)
@@ -218,11 +241,11 @@ class Incidente(Base):
         Integer, ForeignKey("tipos_incidente.id_tipo_incidente")
     )
     id_estado_incidente = Column(
-        Integer, ForeignKey("estados_incidente.id_estado_incidente")
+        Integer, ForeignKey("estados_incidente.id_estado_incidente"), index=True
     )
-    id_usuario = Column(Integer, ForeignKey("usuarios.id_usuario"))
+    id_usuario = Column(Integer, ForeignKey("usuarios.id_usuario"), index=True)
     id_solicitud = Column(
-        Integer, ForeignKey("solicitudes.id_solicitud"), nullable=True
+        Integer, ForeignKey("solicitudes.id_solicitud"), nullable=True, index=True
     )
 
     tipo_incidente = relationship("TipoIncidente")
@@ -436,3 +459,29 @@ class ConductorServicio(Base):
 
     conductor = relationship("Conductor", back_populates="servicios_ofrecidos")
     tipo_servicio = relationship("TipoServicio")
+
+
+class Trabajo(Base):
+    """
+    Modelo de la tabla de trabajos en segundo plano (app.utils.trabajos).
+    El estado vive aquí y no en memoria del proceso: cualquier worker informa
+    del progreso y retoma un trabajo que otro dejó a medias.
+    """
+
+    __tablename__ = "trabajos"
+    __table_args__ = (
+        Index("ix_trabajos_estado_actualizado", "estado", "actualizado"),
+    )
+
+    id_trabajo = Column(String(32), primary_key=True)
+    tipo = Column(String, nullable=False)
+    parametros = Column(Text, nullable=False)  # JSON con lo necesario para (re)ejecutarlo
+    estado = Column(String, nullable=False, default="pendiente")  # pendiente | en_curso | completado | fallido
+    total = Column(Integer)
+    procesados = Column(Integer, nullable=False, default=0)
+    ultimo_id = Column(Integer)  # último id ya procesado: el siguiente bloque empieza después
+    propietario = Column(String)  # worker que lo ejecuta mientras está en_curso
+    creado = Column(DateTime, nullable=False, default=datetime.utcnow)
+    actualizado = Column(DateTime, nullable=False, default=datetime.utcnow)
+    terminado = Column(DateTime)
+    error = Column(Text)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
 
 router = APIRouter(
@@ -13,6 +13,15 @@ router = APIRouter(
 )
 
 
+def _participa(usuario: models.Usuario, asignacion: models.Asignacion) -> bool:
+    """Cliente de la solicitud o conductor asignado. Usa las relaciones ya cargadas."""
+    cliente = asignacion.solicitud.cliente if asignacion.solicitud else None
+    return (
+        (cliente is not None and usuario.id_usuario == cliente.id_usuario)
+        or (asignacion.conductor is not None and usuario.id_usuario == asignacion.conductor.id_usuario)
+    )
+
+
 @router.post("/", response_model=schemas.AsignacionInDB, status_code=201)
 def create_asignacion(
     asignacion: schemas.AsignacionCreate,
@@ -35,30 +44,16 @@ def create_asignacion(
 @router.get("/{asignacion_id}", response_model=schemas.AsignacionInDB)
 def read_asignacion(
     asignacion_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
     Obtiene los detalles de una asignación específica.
     Solo el cliente, el conductor o un administrador pueden verla.
     """
-    db_asignacion = crud.get_asignacion(db, asignacion_id)
-    if not db_asignacion:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Asignación no encontrada."
-        )
+    db_asignacion = crud.get_asignacion_detalle(db, asignacion_id)
 
-    db_solicitud = crud.get_solicitud(db, db_asignacion.id_solicitud)
-    db_cliente = crud.get_cliente(db, db_solicitud.id_cliente) if db_solicitud else None
-    db_conductor = crud.get_conductor(db, db_asignacion.id_conductor)
-
-    is_involved = (
-        (db_cliente and current_user.id_usuario == db_cliente.id_usuario)
-        or (db_conductor and current_user.id_usuario == db_conductor.id_usuario)
-    )
-
-    if not current_user.es_admin and not is_involved:
+    if not current_user.es_admin and not _participa(current_user, db_asignacion):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permiso para ver esta asignación."
@@ -86,14 +81,8 @@ def update_asignacion_precio(
             detail="El campo 'precio' es obligatorio."
         )
 
-    db_asignacion = crud.get_asignacion(db, asignacion_id)
-    if not db_asignacion:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Asignación no encontrada."
-        )
-
-    db_conductor = crud.get_conductor(db, db_asignacion.id_conductor)
+    db_asignacion = crud.get_asignacion_detalle(db, asignacion_id)
+    db_conductor = db_asignacion.conductor
 
     if not current_user.es_admin and (
         not db_conductor or current_user.id_usuario != db_conductor.id_usuario
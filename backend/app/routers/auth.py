@@ -6,21 +6,35 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app import crud, schemas, security
-from app.database import get_db
+from app.database import ReadSessionLocal, get_db
 from app.config import settings
+from app.utils.login_pool import login_executor
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
+def _autenticar_usuario(email: str, password: str):
+    """
+    Busca el usuario y verifica la contraseña (bcrypt). Bloqueante: usar fuera
+    del event loop. Abre su propia sesión en el hilo del pool: la de la
+    petición no puede cruzar de hilo (si el cliente se desconecta, FastAPI la
+    cierra mientras este hilo aún la usa).
+    """
+    with ReadSessionLocal() as db:
+        user = crud.get_usuario_by_email(db, email=email)
+    if not user or not security.verify_password(password, user.password_hash):
+        return None
+    return user
+
+
 @router.post("/token", response_model=schemas.Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
 ):
-    user = crud.get_usuario_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    user = await login_executor.run(_autenticar_usuario, form_data.username, form_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas.",
@@ -40,7 +54,4 @@ def registrar_cliente_desde_auth(
     registro: schemas.UsuarioCreate,
     db: Session = Depends(get_db)
 ):
-    nuevo_usuario = crud.create_usuario(db, registro)
-    cliente_data = schemas.ClienteCreate(id_usuario=nuevo_usuario.id_usuario)
-    crud.create_cliente(db, cliente_data)
-    return nuevo_usuario
+    return crud.create_usuario_cliente(db, registro)
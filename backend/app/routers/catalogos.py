@@ -1,43 +1,138 @@
 # app/routers/catalogos.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import hashlib
+
+from fastapi import APIRouter, Request, Response
+from pydantic import TypeAdapter
 from typing import List
 
-from app import crud, schemas
-from app.database import get_db
+from app import crud, crud_async, models, schemas
+from app.database import AsyncReadSessionLocal
+from app.utils.catalogo_cache import EntradaCatalogo, catalogo_cache, etag_coincide
+from app.utils.compresion import codificacion_negociada, cuerpo_negociado, etag_codificado
+from app.utils.versiones import versiones
 
 router = APIRouter(
     prefix="/catalogos",
     tags=["Catálogos"],
 )
 
+# Contenido de /catalogos/snapshot: campo de CatalogoSnapshot -> (modelo, función de crud)
+_SNAPSHOT = {
+    "tipos_cliente": (models.TipoCliente, crud.get_tipos_cliente),
+    "estados_conductor": (models.EstadoConductor, crud.get_estados_conductor),
+    "tipos_vehiculo": (models.TipoVehiculo, crud.get_tipos_vehiculo),
+    "estados_vehiculo": (models.EstadoVehiculo, crud.get_estados_vehiculo),
+    "tipos_servicio": (models.TipoServicio, crud.get_tipos_servicio),
+    "estados_solicitud": (models.EstadoSolicitud, crud.get_estados_solicitud),
+    "tipos_carga": (models.TipoCarga, crud.get_all_tipos_carga),
+    "tipos_incidente": (models.TipoIncidente, crud.get_all_tipos_incidente),
+    "estados_incidente": (models.EstadoIncidente, crud.get_all_estados_incidente),
+    "estados_reserva": (models.EstadoReserva, crud.get_all_estados_reserva),
+    "monedas": (models.Moneda, crud.get_all_monedas),
+    "tipos_metodo_pago": (models.TipoMetodoPago, crud.get_all_tipos_metodo_pago),
+    "canales_pago": (models.CanalPago, crud.get_all_canales_pago),
+    "estados_pago": (models.EstadoPago, crud.get_all_estados_pago),
+    "tipos_tarifa": (models.TipoTarifa, crud.get_all_tipos_tarifa),
+    "tarifas": (models.Tarifa, crud.get_all_tarifas),
+}
+_TABLAS_SNAPSHOT = tuple(modelo.__tablename__ for modelo, _ in _SNAPSHOT.values())
+
+
+def _responder(request: Request, entrada: EntradaCatalogo) -> Response:
+    """
+    304 si el cliente ya tiene esa versión (If-None-Match); si no, los bytes
+    cacheados, comprimidos según Accept-Encoding una sola vez por entrada.
+    Cada variante lleva su ETag (`"<hash>-br"`) y cualquiera vale para el 304.
+    """
+    codificacion = codificacion_negociada(entrada.cuerpo, request.headers.get("accept-encoding"))
+    cabeceras = {
+        "ETag": etag_codificado(entrada.etag, codificacion), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"
+    }
+    if etag_coincide(request.headers.get("if-none-match"), entrada.etag):
+        return Response(status_code=304, headers=cabeceras)
+    if codificacion is not None:
+        cabeceras["Content-Encoding"] = codificacion
+    cuerpo = cuerpo_negociado(entrada.cuerpo, entrada.comprimidos, codificacion)
+    return Response(content=cuerpo, media_type="application/json", headers=cabeceras)
+
+
+async def _servir_catalogo(request: Request, nombre: str, modelo, esquema, cargar) -> Response:
+    """
+    Sirve un catálogo desde la caché de bytes ya serializados. Solo si falta
+    o está desactualizado se abre una sesión y se consulta.
+    """
+    tabla = modelo.__tablename__
+    entrada = catalogo_cache.get(nombre, tabla)
+    if entrada is None:
+        version = versiones.de((tabla,))
+        async with AsyncReadSessionLocal() as db:
+            filas = await cargar(db)
+        adaptador = TypeAdapter(List[esquema])
+        entrada = catalogo_cache.set(nombre, version, adaptador.dump_json(adaptador.validate_python(filas)))
+    return _responder(request, entrada)
+
+
+@router.get("/snapshot", response_model=schemas.CatalogoSnapshot)
+async def read_snapshot(request: Request):
+    """
+    Todas las tablas de catálogo en una sola respuesta, comprimida (brotli o
+    gzip) si el cliente lo admite. `version` (y el ETag) es un hash del contenido:
+    al arrancar, el cliente envía If-None-Match y recibe 304 si nada cambió.
+    """
+    entrada = catalogo_cache.get("snapshot", *_TABLAS_SNAPSHOT)
+    if entrada is None:
+        version = versiones.de(_TABLAS_SNAPSHOT)
+        async with AsyncReadSessionLocal() as db:
+            tablas = await db.run_sync(
+                lambda sesion: {nombre: cargar(sesion) for nombre, (_, cargar) in _SNAPSHOT.items()}
+            )
+        snapshot = schemas.CatalogoSnapshot(version="", **tablas)
+        snapshot.version = hashlib.sha1(snapshot.model_dump_json(exclude={"version"}).encode()).hexdigest()[:20]
+        entrada = catalogo_cache.set("snapshot", version, snapshot.model_dump_json().encode(), etag=snapshot.version)
+    return _responder(request, entrada)
+
 
 @router.get("/tipos_cliente", response_model=List[schemas.TipoClienteSchema])
-def read_tipos_cliente(db: Session = Depends(get_db)):
-    return crud.get_tipos_cliente(db)
+async def read_tipos_cliente(request: Request):
+    return await _servir_catalogo(
+        request, "tipos_cliente", models.TipoCliente, schemas.TipoClienteSchema, crud_async.get_tipos_cliente
+    )
 
 
 @router.get("/estados_conductor", response_model=List[schemas.EstadoConductorSchema])
-def read_estados_conductor(db: Session = Depends(get_db)):
-    return crud.get_estados_conductor(db)
+async def read_estados_conductor(request: Request):
+    return await _servir_catalogo(
+        request, "estados_conductor", models.EstadoConductor, schemas.EstadoConductorSchema,
+        crud_async.get_estados_conductor,
+    )
 
 
 @router.get("/tipos_vehiculo", response_model=List[schemas.TipoVehiculoSchema])
-def read_tipos_vehiculo(db: Session = Depends(get_db)):
-    return crud.get_tipos_vehiculo(db)
+async def read_tipos_vehiculo(request: Request):
+    return await _servir_catalogo(
+        request, "tipos_vehiculo", models.TipoVehiculo, schemas.TipoVehiculoSchema, crud_async.get_tipos_vehiculo
+    )
 
 
 @router.get("/estados_vehiculo", response_model=List[schemas.EstadoVehiculoSchema])
-def read_estados_vehiculo(db: Session = Depends(get_db)):
-    return crud.get_estados_vehiculo(db)
+async def read_estados_vehiculo(request: Request):
+    return await _servir_catalogo(
+        request, "estados_vehiculo", models.EstadoVehiculo, schemas.EstadoVehiculoSchema,
+        crud_async.get_estados_vehiculo,
+    )
 
 
 @router.get("/tipos_servicio", response_model=List[schemas.TipoServicioSchema])
-def read_tipos_servicio(db: Session = Depends(get_db)):
-    return crud.get_tipos_servicio(db)
+async def read_tipos_servicio(request: Request):
+    return await _servir_catalogo(
+        request, "tipos_servicio", models.TipoServicio, schemas.TipoServicioSchema, crud_async.get_tipos_servicio
+    )
 
 
 @router.get("/estados_solicitud", response_model=List[schemas.EstadoSolicitudSchema])
-def read_estados_solicitud(db: Session = Depends(get_db)):
-    return crud.get_estados_solicitud(db)
+async def read_estados_solicitud(request: Request):
+    return await _servir_catalogo(
+        request, "estados_solicitud", models.EstadoSolicitud, schemas.EstadoSolicitudSchema,
+        crud_async.get_estados_solicitud,
+    )
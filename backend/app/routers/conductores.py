@@ -1,16 +1,25 @@
 # app/routers/conductores.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
+from app.exceptions import BadRequestException
+from app.utils.campos import esquema_parcial, parsear_campos
+from app.utils.paginacion import CABECERA_CURSOR, siguiente_cursor
+from app.utils.por_ids import parsear_ids, respuesta_por_ids
+from app.utils.principal_cache import principal_cache
+from app.utils.respuesta_cache import RutaCacheable, cache_respuesta
+from app.utils.serializacion import respuesta_modelo
 
 router = APIRouter(
     prefix="/conductores",
     tags=["Conductores"],
+    route_class=RutaCacheable,
 )
 
 
@@ -40,6 +49,7 @@ def create_conductor(
     if not db_usuario.es_conductor:
         db_usuario.es_conductor = True
         db.commit()
+        principal_cache.invalidate(db_usuario.email)
 
     return crud.create_conductor(db=db, conductor=conductor)
 
@@ -48,36 +58,71 @@ def create_conductor(
 def read_conductores(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
     Lista todos los conductores.
     Acceso exclusivo para administradores.
+    Para páginas profundas, usar el cursor de la cabecera X-Next-Cursor.
+    Con `fields`, solo se leen y devuelven esos campos.
     """
     if not current_user.es_admin:
         raise HTTPException(status_code=403, detail="No tienes permiso para acceder.")
-    return crud.get_conductores(db, skip=skip, limit=limit)
+    campos = parsear_campos(fields, schemas.ConductorInDB)
+    conductores = crud.get_conductores(db, skip=skip, limit=limit, cursor=cursor, campos=campos)
+    siguiente = siguiente_cursor(conductores, limit, crud.ORDEN_CONDUCTORES)
+    return respuesta_modelo(
+        List[esquema_parcial(schemas.ConductorInDB, campos)],
+        conductores,
+        headers={CABECERA_CURSOR: siguiente} if siguiente else None,
+    )
+
+
+@router.get("/batch", response_model=List[schemas.ResultadoPorId[schemas.ConductorInDB]])
+def read_conductores_batch(
+    ids: str = Query(..., description="Ids separados por comas"),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Varios conductores en una sola consulta, en el orden de `ids`. Cada id trae
+    su estado: ok, no_encontrado o prohibido (solo el mismo conductor o un admin).
+    """
+    lista = parsear_ids(ids)
+    campos = parsear_campos(fields, schemas.ConductorInDB)
+    conductores = crud.get_conductores_by_ids(db, lista, campos=campos)
+    return respuesta_por_ids(
+        esquema_parcial(schemas.ConductorInDB, campos), lista, conductores,
+        lambda conductor: current_user.es_admin or conductor.id_usuario == current_user.id_usuario,
+    )
 
 
 @router.get("/{conductor_id}", response_model=schemas.ConductorInDB)
 def read_conductor(
     conductor_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
     Obtiene un perfil de conductor.
     Acceso permitido al mismo conductor o a un administrador.
+    Con `fields`, solo se leen y devuelven esos campos.
     """
-    db_conductor = crud.get_conductor(db, conductor_id)
+    campos = parsear_campos(fields, schemas.ConductorInDB)
+    # id_usuario hace falta para comprobar el permiso aunque no se pida
+    db_conductor = crud.get_conductor(db, conductor_id, campos=None if campos is None else campos + ("id_usuario",))
     if not db_conductor:
         raise HTTPException(status_code=404, detail="Conductor no encontrado.")
 
     if not current_user.es_admin and current_user.id_usuario != db_conductor.id_usuario:
         raise HTTPException(status_code=403, detail="No autorizado.")
     
-    return db_conductor
+    return respuesta_modelo(esquema_parcial(schemas.ConductorInDB, campos), db_conductor)
 
 
 @router.post("/servicios", response_model=schemas.ConductorServicioInDB)
@@ -100,10 +145,35 @@ def add_servicio_to_conductor(
     return crud.create_conductor_servicio(db, servicio)
 
 
+@router.post("/servicios/bulk", response_model=schemas.RespuestaLote)
+def add_servicios_to_conductores(
+    servicios: List[schemas.ConductorServicioCreate],
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Asocia varios servicios a conductores en una sola transacción.
+    Un conductor solo puede asociar servicios a sí mismo; el resto de sus
+    elementos se rechazan. Un admin puede hacerlo para cualquiera.
+    """
+    if len(servicios) > settings.BULK_MAX_ITEMS:
+        raise BadRequestException(detail=f"Máximo {settings.BULK_MAX_ITEMS} elementos por lote.")
+
+    id_conductor_permitido = None
+    if not current_user.es_admin:
+        db_conductor = crud.get_conductor_by_user_id(db, current_user.id_usuario)
+        if not db_conductor:
+            raise HTTPException(status_code=403, detail="No autorizado.")
+        id_conductor_permitido = db_conductor.id_conductor
+
+    return crud.create_conductor_servicios_bulk(db, servicios, id_conductor_permitido=id_conductor_permitido)
+
+
 @router.get("/servicios/{conductor_id}", response_model=List[schemas.ConductorServicioInDB])
+@cache_respuesta("conductor_servicio", "conductores", "usuarios")
 def get_servicios_ofrecidos(
     conductor_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
 
 router = APIRouter(
@@ -30,7 +30,7 @@ def create_incidente(
 @router.get("/{incidente_id}", response_model=schemas.IncidenteEmergenciaInDB)
 def read_incidente(
     incidente_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
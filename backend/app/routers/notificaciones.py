@@ -0,0 +1,83 @@
+# app/routers/notificaciones.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from app import crud, schemas, models
+from app.config import settings
+from app.database import get_db
+from app.dependencies import get_current_active_user
+from app.exceptions import BadRequestException, NotFoundException
+from app.utils.trabajos import trabajos
+
+router = APIRouter(
+    prefix="/notificaciones",
+    tags=["Notificaciones"],
+)
+
+
+@router.post("/bulk", response_model=schemas.RespuestaLote)
+def create_notificaciones_bulk(
+    notificaciones: List[schemas.NotificacionCreate],
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Crea varias notificaciones en una sola transacción.
+    Requiere rol de administrador.
+    Devuelve el resultado de cada elemento en el orden recibido.
+    """
+    if not current_user.es_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo los administradores pueden enviar notificaciones."
+        )
+    if len(notificaciones) > settings.BULK_MAX_ITEMS:
+        raise BadRequestException(detail=f"Máximo {settings.BULK_MAX_ITEMS} elementos por lote.")
+
+    return crud.create_notificaciones_bulk(db, notificaciones)
+
+
+def _difundir(db: Session, parametros: str, trabajo):
+    # Se ejecuta en el pool de trabajos (o al retomarlo en cualquier worker), con su propia sesión
+    crud.difundir_notificacion(db, schemas.DifusionCreate.model_validate_json(parametros), trabajo=trabajo)
+
+
+trabajos.registrar("difusion", _difundir)
+
+
+@router.post("/difusion", response_model=schemas.TrabajoInDB, status_code=202)
+def create_difusion(
+    difusion: schemas.DifusionCreate,
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Envía una notificación a todos los usuarios de un segmento.
+    Requiere rol de administrador. Se procesa en segundo plano: el progreso
+    se consulta en GET /notificaciones/difusion/{id_trabajo} desde cualquier
+    worker, y si el que la envía se detiene, otro la retoma donde quedó.
+    """
+    if not current_user.es_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo los administradores pueden enviar notificaciones."
+        )
+    return trabajos.lanzar("difusion", difusion.model_dump_json())
+
+
+@router.get("/difusion/{id_trabajo}", response_model=schemas.TrabajoInDB)
+def read_difusion(
+    id_trabajo: str,
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Estado y progreso de una difusión.
+    Requiere rol de administrador.
+    """
+    if not current_user.es_admin:
+        raise HTTPException(status_code=403, detail="No tienes permiso para acceder.")
+    trabajo = trabajos.obtener(id_trabajo)
+    if trabajo is None or trabajo.tipo != "difusion":
+        raise NotFoundException(detail="Difusión no encontrada.")
+    return trabajo
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
 
 router = APIRouter(
@@ -28,7 +28,7 @@ def create_transaccion_pago(
 @router.get("/{transaccion_id}", response_model=schemas.TransaccionPagoInDB)
 def read_transaccion_pago(
     transaccion_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
@@ -1,12 +1,18 @@
 # app/routers/solicitudes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
+from app.exceptions import BadRequestException
+from app.utils.campos import esquema_parcial, parsear_campos
+from app.utils.paginacion import CABECERA_CURSOR, siguiente_cursor
+from app.utils.por_ids import parsear_ids, respuesta_por_ids
+from app.utils.serializacion import respuesta_modelo
 
 router = APIRouter(
     prefix="/solicitudes",
@@ -41,17 +47,81 @@ def create_solicitud(
     return crud.create_solicitud(db=db, solicitud=solicitud)
 
 
+@router.post("/bulk", response_model=schemas.RespuestaLote)
+def create_solicitudes_bulk(
+    solicitudes: List[schemas.SolicitudCreate],
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Crea varias solicitudes en una sola transacción.
+    Un cliente solo crea solicitudes a su nombre (se ignora id_cliente);
+    un administrador puede crearlas para cualquier cliente.
+    Devuelve el resultado de cada elemento en el orden recibido.
+    """
+    if len(solicitudes) > settings.BULK_MAX_ITEMS:
+        raise BadRequestException(detail=f"Máximo {settings.BULK_MAX_ITEMS} elementos por lote.")
+
+    if not current_user.es_admin:
+        if not current_user.es_cliente:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Solo los clientes pueden crear solicitudes."
+            )
+        cliente = crud.get_cliente_by_user_id(db, usuario_id=current_user.id_usuario)
+        if not cliente:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Perfil de cliente no encontrado. Contacte a soporte."
+            )
+        for solicitud in solicitudes:
+            solicitud.id_cliente = cliente.id_cliente
+
+    return crud.create_solicitudes_bulk(db, solicitudes)
+
+
+@router.get("/batch", response_model=List[schemas.ResultadoPorId[schemas.SolicitudInDB]])
+def read_solicitudes_batch(
+    ids: str = Query(..., description="Ids separados por comas"),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Varias solicitudes en una sola consulta, en el orden de `ids`. Cada id trae
+    su estado: ok, no_encontrado o prohibido (solo el cliente que la creó o un
+    admin).
+    """
+    lista = parsear_ids(ids)
+    campos = parsear_campos(fields, schemas.SolicitudInDB)
+    solicitudes = crud.get_solicitudes_by_ids(db, lista, campos=campos)
+    propio = None
+    if not current_user.es_admin:
+        cliente = crud.get_cliente_by_user_id(db, usuario_id=current_user.id_usuario)
+        propio = cliente.id_cliente if cliente else None
+    return respuesta_por_ids(
+        esquema_parcial(schemas.SolicitudInDB, campos), lista, solicitudes,
+        lambda solicitud: current_user.es_admin or (propio is not None and solicitud.id_cliente == propio),
+    )
+
+
 @router.get("/{solicitud_id}", response_model=schemas.SolicitudInDB)
 def read_solicitud(
     solicitud_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
     Devuelve los detalles de una solicitud específica.
     Solo el cliente que la creó o un administrador pueden verla.
+    Con `fields`, solo se leen y devuelven esos campos.
     """
-    db_solicitud = crud.get_solicitud(db, solicitud_id=solicitud_id)
+    campos = parsear_campos(fields, schemas.SolicitudInDB)
+    # id_cliente hace falta para comprobar el permiso aunque no se pida
+    db_solicitud = crud.get_solicitud(
+        db, solicitud_id=solicitud_id, campos=None if campos is None else campos + ("id_cliente",)
+    )
     if db_solicitud is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -66,19 +136,23 @@ def read_solicitud(
                 detail="No tienes permiso para ver esta solicitud."
             )
 
-    return db_solicitud
+    return respuesta_modelo(esquema_parcial(schemas.SolicitudInDB, campos), db_solicitud)
 
 
 @router.get("/", response_model=List[schemas.SolicitudInDB])
 def get_all_solicitudes(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
-    Obtiene una lista de todas las solicitudes.
+    Obtiene una lista de todas las solicitudes, de la más reciente a la más antigua.
     Solo accesible para administradores.
+    Para páginas profundas, usar el cursor de la cabecera X-Next-Cursor.
+    Con `fields`, solo se leen y devuelven esos campos.
     """
     if not current_user.es_admin:
         raise HTTPException(
@@ -86,4 +160,11 @@ def get_all_solicitudes(
             detail="Solo administradores pueden acceder a todas las solicitudes."
         )
 
-    return crud.get_solicitudes(db, skip=skip, limit=limit)
+    campos = parsear_campos(fields, schemas.SolicitudInDB)
+    solicitudes = crud.get_solicitudes(db, skip=skip, limit=limit, cursor=cursor, campos=campos)
+    siguiente = siguiente_cursor(solicitudes, limit, crud.ORDEN_SOLICITUDES)
+    return respuesta_modelo(
+        List[esquema_parcial(schemas.SolicitudInDB, campos)],
+        solicitudes,
+        headers={CABECERA_CURSOR: siguiente} if siguiente else None,
+    )
@@ -1,24 +1,28 @@
 # app/routers/users.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
+from app.utils.campos import esquema_parcial, parsear_campos
+from app.utils.paginacion import CABECERA_CURSOR, siguiente_cursor
+from app.utils.por_ids import parsear_ids, respuesta_por_ids
+from app.utils.respuesta_cache import RutaCacheable, cache_respuesta
+from app.utils.serializacion import respuesta_modelo
 
 router = APIRouter(
     prefix="/users",
     tags=["Usuarios"],
+    route_class=RutaCacheable,
 )
 
 
 @router.post("/", response_model=schemas.UsuarioInDB, status_code=201)
 def create_user(user: schemas.UsuarioCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_usuario_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(status_code=409, detail="El correo ya está registrado")
+    # El email duplicado lo detecta crud.create_usuario (409)
     return crud.create_usuario(db=db, usuario=user)
 
 
@@ -26,32 +30,64 @@ def create_user(user: schemas.UsuarioCreate, db: Session = Depends(get_db)):
 def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     if not current_user.es_admin:
         raise HTTPException(status_code=403, detail="Acceso denegado")
-    return crud.get_usuarios(db, skip=skip, limit=limit)
+    campos = parsear_campos(fields, schemas.UsuarioInDB)
+    usuarios = crud.get_usuarios(db, skip=skip, limit=limit, cursor=cursor, campos=campos)
+    siguiente = siguiente_cursor(usuarios, limit, crud.ORDEN_USUARIOS)
+    return respuesta_modelo(
+        List[esquema_parcial(schemas.UsuarioInDB, campos)],
+        usuarios,
+        headers={CABECERA_CURSOR: siguiente} if siguiente else None,
+    )
 
 
 @router.get("/me", response_model=schemas.UsuarioInDB)
+@cache_respuesta("usuarios")
 def read_users_me(current_user: models.Usuario = Depends(get_current_active_user)):
     return current_user
 
 
+@router.get("/batch", response_model=List[schemas.ResultadoPorId[schemas.UsuarioInDB]])
+def read_users_batch(
+    ids: str = Query(..., description="Ids separados por comas"),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Varios usuarios en una sola consulta, en el orden de `ids`. Cada id trae
+    su estado: ok, no_encontrado o prohibido (solo el propio usuario o un admin).
+    """
+    lista = parsear_ids(ids)
+    campos = parsear_campos(fields, schemas.UsuarioInDB)
+    usuarios = crud.get_usuarios_by_ids(db, lista, campos=campos)
+    return respuesta_por_ids(
+        esquema_parcial(schemas.UsuarioInDB, campos), lista, usuarios,
+        lambda usuario: current_user.es_admin or usuario.id_usuario == current_user.id_usuario,
+    )
+
+
 @router.get("/{user_id}", response_model=schemas.UsuarioInDB)
 def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     if not current_user.es_admin and current_user.id_usuario != user_id:
         raise HTTPException(status_code=403, detail="No autorizado")
     
-    db_user = crud.get_usuario(db, usuario_id=user_id)
+    campos = parsear_campos(fields, schemas.UsuarioInDB)
+    db_user = crud.get_usuario(db, usuario_id=user_id, campos=campos)
     if db_user is None:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return db_user
+    return respuesta_modelo(esquema_parcial(schemas.UsuarioInDB, campos), db_user)
 
 
 @router.put("/{user_id}", response_model=schemas.UsuarioInDB)
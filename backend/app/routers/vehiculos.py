@@ -1,16 +1,19 @@
 # app/routers/vehiculos.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
+from app.utils.por_ids import parsear_ids, respuesta_por_ids
+from app.utils.respuesta_cache import RutaCacheable, cache_respuesta
 
 router = APIRouter(
     prefix="/vehiculos",
     tags=["Vehículos"],
+    route_class=RutaCacheable,
 )
 
 
@@ -40,10 +43,33 @@ def create_vehiculo_for_conductor(
     return crud.create_vehiculo(db=db, vehiculo=vehiculo)
 
 
+@router.get("/batch", response_model=List[schemas.ResultadoPorId[schemas.VehiculoInDB]])
+def read_vehiculos_batch(
+    ids: str = Query(..., description="Ids separados por comas"),
+    db: Session = Depends(get_read_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Varios vehículos en una sola consulta, en el orden de `ids`. Cada id trae
+    su estado: ok, no_encontrado o prohibido (solo el conductor propietario o
+    un admin).
+    """
+    lista = parsear_ids(ids)
+    vehiculos = crud.get_vehiculos_by_ids(db, lista)
+    propio = None
+    if not current_user.es_admin:
+        conductor = crud.get_conductor_by_user_id(db, usuario_id=current_user.id_usuario)
+        propio = conductor.id_conductor if conductor else None
+    return respuesta_por_ids(
+        schemas.VehiculoInDB, lista, vehiculos,
+        lambda vehiculo: current_user.es_admin or (propio is not None and vehiculo.id_conductor == propio),
+    )
+
+
 @router.get("/{vehiculo_id}", response_model=schemas.VehiculoInDB)
 def read_vehiculo(
     vehiculo_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
@@ -68,9 +94,10 @@ def read_vehiculo(
 
 
 @router.get("/conductor/{conductor_id}", response_model=List[schemas.VehiculoInDB])
+@cache_respuesta("vehiculos", "conductores", "usuarios")
 def read_vehiculos_by_conductor(
     conductor_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.Usuario = Depends(get_current_active_user),
 ):
     """
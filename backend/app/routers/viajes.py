@@ -0,0 +1,43 @@
+# app/routers/viajes.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app import crud, schemas, models
+from app.database import get_read_db
+from app.dependencies import get_current_active_user
+
+router = APIRouter(
+    prefix="/viajes",
+    tags=["Viajes"],
+)
+
+
+@router.get("/{solicitud_id}", response_model=schemas.ViajeDetalle)
+def read_viaje(
+    solicitud_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: models.Usuario = Depends(get_current_active_user),
+):
+    """
+    Devuelve en una sola llamada todo lo necesario para la pantalla de un
+    viaje: la solicitud y, si ya está asignada, la asignación con su
+    conductor, vehículo y pago.
+    Solo el cliente de la solicitud, el conductor asignado o un administrador pueden verlo.
+    """
+    db_solicitud = crud.get_viaje(db, solicitud_id)
+
+    asignacion = db_solicitud.asignacion
+    es_cliente = db_solicitud.cliente is not None and db_solicitud.cliente.id_usuario == current_user.id_usuario
+    es_conductor = (
+        asignacion is not None
+        and asignacion.conductor is not None
+        and asignacion.conductor.id_usuario == current_user.id_usuario
+    )
+    if not current_user.es_admin and not (es_cliente or es_conductor):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para ver este viaje."
+        )
+
+    return db_solicitud
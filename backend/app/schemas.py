@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Generic, List, Optional, TypeVar
 import re
 
 
@@ -214,6 +214,36 @@ class TransaccionPagoInDB(TransaccionPagoBase):
         from_attributes = True
 
 
+# Viaje: solicitud con su asignación, conductor, vehículo y pago
+
+class UsuarioResumen(BaseModel):
+    nombre: str
+    apellidos: Optional[str] = None
+    telefono: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ConductorResumen(BaseModel):
+    id_conductor: int
+    calificacion_promedio: Optional[float] = None
+    usuario: Optional[UsuarioResumen] = None
+
+    class Config:
+        from_attributes = True
+
+
+class AsignacionViaje(AsignacionInDB):
+    conductor: Optional[ConductorResumen] = None
+    vehiculo: Optional[VehiculoInDB] = None
+    pago: Optional[TransaccionPagoInDB] = None
+
+
+class ViajeDetalle(SolicitudInDB):
+    asignacion: Optional[AsignacionViaje] = None
+
+
 class NotificacionBase(BaseModel):
     titulo: str
     mensaje: str
@@ -223,6 +253,19 @@ class NotificacionCreate(NotificacionBase):
     id_usuario: int
 
 
+class SegmentoNotificacion(BaseModel):
+    """Destinatarios de una difusión; los criterios se combinan con AND y los omitidos no filtran."""
+    es_cliente: Optional[bool] = None
+    es_conductor: Optional[bool] = None
+    es_admin: Optional[bool] = None
+    id_tipo_cliente: Optional[int] = None
+    id_estados_conductor: Optional[List[int]] = None
+
+
+class DifusionCreate(NotificacionBase):
+    segmento: SegmentoNotificacion = SegmentoNotificacion()
+
+
 class NotificacionInDB(NotificacionBase):
     id_notificacion: int
     id_usuario: int
@@ -291,6 +334,49 @@ class ConductorServicioInDB(ConductorServicioBase):
         from_attributes = True
 
 
+# Operaciones en lote
+
+class ResultadoLote(BaseModel):
+    indice: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RespuestaLote(BaseModel):
+    creados: int
+    fallidos: int
+    resultados: List[ResultadoLote]
+
+
+# Consultas por lote de ids
+
+T = TypeVar("T")
+
+
+class ResultadoPorId(BaseModel, Generic[T]):
+    """Resultado de un id en los endpoints /batch: estado ok, no_encontrado o prohibido."""
+    id: int
+    estado: str
+    dato: Optional[T] = None
+
+
+# Trabajos en segundo plano
+
+class TrabajoInDB(BaseModel):
+    id_trabajo: str
+    tipo: str
+    estado: str
+    total: Optional[int] = None
+    procesados: int
+    creado: datetime
+    terminado: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Catálogos
 
 class TipoClienteSchema(BaseModel):
@@ -303,7 +389,7 @@ class TipoClienteSchema(BaseModel):
 
 class EstadoConductorSchema(BaseModel):
     id_estado_conductor: int
-    descripcion: str
+    nombre: str
 
     class Config:
         from_attributes = True
@@ -311,7 +397,10 @@ class EstadoConductorSchema(BaseModel):
 
 class TipoVehiculoSchema(BaseModel):
     id_tipo_vehiculo: int
-    descripcion: str
+    nombre: str
+    capacidad_maxima_pasajero: Optional[int] = None
+    capacidad_maxima_carga: Optional[float] = None
+    capacidad_maxima_volumen: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -319,7 +408,7 @@ class TipoVehiculoSchema(BaseModel):
 
 class EstadoVehiculoSchema(BaseModel):
     id_estado_vehiculo: int
-    descripcion: str
+    nombre: str
 
     class Config:
         from_attributes = True
@@ -327,7 +416,9 @@ class EstadoVehiculoSchema(BaseModel):
 
 class TipoServicioSchema(BaseModel):
     id_tipo_servicio: int
-    descripcion: str
+    nombre: str
+    descripcion: Optional[str] = None
+    es_colectivo: bool
 
     class Config:
         from_attributes = True
@@ -335,11 +426,120 @@ class TipoServicioSchema(BaseModel):
 
 class EstadoSolicitudSchema(BaseModel):
     id_estado_solicitud: int
-    descripcion: str
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class TipoCargaSchema(BaseModel):
+    id_tipo_carga: int
+    nombre: str
+    descripcion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TipoIncidenteSchema(BaseModel):
+    id_tipo_incidente: int
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class EstadoIncidenteSchema(BaseModel):
+    id_estado_incidente: int
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class EstadoReservaSchema(BaseModel):
+    id_estado_reserva: int
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class MonedaSchema(BaseModel):
+    id_moneda: int
+    codigo: str
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class TipoMetodoPagoSchema(BaseModel):
+    id_tipo_metodo_pago: int
+    nombre: str
 
     class Config:
         from_attributes = True
 
 
+class CanalPagoSchema(BaseModel):
+    id_canal_pago: int
+    nombre: str
+    descripcion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class EstadoPagoSchema(BaseModel):
+    id_estado_pago: int
+    nombre: str
+
+    class Config:
+        from_attributes = True
+
+
+class TipoTarifaSchema(BaseModel):
+    id_tipo_tarifa: int
+    nombre: str
+    descripcion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TarifaSchema(BaseModel):
+    id_tarifa: int
+    valor: float
+    fecha_vigencia: date
+    es_fija: Optional[bool] = None
+    id_moneda: Optional[int] = None
+    id_tipo_tarifa: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CatalogoSnapshot(BaseModel):
+    """Todas las tablas de catálogo; `version` es un hash de su contenido."""
+    version: str
+    tipos_cliente: List[TipoClienteSchema]
+    estados_conductor: List[EstadoConductorSchema]
+    tipos_vehiculo: List[TipoVehiculoSchema]
+    estados_vehiculo: List[EstadoVehiculoSchema]
+    tipos_servicio: List[TipoServicioSchema]
+    estados_solicitud: List[EstadoSolicitudSchema]
+    tipos_carga: List[TipoCargaSchema]
+    tipos_incidente: List[TipoIncidenteSchema]
+    estados_incidente: List[EstadoIncidenteSchema]
+    estados_reserva: List[EstadoReservaSchema]
+    monedas: List[MonedaSchema]
+    tipos_metodo_pago: List[TipoMetodoPagoSchema]
+    canales_pago: List[CanalPagoSchema]
+    estados_pago: List[EstadoPagoSchema]
+    tipos_tarifa: List[TipoTarifaSchema]
+    tarifas: List[TarifaSchema]
+
+
 IncidenteEmergenciaCreate = IncidenteCreate
 IncidenteEmergenciaInDB = IncidenteInDB
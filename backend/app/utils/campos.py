@@ -0,0 +1,56 @@
+# app/utils/campos.py
+
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+from app.exceptions import BadRequestException
+
+
+def parsear_campos(fields: Optional[str], esquema) -> Optional[tuple]:
+    """
+    Campos pedidos en `?fields=a,b,c`, validados contra `esquema` y en el orden
+    de sus campos. None si no se pidió ninguno (respuesta completa).
+    """
+    if fields is None:
+        return None
+    pedidos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+    if not pedidos:
+        raise BadRequestException(detail="El parámetro fields no puede estar vacío.")
+    desconocidos = sorted(pedidos - set(esquema.model_fields))
+    if desconocidos:
+        raise BadRequestException(detail=f"Campos desconocidos en fields: {', '.join(desconocidos)}.")
+    return tuple(campo for campo in esquema.model_fields if campo in pedidos)
+
+
+@lru_cache(maxsize=256)
+def esquema_parcial(esquema, campos: Optional[tuple]):
+    """`esquema` reducido a `campos` (el mismo esquema si es None); uno por combinación."""
+    if campos is None:
+        return esquema
+    return create_model(
+        f"{esquema.__name__}Parcial",
+        __config__=ConfigDict(from_attributes=True),
+        **{campo: (esquema.model_fields[campo].annotation, esquema.model_fields[campo]) for campo in campos},
+    )
+
+
+def opciones_carga(modelo, campos, obligatorias=()) -> list:
+    """
+    Opciones de consulta para leer solo `campos` de `modelo`: load_only con
+    esas columnas más la PK y `obligatorias` (p. ej. las del orden del cursor),
+    y selectinload de las relaciones pedidas. Los campos que no son columnas
+    ni relaciones del modelo se ignoran.
+    """
+    mapper = inspect(modelo)
+    columnas = {atributo.key for atributo in mapper.column_attrs}
+    relaciones = {relacion.key for relacion in mapper.relationships}
+    claves = [mapper.get_property_by_column(columna).key for columna in mapper.primary_key]
+    claves += [atributo.key for atributo in obligatorias]
+    claves += [campo for campo in campos if campo in columnas]
+    opciones = [load_only(*(getattr(modelo, clave) for clave in dict.fromkeys(claves)))]
+    opciones += [selectinload(getattr(modelo, campo)) for campo in campos if campo in relaciones]
+    return opciones
@@ -0,0 +1,78 @@
+# app/utils/catalogo_cache.py
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.config import settings
+from app.utils.compresion import etag_sin_codificacion
+from app.utils.versiones import versiones
+
+
+@dataclass(frozen=True)
+class EntradaCatalogo:
+    cuerpo: bytes  # JSON ya serializado
+    etag: str
+    version: tuple  # versiones de las tablas de origen al leerlas
+    expira: float
+    comprimidos: dict = field(default_factory=dict)  # codificación -> cuerpo (app.utils.compresion)
+
+
+class CatalogoCache:
+    """
+    Catálogos ya serializados a JSON, indexados por nombre.
+
+    Cada entrada recuerda la versión de sus tablas (app.utils.versiones) en el
+    momento de leerlas; deja de servirse cuando alguna cambia o pasa el TTL.
+    El ETag es un hash del contenido, así que coincide entre workers que
+    tengan los mismos datos.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entradas: dict[str, EntradaCatalogo] = {}
+        self._lock = threading.Lock()
+
+    def get(self, nombre: str, *tablas: str) -> Optional[EntradaCatalogo]:
+        entrada = self._entradas.get(nombre)
+        if entrada is None:
+            return None
+        if entrada.version != versiones.de(tablas) or entrada.expira <= time.monotonic():
+            return None
+        return entrada
+
+    def set(
+        self, nombre: str, version: tuple, cuerpo: bytes, etag: Optional[str] = None
+    ) -> EntradaCatalogo:
+        """Guarda `cuerpo` leído con la versión `version` (tomada antes de consultar)."""
+        entrada = EntradaCatalogo(
+            cuerpo=cuerpo,
+            etag=f'"{etag or hashlib.sha1(cuerpo).hexdigest()[:20]}"',
+            version=version,
+            expira=time.monotonic() + self.ttl_seconds,
+        )
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entradas[nombre] = entrada
+        return entrada
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+def etag_coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara la cabecera If-None-Match (lista, comodín o ETag débil) con `etag`.
+    Vale también el ETag de cualquier variante comprimida del mismo cuerpo
+    (`"<hash>-gzip"`): la validación de caché es por contenido, no por bytes.
+    """
+    if not if_none_match:
+        return False
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidatos or etag in (etag_sin_codificacion(c) for c in candidatos)
+
+
+catalogo_cache = CatalogoCache(ttl_seconds=settings.CATALOGO_CACHE_TTL_SECONDS)
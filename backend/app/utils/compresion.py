@@ -0,0 +1,132 @@
+# app/utils/compresion.py
+
+import gzip
+import zlib
+from typing import Optional
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+# Por orden de preferencia del servidor cuando el cliente las acepta por igual
+CODIFICACIONES = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Niveles al vuelo (cada respuesta, en el event loop) y para cuerpos cacheados (una vez)
+_NIVEL_AL_VUELO = {"br": 4, "gzip": 5}
+_NIVEL_CACHE = {"br": 9, "gzip": 9}
+
+
+def elegir_codificacion(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    La codificación de CODIFICACIONES con mayor q en Accept-Encoding (con
+    empate, la preferida del servidor), o None si no acepta ninguna. `*`
+    vale para las que no se nombran y q=0 las descarta.
+    """
+    if not accept_encoding:
+        return None
+    pesos = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        parametro = parametros.strip().replace(" ", "").lower()
+        if parametro.startswith("q="):
+            try:
+                q = float(parametro[2:])
+            except ValueError:
+                q = 0.0
+        pesos[nombre.strip().lower()] = q
+    comodin = pesos.get("*", 0.0)
+    mejor, mejor_q = None, 0.0
+    for codificacion in CODIFICACIONES:
+        q = pesos.get(codificacion, comodin)
+        if q > mejor_q:
+            mejor, mejor_q = codificacion, q
+    return mejor
+
+
+def comprimir(cuerpo: bytes, codificacion: str, cache: bool = False) -> bytes:
+    """Comprime `cuerpo`; con `cache`, al nivel alto de los cuerpos que se guardan."""
+    nivel = (_NIVEL_CACHE if cache else _NIVEL_AL_VUELO)[codificacion]
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=nivel)
+    # mtime fijo: el mismo cuerpo comprime igual en todos los workers
+    return gzip.compress(cuerpo, compresslevel=nivel, mtime=0)
+
+
+def compresor(codificacion: str):
+    """Compresor incremental para respuestas en streaming: .compress(trozo) y .finish()."""
+    if codificacion == "br":
+        return _CompresorBrotli()
+    return _CompresorGzip()
+
+
+class _CompresorGzip:
+    def __init__(self):
+        self._obj = zlib.compressobj(_NIVEL_AL_VUELO["gzip"], zlib.DEFLATED, 31)  # 31: cabecera gzip
+
+    def compress(self, datos: bytes) -> bytes:
+        return self._obj.compress(datos) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _CompresorBrotli:
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=_NIVEL_AL_VUELO["br"])
+
+    def compress(self, datos: bytes) -> bytes:
+        return self._obj.process(datos) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+def codificacion_negociada(cuerpo: bytes, accept_encoding: Optional[str]) -> Optional[str]:
+    """Codificación con la que se sirve un cuerpo cacheado según Accept-Encoding, o None."""
+    if len(cuerpo) < settings.COMPRESION_MIN_BYTES:
+        return None
+    return elegir_codificacion(accept_encoding)
+
+
+def cuerpo_negociado(cuerpo: bytes, comprimidos: dict, codificacion: Optional[str]) -> bytes:
+    """
+    Para cuerpos cacheados: la variante `codificacion` (de
+    codificacion_negociada) de `cuerpo`. Cada variante se comprime la primera
+    vez que se pide y se guarda en `comprimidos` (el dict de la entrada de
+    caché), así que el coste se paga una vez por entrada y no por petición.
+    """
+    if codificacion is None:
+        return cuerpo
+    comprimido = comprimidos.get(codificacion)
+    if comprimido is None:
+        # Dos peticiones simultáneas pueden comprimir las dos: el resultado es el mismo
+        comprimido = comprimidos[codificacion] = comprimir(cuerpo, codificacion, cache=True)
+    return comprimido
+
+
+# Sufijos que puede traer un ETag, esté o no brotli instalado en este worker
+_SUFIJOS_ETAG = tuple(f"-{c}" for c in ("br", "gzip"))
+
+
+def etag_codificado(etag: str, codificacion: Optional[str]) -> str:
+    """
+    ETag de una variante codificada: `"<hash>-br"`. Los bytes de cada
+    variante son distintos, así que no pueden compartir el ETag fuerte de la
+    identidad (lo reutilizarían cachés intermedias y peticiones Range).
+    """
+    if codificacion is None:
+        return etag
+    return f'{etag[:-1]}-{codificacion}"'
+
+
+def etag_sin_codificacion(etag: str) -> str:
+    """El ETag de la identidad a partir del de cualquier variante, débil o no."""
+    etag = etag.removeprefix("W/")
+    for sufijo in _SUFIJOS_ETAG:
+        if etag.endswith(f'{sufijo}"'):
+            return f'{etag[:-len(sufijo) - 1]}"'
+    return etag
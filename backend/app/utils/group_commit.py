@@ -0,0 +1,172 @@
+# app/utils/group_commit.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import SQLALCHEMY_DATABASE_URL, _is_sqlite_memory, build_engine
+from app.utils.logging_config import logger
+
+_FIN = object()
+
+
+def _begin_immediate(engine):
+    """
+    pysqlite no emite BEGIN antes de un SAVEPOINT, así que liberar el primer
+    savepoint de un lote confirmaría por su cuenta. Se toma el control de la
+    transacción (receta de la documentación de SQLAlchemy) y se abre con
+    BEGIN IMMEDIATE: el escritor pide el lock de escritura desde el principio.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _sin_transaccion_implicita(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+class GroupCommitWriter:
+    """
+    Coordinador de escrituras: un único hilo recibe operaciones pequeñas de
+    muchos hilos y las confirma juntas en un solo commit (un solo fsync y una
+    sola toma del lock de escritura de SQLite por lote).
+
+    Cada operación es una función `op(session) -> resultado` que solo debe
+    añadir objetos a la sesión (puede repetirse si el lote se reintenta).
+    Primero se intenta el lote completo con un único flush, en el que
+    SQLAlchemy agrupa las filas de cada tabla en INSERT ... RETURNING de
+    varias filas. Si ese flush falla, el lote se repite con un SAVEPOINT por
+    operación: solo se deshace la que falla, su llamador recibe la excepción
+    y el resto se confirma. Si falla el commit, todos reciben el error.
+
+    El lote se cierra al llegar a `max_batch` operaciones o cuando pasan
+    `window_ms` desde la primera.
+    """
+
+    def __init__(self, session_factory, window_ms: float, max_batch: int):
+        self._session_factory = session_factory
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._cola = queue.SimpleQueue()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def _arrancar(self):
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._bucle, name="group-commit", daemon=True)
+                self._hilo.start()
+
+    def submit(self, operacion) -> Future:
+        if self._hilo is None:
+            self._arrancar()
+        futuro = Future()
+        self._cola.put((operacion, futuro))
+        return futuro
+
+    def run(self, operacion):
+        """Encola la operación y espera a que su lote se confirme."""
+        return self.submit(operacion).result()
+
+    def shutdown(self):
+        with self._lock:
+            hilo = self._hilo
+        if hilo is not None and hilo.is_alive():
+            self._cola.put(_FIN)
+            hilo.join()
+
+    def _bucle(self):
+        while True:
+            primero = self._cola.get()
+            if primero is _FIN:
+                return
+            lote = [primero]
+            limite = time.monotonic() + self._window
+            terminar = False
+            while len(lote) < self._max_batch:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    siguiente = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if siguiente is _FIN:
+                    terminar = True
+                    break
+                lote.append(siguiente)
+            self._confirmar(lote)
+            if terminar:
+                return
+
+    def _confirmar(self, lote):
+        lote = [(op, futuro) for op, futuro in lote if futuro.set_running_or_notify_cancel()]
+        session = self._session_factory()
+        confirmadas = []
+        try:
+            try:
+                confirmadas = self._aplicar(session, lote, aisladas=False)
+                session.flush()
+            except Exception:
+                # Alguna fila no entra: se repite el lote aislando cada operación
+                session.rollback()
+                confirmadas = self._aplicar(session, lote, aisladas=True)
+            session.commit()
+        except Exception as exc:
+            logger.error(f"Group commit de {len(lote)} operaciones fallido: {exc}")
+            session.rollback()
+            for futuro, _ in confirmadas:
+                futuro.set_exception(exc)
+            return
+        finally:
+            # Los objetos quedan desacoplados con sus atributos cargados (expire_on_commit=False)
+            session.close()
+        for futuro, resultado in confirmadas:
+            futuro.set_result(resultado)
+
+    @staticmethod
+    def _aplicar(session, lote, aisladas: bool):
+        confirmadas = []
+        for operacion, futuro in lote:
+            if futuro.done():
+                continue
+            try:
+                if aisladas:
+                    with session.begin_nested():
+                        resultado = operacion(session)
+                        session.flush()
+                else:
+                    resultado = operacion(session)
+            except Exception as exc:  # el error es de esa operación: se entrega a su llamador
+                futuro.set_exception(exc)
+            else:
+                confirmadas.append((futuro, resultado))
+        return confirmadas
+
+
+def _build_writer():
+    if _is_sqlite_memory(make_url(SQLALCHEMY_DATABASE_URL)):
+        # Un engine aparte vería otra base en memoria distinta
+        logger.warning("GROUP_COMMIT_ENABLED se ignora con SQLite en memoria.")
+        return None
+    writer_engine = build_engine(SQLALCHEMY_DATABASE_URL)
+    if writer_engine.dialect.name == "sqlite":
+        _begin_immediate(writer_engine)
+    return GroupCommitWriter(
+        sessionmaker(bind=writer_engine, autoflush=False, expire_on_commit=False),
+        window_ms=settings.GROUP_COMMIT_WINDOW_MS,
+        max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+    )
+
+
+group_commit_writer = _build_writer() if settings.GROUP_COMMIT_ENABLED else None
@@ -0,0 +1,49 @@
+# app/utils/login_pool.py
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from app.config import settings
+from app.exceptions import ServiceUnavailableException
+
+
+class BoundedExecutor:
+    """
+    Pool de hilos con un límite de trabajos en cola.
+
+    Cuando hay `max_workers + max_queue` trabajos pendientes se rechaza el
+    siguiente de inmediato con un 503, en lugar de dejar que la cola crezca.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableException(
+                detail="Demasiados inicios de sesión simultáneos. Intente más tarde."
+            )
+        try:
+            future = self._executor.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._slots.release()
+            raise
+        # El hueco se libera cuando el trabajo termina de verdad (o se cancela
+        # antes de empezar), no cuando el cliente abandona la petición.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+login_executor = BoundedExecutor(
+    max_workers=settings.LOGIN_HASH_WORKERS,
+    max_queue=settings.LOGIN_HASH_QUEUE_DEPTH,
+    thread_name_prefix="login",
+)
@@ -0,0 +1,87 @@
+# app/utils/paginacion.py
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Integer, literal, tuple_
+
+from app.exceptions import BadRequestException
+
+# Cabecera con el cursor de la página siguiente en los listados paginados
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+def _a_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable en cursor: {type(valor).__name__}")
+
+
+def codificar_cursor(valores) -> str:
+    """Cursor opaco (base64 de JSON) con los valores de la clave de orden de la última fila."""
+    crudo = json.dumps(list(valores), default=_a_json, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, columnas) -> list:
+    """
+    Valores de la clave de orden contenidos en el cursor, con el tipo de cada
+    columna. Un valor de otro tipo es un 400, no una página vacía: SQLite
+    ordena el texto después de cualquier entero y `id > 'a'` no devuelve nada,
+    que el cliente tomaría por el final de la lista.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError):
+        raise BadRequestException(detail="Cursor de paginación inválido.")
+    if not isinstance(valores, list) or len(valores) != len(columnas):
+        raise BadRequestException(detail="Cursor de paginación inválido.")
+
+    convertidos = []
+    for columna, valor in zip(columnas, valores):
+        try:
+            if isinstance(columna.type, DateTime):
+                valor = datetime.fromisoformat(valor)
+            elif isinstance(columna.type, Date):
+                valor = date.fromisoformat(valor)
+            elif isinstance(columna.type, Integer) and (not isinstance(valor, int) or isinstance(valor, bool)):
+                raise TypeError(f"{columna.key} debe ser entero")
+        except (TypeError, ValueError):
+            raise BadRequestException(detail="Cursor de paginación inválido.")
+        convertidos.append(valor)
+    return convertidos
+
+
+def paginar(query, columnas, cursor: Optional[str] = None, descendente: bool = False):
+    """
+    Ordena la consulta por `columnas` (la última debe ser la clave primaria,
+    para que el orden sea total) y, si hay cursor, la reanuda justo después
+    de la última fila entregada. La condición es una comparación de tuplas
+    `(a, b) > (x, y)`, que SQLite resuelve como rango sobre el índice de
+    (a, b) sin recorrer las filas anteriores, a diferencia de OFFSET.
+    """
+    orden = [c.desc() for c in columnas] if descendente else list(columnas)
+    query = query.order_by(*orden)
+    if cursor is None:
+        return query
+
+    valores = decodificar_cursor(cursor, columnas)
+    if len(columnas) == 1:
+        clave, posicion = columnas[0], valores[0]
+    else:
+        # Cada valor con el tipo de su columna: las fechas se comparan como las guarda SQLAlchemy
+        clave = tuple_(*columnas)
+        posicion = tuple_(*(literal(v, c.type) for c, v in zip(columnas, valores)))
+    return query.filter(clave < posicion if descendente else clave > posicion)
+
+
+def siguiente_cursor(filas, limit: int, columnas) -> Optional[str]:
+    """Cursor de la página siguiente, o None si esta página no llegó a `limit` filas."""
+    if not filas or len(filas) < limit:
+        return None
+    ultima = filas[-1]
+    return codificar_cursor(getattr(ultima, c.key) for c in columnas)
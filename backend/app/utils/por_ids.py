@@ -0,0 +1,40 @@
+# app/utils/por_ids.py
+
+from typing import Callable, List
+
+from fastapi import Response
+
+from app import schemas
+from app.config import settings
+from app.exceptions import BadRequestException
+from app.utils.serializacion import respuesta_modelo
+
+
+def parsear_ids(ids: str) -> List[int]:
+    """Ids de `?ids=1,2,3` en el orden pedido (se admiten repetidos)."""
+    try:
+        lista = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise BadRequestException(detail="El parámetro ids debe ser una lista de enteros separados por comas.")
+    if not lista:
+        raise BadRequestException(detail="El parámetro ids no puede estar vacío.")
+    if len(lista) > settings.BATCH_MAX_IDS:
+        raise BadRequestException(detail=f"Máximo {settings.BATCH_MAX_IDS} ids por petición.")
+    return lista
+
+
+def respuesta_por_ids(esquema, ids: List[int], encontrados: dict, permitido: Callable) -> Response:
+    """
+    Un ResultadoPorId por cada id pedido, en el mismo orden: `no_encontrado`
+    si no está en `encontrados`, `prohibido` si `permitido(fila)` es falso.
+    """
+    resultados = []
+    for id_ in ids:
+        fila = encontrados.get(id_)
+        if fila is None:
+            resultados.append({"id": id_, "estado": "no_encontrado"})
+        elif not permitido(fila):
+            resultados.append({"id": id_, "estado": "prohibido"})
+        else:
+            resultados.append({"id": id_, "estado": "ok", "dato": fila})
+    return respuesta_modelo(List[schemas.ResultadoPorId[esquema]], resultados)
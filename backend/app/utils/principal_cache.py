@@ -0,0 +1,106 @@
+# app/utils/principal_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app import models
+from app.config import settings
+from app.utils.versiones import versiones
+
+
+class PrincipalCache:
+    """
+    Caché LRU acotada de usuarios autenticados, indexada por el `sub` del token.
+
+    Guarda una instantánea de las columnas del usuario (nunca la instancia ORM
+    ligada a la sesión de otra petición) y reconstruye un objeto desacoplado en
+    cada acierto, así cada petición trabaja con su propia copia.
+
+    Cada entrada lleva la generación de la tabla `usuarios` (app.utils.versiones)
+    leída antes de consultar la base: cualquier escritura confirmada en usuarios
+    la deja obsoleta. Así una petición que leyó la fila antes de que se
+    confirmara un cambio o un borrado no puede volver a meterla en la caché.
+
+    La generación es del proceso: con varios workers, un cambio hecho en otro
+    worker solo se ve aquí cuando vence el TTL (PRINCIPAL_CACHE_TTL_SECONDS).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, int, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def generacion() -> int:
+        """Generación actual; se lee antes de consultar el usuario y se pasa a `set`."""
+        return versiones.version("usuarios")
+
+    def get(self, subject: str) -> Optional[models.Usuario]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, generacion, snapshot = entry
+            if expires_at <= now or generacion != self.generacion():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+
+        usuario = models.Usuario(**snapshot)
+        make_transient_to_detached(usuario)
+        return usuario
+
+    def set(self, subject: str, usuario: models.Usuario, generacion: int, token_exp: Optional[float] = None):
+        """
+        Guarda el usuario leído con la generación `generacion` hasta el TTL
+        configurado o la expiración del token, lo que ocurra antes. Si desde
+        entonces se ha escrito en usuarios, no se guarda.
+        """
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        if generacion != self.generacion():
+            return
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+
+        snapshot = {
+            attr.key: getattr(usuario, attr.key)
+            for attr in inspect(models.Usuario).column_attrs
+        }
+        with self._lock:
+            if generacion != self.generacion():
+                return
+            self._entries[subject] = (time.monotonic() + ttl, generacion, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: Optional[str]):
+        if subject is None:
+            return
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# El TTL nunca supera la vida de un token de acceso.
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=min(
+        settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    ),
+)
@@ -0,0 +1,191 @@
+# app/utils/respuesta_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.utils.catalogo_cache import etag_coincide
+from app.utils.compresion import codificacion_negociada, cuerpo_negociado, etag_codificado
+from app.utils.versiones import versiones
+
+
+@dataclass(frozen=True)
+class ConfigCache:
+    tablas: tuple
+    ttl_seconds: float
+
+
+@dataclass(frozen=True)
+class RespuestaCacheada:
+    cuerpo: bytes
+    media_type: Optional[str]
+    cabeceras: dict  # las del endpoint (p. ej. X-Next-Cursor), salvo las de longitud y tipo
+    etag: str
+    version: tuple
+    expira: float
+    comprimidos: dict = field(default_factory=dict)  # codificación -> cuerpo (app.utils.compresion)
+
+
+class RespuestaCache:
+    """
+    Caché LRU acotada de respuestas GET ya serializadas.
+
+    La clave incluye la ruta, la query y un hash de la cabecera Authorization,
+    así que cada principal tiene sus propias entradas y las comprobaciones de
+    permisos del endpoint se cachean con su respuesta. Una entrada caduca por
+    TTL, por la expiración del token o cuando cambia la versión de alguna de
+    las tablas de las que depende la ruta (app.utils.versiones), entre ellas
+    siempre `usuarios`: desactivar o degradar a un usuario invalida sus
+    entradas como las del resto.
+
+    Las versiones son del proceso: si la revocación se hace en otro worker,
+    este sigue sirviendo lo cacheado hasta que vence el TTL
+    (RESPONSE_CACHE_TTL_SECONDS), el mismo límite que principal_cache.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entradas: "OrderedDict[str, RespuestaCacheada]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: str, version: tuple) -> Optional[RespuestaCacheada]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            if entrada.version != version or entrada.expira <= time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada
+
+    def set(self, clave: str, entrada: RespuestaCacheada):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+respuesta_cache = RespuestaCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cache_respuesta(*tablas: str, ttl_seconds: Optional[float] = None):
+    """
+    Marca un endpoint GET como cacheable por `RutaCacheable`. `tablas` son
+    todas las tablas que leen el endpoint y sus dependencias (incluidas las
+    de las comprobaciones de permisos): una escritura en cualquiera invalida.
+    Se añade siempre `usuarios`, porque un acierto no vuelve a autenticar.
+
+        @router.get("/{id}", ...)
+        @cache_respuesta("vehiculos", "conductores", "usuarios")
+        def read_algo(...): ...
+    """
+
+    def decorador(endpoint):
+        endpoint._cache_respuesta = ConfigCache(
+            tablas=tablas if "usuarios" in tablas else (*tablas, "usuarios"),
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds,
+        )
+        return endpoint
+
+    return decorador
+
+
+def _clave(request: Request) -> str:
+    autorizacion = request.headers.get("authorization", "")
+    principal = hashlib.sha256(autorizacion.encode()).hexdigest() if autorizacion else "-"
+    return f"{request.url.path}?{request.url.query}|{principal}"
+
+
+def _segundos_hasta_expirar_token(request: Request) -> Optional[float]:
+    # El endpoint ya validó el token al responder 200: basta con leer su `exp`
+    esquema, _, token = request.headers.get("authorization", "").partition(" ")
+    if esquema.lower() != "bearer" or not token:
+        return None
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return 0
+    return None if exp is None else exp - time.time()
+
+
+class RutaCacheable(APIRoute):
+    """
+    Clase de ruta para routers con endpoints `@cache_respuesta`. En un acierto
+    responde antes de resolver dependencias: sin sesión de base de datos, sin
+    validar el token de nuevo y sin serializar; por eso la versión de
+    `usuarios` forma parte de la validez de cada entrada. Añade ETag a las respuestas
+    cacheables y responde 304 si coincide con If-None-Match. La variante
+    comprimida se guarda en la entrada y no se vuelve a comprimir, y lleva su
+    propio ETag (`"<hash>-gzip"`).
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        config = getattr(self.endpoint, "_cache_respuesta", None)
+        if config is None:
+            return handler
+
+        async def handler_con_cache(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            clave = _clave(request)
+            # La versión se toma antes de ejecutar el endpoint: una escritura
+            # concurrente deja la entrada ya desactualizada, nunca al revés
+            version = versiones.de(config.tablas)
+            entrada = respuesta_cache.get(clave, version)
+            if entrada is None:
+                respuesta = await handler(request)
+                if (
+                    respuesta.status_code != 200
+                    or "set-cookie" in respuesta.headers
+                    or not hasattr(respuesta, "body")  # StreamingResponse
+                ):
+                    return respuesta
+                ttl = config.ttl_seconds
+                restante_token = _segundos_hasta_expirar_token(request)
+                if restante_token is not None:
+                    ttl = min(ttl, restante_token)
+                entrada = RespuestaCacheada(
+                    cuerpo=respuesta.body,
+                    media_type=respuesta.media_type,
+                    cabeceras={
+                        k: v for k, v in respuesta.headers.items() if k not in ("content-length", "content-type")
+                    },
+                    etag=f'"{hashlib.sha1(respuesta.body).hexdigest()[:20]}"',
+                    version=version,
+                    expira=time.monotonic() + ttl,
+                )
+                if ttl > 0:
+                    respuesta_cache.set(clave, entrada)
+
+            codificacion = codificacion_negociada(entrada.cuerpo, request.headers.get("accept-encoding"))
+            cabeceras = {
+                **entrada.cabeceras,
+                "ETag": etag_codificado(entrada.etag, codificacion),
+                "Cache-Control": "private, no-cache",
+                "Vary": "Accept-Encoding",
+            }
+            if etag_coincide(request.headers.get("if-none-match"), entrada.etag):
+                return Response(status_code=304, headers=cabeceras)
+            if codificacion is not None:
+                cabeceras["Content-Encoding"] = codificacion
+            cuerpo = cuerpo_negociado(entrada.cuerpo, entrada.comprimidos, codificacion)
+            return Response(content=cuerpo, media_type=entrada.media_type, headers=cabeceras)
+
+        return handler_con_cache
@@ -0,0 +1,37 @@
+# app/utils/serializacion.py
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json de la stdlib
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as RespuestaJSON
+else:
+    RespuestaJSON = JSONResponse
+
+
+@lru_cache(maxsize=None)
+def adaptador(tipo) -> TypeAdapter:
+    """TypeAdapter por esquema de respuesta; construirlo compila el validador y es caro."""
+    return TypeAdapter(tipo)
+
+
+def respuesta_modelo(tipo, datos: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Respuesta JSON de `datos` (objetos ORM) validados contra `tipo`, p. ej.
+    List[schemas.SolicitudInDB]. Valida y serializa a bytes directamente en
+    pydantic-core, sin pasar por dicts intermedios, jsonable_encoder y json.
+
+    Quien la devuelve debe fijar sus cabeceras aquí: FastAPI no copia las del
+    parámetro `response` a una Response devuelta por el endpoint.
+    """
+    adaptador_tipo = adaptador(tipo)
+    cuerpo = adaptador_tipo.dump_json(adaptador_tipo.validate_python(datos))
+    return Response(content=cuerpo, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,197 @@
+# app/utils/trabajos.py
+
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import ReadSessionLocal, SessionLocal
+from app.utils.logging_config import logger
+
+Trabajo = models.Trabajo
+
+
+class TrabajoInterrumpido(Exception):
+    """El worker se detiene o ya no es dueño del trabajo: el bloque en curso se deshace."""
+
+
+class Ejecucion:
+    """
+    Lo que ve de su trabajo la función que lo ejecuta: dónde quedó
+    (`ultimo_id`, `total`) y cómo registrar el avance.
+    """
+
+    def __init__(self, registro: "RegistroTrabajos", fila: Trabajo):
+        self._registro = registro
+        self.id_trabajo = fila.id_trabajo
+        self.total = fila.total
+        self.ultimo_id = fila.ultimo_id
+
+    def fijar_total(self, db: Session, total: int):
+        """Guarda el total la primera vez; al retomar se conserva el original."""
+        if self.total is None:
+            self._actualizar(db, total=total)
+            db.commit()
+            self.total = total
+
+    def avanzar(self, db: Session, ultimo_id: int, procesados: int):
+        """
+        Registra un bloque terminado. Se llama antes del commit del bloque,
+        en su misma transacción: el bloque y su progreso se confirman juntos
+        o no se confirma ninguno, y quien retome el trabajo no lo repite.
+        """
+        if self._registro.detenido:
+            raise TrabajoInterrumpido("el worker se está deteniendo")
+        self._actualizar(db, ultimo_id=ultimo_id, procesados=Trabajo.procesados + procesados)
+        self.ultimo_id = ultimo_id
+
+    def _actualizar(self, db: Session, **valores):
+        resultado = db.execute(
+            update(Trabajo)
+            .where(Trabajo.id_trabajo == self.id_trabajo, Trabajo.propietario == self._registro.propietario)
+            .values(actualizado=datetime.utcnow(), **valores)
+        )
+        if resultado.rowcount != 1:
+            raise TrabajoInterrumpido("otro worker ha retomado el trabajo")
+
+
+class RegistroTrabajos:
+    """
+    Ejecuta trabajos largos fuera de la petición con su estado en la tabla
+    `trabajos`, así que el progreso se consulta desde cualquier worker.
+
+    Cada tipo se registra con `registrar(tipo, fn)`; `fn(db, parametros,
+    ejecucion)` avanza por bloques desde `ejecucion.ultimo_id` y registra cada
+    uno con `ejecucion.avanzar`. Un trabajo lo ejecuta un solo worker a la
+    vez (`propietario`); si ese worker se detiene, el bloque en curso se
+    deshace y el trabajo vuelve a `pendiente`, y si cae sin avisar, otro lo
+    retoma cuando pasa TRABAJOS_CONCESION_S sin progreso. Se retoman al
+    arrancar (`reanudar`) y al consultar su estado (`obtener`).
+    """
+
+    def __init__(self, max_workers: int, max_historial: int, concesion_s: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trabajos")
+        self._max_historial = max_historial
+        self._concesion = timedelta(seconds=concesion_s)
+        self._funciones: dict[str, Callable] = {}
+        self.propietario = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.detenido = False
+
+    def registrar(self, tipo: str, fn: Callable):
+        self._funciones[tipo] = fn
+
+    def lanzar(self, tipo: str, parametros: str) -> Trabajo:
+        with SessionLocal() as db:
+            trabajo = Trabajo(id_trabajo=uuid.uuid4().hex, tipo=tipo, parametros=parametros)
+            db.add(trabajo)
+            db.commit()
+            db.refresh(trabajo)
+        self._executor.submit(self._ejecutar, trabajo.id_trabajo)
+        return trabajo
+
+    def obtener(self, id_trabajo: str) -> Optional[Trabajo]:
+        with ReadSessionLocal() as db:
+            trabajo = db.get(Trabajo, id_trabajo)
+        if trabajo is not None and self._retomable(trabajo, datetime.utcnow()):
+            self._enviar(trabajo.id_trabajo)
+        return trabajo
+
+    def reanudar(self) -> int:
+        """Encola los trabajos sin dueño vivo; devuelve cuántos."""
+        try:
+            with ReadSessionLocal() as db:
+                ids = db.scalars(select(Trabajo.id_trabajo).where(self._condicion_retomable(datetime.utcnow()))).all()
+        except OperationalError as exc:  # p. ej. falta la tabla: python -m app.migrations
+            logger.warning(f"No se pudieron retomar los trabajos: {exc.orig}")
+            return 0
+        for id_trabajo in ids:
+            self._enviar(id_trabajo)
+        if ids:
+            logger.info(f"Retomando {len(ids)} trabajos pendientes")
+        return len(ids)
+
+    def shutdown(self):
+        # Los encolados se cancelan y siguen `pendiente` en la tabla; los que están
+        # en marcha paran en su próximo bloque y se liberan para otro worker
+        self.detenido = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _condicion_retomable(self, ahora: datetime):
+        return or_(
+            Trabajo.estado == "pendiente",
+            (Trabajo.estado == "en_curso") & (Trabajo.actualizado < ahora - self._concesion),
+        )
+
+    def _retomable(self, trabajo: Trabajo, ahora: datetime) -> bool:
+        return trabajo.estado == "pendiente" or (
+            trabajo.estado == "en_curso" and trabajo.actualizado < ahora - self._concesion
+        )
+
+    def _enviar(self, id_trabajo: str):
+        if self.detenido:
+            return
+        try:
+            self._executor.submit(self._ejecutar, id_trabajo)
+        except RuntimeError:  # el executor ya se cerró
+            pass
+
+    def _ejecutar(self, id_trabajo: str):
+        with SessionLocal() as db:
+            # Reclamarlo es un UPDATE condicional: de varios workers, solo uno lo consigue
+            ahora = datetime.utcnow()
+            reclamado = db.execute(
+                update(Trabajo)
+                .where(Trabajo.id_trabajo == id_trabajo, self._condicion_retomable(ahora))
+                .values(estado="en_curso", propietario=self.propietario, actualizado=ahora)
+            ).rowcount
+            db.commit()
+            if not reclamado:
+                return
+            trabajo = db.get(Trabajo, id_trabajo)
+            fn = self._funciones.get(trabajo.tipo)
+            try:
+                if fn is None:
+                    raise ValueError(f"tipo de trabajo desconocido: {trabajo.tipo}")
+                fn(db, trabajo.parametros, Ejecucion(self, trabajo))
+            except TrabajoInterrumpido as exc:
+                db.rollback()
+                logger.info(f"Trabajo {trabajo.tipo} {id_trabajo} interrumpido: {exc}")
+                self._cerrar(db, id_trabajo, estado="pendiente")
+            except Exception as exc:  # el error queda en el trabajo para quien lo consulte
+                db.rollback()
+                logger.error(f"Trabajo {trabajo.tipo} {id_trabajo} fallido: {exc}")
+                self._cerrar(db, id_trabajo, estado="fallido", error=str(exc), terminado=datetime.utcnow())
+            else:
+                self._cerrar(db, id_trabajo, estado="completado", terminado=datetime.utcnow())
+
+    def _cerrar(self, db: Session, id_trabajo: str, **valores):
+        db.execute(
+            update(Trabajo)
+            .where(Trabajo.id_trabajo == id_trabajo, Trabajo.propietario == self.propietario)
+            .values(propietario=None, actualizado=datetime.utcnow(), **valores)
+        )
+        if "terminado" in valores:
+            # Se conservan los últimos `max_historial` terminados; los activos nunca se borran
+            antiguos = (
+                select(Trabajo.id_trabajo)
+                .where(Trabajo.terminado.isnot(None))
+                .order_by(Trabajo.terminado.desc())
+                .offset(self._max_historial)
+            )
+            db.execute(delete(Trabajo).where(Trabajo.id_trabajo.in_(antiguos)))
+        db.commit()
+
+
+trabajos = RegistroTrabajos(
+    max_workers=settings.TRABAJOS_WORKERS,
+    max_historial=settings.TRABAJOS_MAX_HISTORIAL,
+    concesion_s=settings.TRABAJOS_CONCESION_S,
+)
@@ -0,0 +1,71 @@
+# app/utils/versiones.py
+
+import threading
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_TABLAS_ESCRITAS = "tablas_escritas"
+
+
+class VersionesTablas:
+    """
+    Contador de versión por tabla. Sube cuando se confirma una transacción
+    que escribió en la tabla, así que una caché que guarda la versión leída
+    antes de consultar sabe si su copia sigue vigente.
+
+    Los contadores son del proceso: con varios workers, cada uno solo ve sus
+    propias escrituras (las cachés deben acotar además su vigencia con un TTL).
+    """
+
+    def __init__(self):
+        self._versiones: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, tabla: str) -> int:
+        return self._versiones.get(tabla, 0)
+
+    def de(self, tablas) -> tuple:
+        return tuple(self._versiones.get(tabla, 0) for tabla in tablas)
+
+    def invalidar(self, *tablas: str):
+        """Para escrituras que no pasan por una Session (SQL directo, scripts)."""
+        with self._lock:
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+
+versiones = VersionesTablas()
+
+
+# Las tablas escritas se anotan en session.info y la versión sube solo tras el
+# commit: si subiera en el flush, otra petición podría cachear datos previos
+# con la versión nueva.
+
+
+@event.listens_for(Session, "after_flush")
+def _anotar_flush(session, flush_context):
+    tablas = session.info.setdefault(_TABLAS_ESCRITAS, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tablas.update(tabla.name for tabla in inspect(obj).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _anotar_dml(orm_execute_state):
+    # insert()/update()/delete() ejecutados con session.execute no pasan por el flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tablas = orm_execute_state.session.info.setdefault(_TABLAS_ESCRITAS, set())
+        tablas.add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _confirmar(session):
+    tablas = session.info.pop(_TABLAS_ESCRITAS, None)
+    if tablas:
+        versiones.invalidar(*tablas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(session):
+    session.info.pop(_TABLAS_ESCRITAS, None)
@@ -0,0 +1,263 @@
+# benchmarks/_comun.py
+"""
+Utilidades compartidas por los benchmarks.
+
+Los benchmarks se ejecutan desde `backend/` como módulos, por ejemplo:
+
+    python -m benchmarks.bench_login
+
+`preparar_entorno()` debe llamarse ANTES de importar cualquier módulo de `app`,
+porque la configuración y el engine se crean al importar.
+"""
+
+import os
+import statistics
+import tempfile
+
+
+def preparar_entorno(nombre_db: str = "bench.db", **variables) -> str:
+    """Apunta la app a una base SQLite temporal y desactiva el ruido de logs."""
+    directorio = tempfile.mkdtemp(prefix="kerapido_bench_")
+    ruta = os.path.join(directorio, nombre_db)
+    os.environ["DATABASE_URL"] = f"sqlite:///{ruta}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("RATE_LIMIT_MAX_REQUESTS", "100000000")
+    for clave, valor in variables.items():
+        os.environ[clave] = str(valor)
+    return ruta
+
+
+def crear_esquema():
+    """Crea todas las tablas de `models.py` en la base temporal."""
+    from app import models  # noqa: F401
+    from app.database import Base, engine
+
+    Base.metadata.create_all(engine)
+
+
+def silenciar_logs():
+    from loguru import logger
+
+    logger.remove()
+
+
+def percentil(valores, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def resumen_ms(nombre: str, segundos) -> str:
+    ms = [s * 1000 for s in segundos]
+    return (
+        f"{nombre:<40} n={len(ms):>6}  "
+        f"media={statistics.fmean(ms) if ms else 0:8.3f} ms  "
+        f"p50={percentil(ms, 50):8.3f} ms  "
+        f"p99={percentil(ms, 99):8.3f} ms  "
+        f"max={max(ms) if ms else 0:8.3f} ms"
+    )
+
+
+def sembrar_datos(escala: float = 1.0, semilla: int = 7) -> dict:
+    """
+    Llena la base temporal con un volumen realista (escala=1: ~20k usuarios,
+    100k solicitudes). Inserta por lotes con Core en una sola transacción y
+    ejecuta ANALYZE al final. Devuelve el número de filas por tabla.
+
+    Las últimas `n_por_defecto` solicitudes y notificaciones se insertan sin
+    fecha, para que las rellenen los valores por defecto del modelo como en
+    producción (formato y precisión incluidos), no solo fechas explícitas.
+    """
+    import random
+    from datetime import date, datetime, timedelta
+    from itertools import groupby
+
+    from sqlalchemy import insert, text
+
+    from app import models
+    from app.database import engine
+
+    rnd = random.Random(semilla)
+    n_usuarios = int(20000 * escala)
+    n_clientes = int(n_usuarios * 0.75)
+    n_conductores = n_usuarios - n_clientes
+    n_solicitudes = int(100000 * escala)
+    n_asignaciones = int(n_solicitudes * 0.6)
+    n_pagos = int(n_asignaciones * 0.7)
+    n_notificaciones = int(100000 * escala)
+    n_incidentes = int(5000 * escala)
+    n_rutas = int(1000 * escala)
+    n_por_defecto = max(10, int(100 * escala))
+    inicio = datetime(2024, 1, 1)
+
+    catalogos = {
+        models.TipoCliente: [{"nombre": n} for n in ("Individual", "Empresa")],
+        models.EstadoConductor: [{"nombre": n} for n in ("Disponible", "Ocupado", "En Descanso", "Inactivo")],
+        models.TipoVehiculo: [{"nombre": n} for n in ("Automóvil", "Camión de Carga", "Ómnibus", "Moto", "Grúa")],
+        models.EstadoVehiculo: [{"nombre": n} for n in ("Operativo", "En Mantenimiento", "Fuera de Servicio", "Dañado")],
+        models.TipoServicio: [
+            {"nombre": n, "descripcion": d, "es_colectivo": c}
+            for n, d, c in (
+                ("Transporte Individual", "Transporte de pasajeros", False),
+                ("Carga de Contenedores", "Grandes volúmenes de carga", False),
+                ("Mudanza", "Traslado de bienes", False),
+                ("Emergencia en Vía", "Asistencia en carretera", False),
+                ("Reserva de Ómnibus", "Rutas predefinidas", True),
+            )
+        ],
+        models.EstadoSolicitud: [{"nombre": n} for n in ("Pendiente", "Asignada", "En Curso", "Completada", "Cancelada")],
+        models.TipoCarga: [{"nombre": n, "descripcion": n} for n in ("General", "Frágil", "Peligrosa")],
+        models.TipoIncidente: [{"nombre": n} for n in ("Accidente", "Avería Mecánica", "Emergencia Médica")],
+        models.EstadoIncidente: [{"nombre": n} for n in ("Reportado", "En Atención", "Resuelto", "Cerrado")],
+        models.EstadoReserva: [{"nombre": n} for n in ("Pendiente", "Confirmada", "Cancelada")],
+        models.Moneda: [{"codigo": c, "nombre": n} for c, n in (("CUP", "Peso Cubano"), ("USD", "Dólar"))],
+        models.TipoMetodoPago: [{"nombre": n} for n in ("Efectivo", "Transferencia Bancaria")],
+        models.CanalPago: [{"nombre": n, "descripcion": n} for n in ("EnZona", "Transfermóvil")],
+        models.EstadoPago: [{"nombre": n} for n in ("Pendiente", "Completado", "Fallido")],
+        models.TipoTarifa: [{"nombre": n, "descripcion": n} for n in ("Por Km", "Tarifa Fija")],
+    }
+
+    usuarios = [
+        {
+            "id_usuario": i,
+            "nombre": f"Usuario {i}",
+            "apellidos": "Pérez",
+            "email": f"usuario{i}@kerapido.cu",
+            "telefono": f"5{i:08d}",
+            "password_hash": "x",
+            "es_cliente": i <= n_clientes,
+            "es_conductor": i > n_clientes,
+            "es_admin": i == 1,
+            "carnet_identidad": f"{i:011d}",
+            "email_verificado": True,
+            "telefono_confirmado": False,
+            "fecha_registro": inicio + timedelta(minutes=i),
+        }
+        for i in range(1, n_usuarios + 1)
+    ]
+    clientes = [{"id_cliente": i, "id_usuario": i, "id_tipo_cliente": 1 + i % 2} for i in range(1, n_clientes + 1)]
+    conductores = [
+        {
+            "id_conductor": i,
+            "id_usuario": n_clientes + i,
+            "numero_licencia": f"LIC{i:07d}",
+            "fecha_vencimiento_licencia": date(2030, 1, 1),
+            "calificacion_promedio": round(rnd.uniform(3, 5), 2),
+            "id_estado_conductor": 1 + i % 4,
+        }
+        for i in range(1, n_conductores + 1)
+    ]
+    vehiculos = [
+        {
+            "id_vehiculo": i,
+            "marca": "Lada",
+            "modelo": "2107",
+            "matricula": f"P{i:06d}",
+            "anno": 1990 + i % 30,
+            "id_tipo_vehiculo": 1 + i % 5,
+            "id_estado_vehiculo": 1,
+            "id_conductor": i,
+        }
+        for i in range(1, n_conductores + 1)
+    ]
+    solicitudes = [
+        {
+            "id_solicitud": i,
+            "origen_lat": 23.1 + rnd.random() / 10,
+            "origen_lon": -82.3 - rnd.random() / 10,
+            "destino_lat": 23.1 + rnd.random() / 10,
+            "destino_lon": -82.3 - rnd.random() / 10,
+            "direccion_origen": f"Calle {i % 300} #{i % 97}",
+            "direccion_destino": f"Avenida {i % 120} #{i % 53}",
+            "comentarios": "Sin comentarios adicionales. " * 4,
+            "precio_sugerido": round(rnd.uniform(100, 2000), 2),
+            "id_cliente": rnd.randint(1, n_clientes),
+            "id_tipo_servicio": 1 + i % 5,
+            "id_estado_solicitud": 1 + i % 5,
+            "fecha_solicitud": inicio + timedelta(seconds=i * 30),
+        }
+        for i in range(1, n_solicitudes + 1)
+    ]
+    asignaciones = [
+        {
+            "id_asignacion": i,
+            "id_solicitud": i,
+            "id_conductor": 1 + (i % n_conductores),
+            "id_vehiculo": 1 + (i % n_conductores),
+            "precio_final": round(rnd.uniform(100, 2000), 2),
+            "fecha_hora_asignacion": inicio + timedelta(seconds=i * 30 + 60),
+        }
+        for i in range(1, n_asignaciones + 1)
+    ]
+    pagos = [
+        {
+            "id_transaccion": i,
+            "id_asignacion": i,
+            "monto": round(rnd.uniform(100, 2000), 2),
+            "id_moneda": 1,
+            "id_tipo_metodo_pago": 1 + i % 2,
+            "id_canal_pago": 1 + i % 2,
+            "id_estado_pago": 1 + i % 3,
+            "fecha_hora_pago": inicio + timedelta(seconds=i * 30 + 600),
+        }
+        for i in range(1, n_pagos + 1)
+    ]
+    notificaciones = [
+        {
+            "titulo": "Aviso",
+            "mensaje": "Su viaje ha sido asignado.",
+            "leida": bool(i % 2),
+            "fecha_hora": inicio + timedelta(seconds=i * 20),
+            "id_usuario": rnd.randint(1, n_usuarios),
+        }
+        for i in range(1, n_notificaciones + 1)
+    ]
+    incidentes = [
+        {
+            "descripcion": "Incidente reportado",
+            "id_tipo_incidente": 1 + i % 3,
+            "id_estado_incidente": 1 + i % 4,
+            "id_usuario": rnd.randint(1, n_usuarios),
+            "id_solicitud": rnd.randint(1, n_solicitudes),
+            "fecha_hora_incidente": inicio + timedelta(hours=i),
+        }
+        for i in range(1, n_incidentes + 1)
+    ]
+    rutas = [
+        {"nombre": f"Ruta {i}", "origen_lat": 23.1, "origen_lon": -82.3, "destino_lat": 23.2, "destino_lon": -82.4}
+        for i in range(1, n_rutas + 1)
+    ]
+    conductor_servicio = [
+        {"id_conductor": c, "id_tipo_servicio": s, "fecha_habilitacion": date(2024, 1, 1)}
+        for c in range(1, n_conductores + 1)
+        for s in (1, 1 + c % 4 + 1)
+    ]
+
+    for filas, columnas in ((solicitudes, ("fecha_solicitud",)), (notificaciones, ("fecha_hora", "leida"))):
+        for fila in filas[-n_por_defecto:]:
+            for columna in columnas:
+                del fila[columna]
+
+    lotes = list(catalogos.items()) + [
+        (models.Usuario, usuarios),
+        (models.Cliente, clientes),
+        (models.Conductor, conductores),
+        (models.Vehiculo, vehiculos),
+        (models.Solicitud, solicitudes),
+        (models.Asignacion, asignaciones),
+        (models.TransaccionPago, pagos),
+        (models.Notificacion, notificaciones),
+        (models.Incidente, incidentes),
+        (models.Ruta, rutas),
+        (models.ConductorServicio, conductor_servicio),
+    ]
+    with engine.begin() as conn:
+        for modelo, filas in lotes:
+            for i in range(0, len(filas), 5000):
+                # Las filas que omiten columnas (valores por defecto) van en su propia sentencia
+                for _, grupo in groupby(filas[i:i + 5000], key=frozenset):
+                    conn.execute(insert(modelo), list(grupo))
+        conn.execute(text("ANALYZE"))
+    return {modelo.__tablename__: len(filas) for modelo, filas in lotes}
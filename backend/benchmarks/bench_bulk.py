@@ -0,0 +1,100 @@
+# benchmarks/bench_bulk.py
+"""
+Alta de filas una a una frente a las funciones de lote de crud.py.
+
+"una a una" llama a `crud.create_*` por elemento (un INSERT y un commit por
+fila); "lote" valida las claves foráneas con IN por bloques e inserta todo
+con un executemany en una única transacción. Se mide con 1.000 y 100.000
+filas; el camino una a una se limita a `--max-una-a-una` filas porque su
+throughput no depende del tamaño total.
+
+    python -m benchmarks.bench_bulk [--filas 1000 100000] [--max-una-a-una 10000]
+"""
+
+import argparse
+import time
+from datetime import date
+
+from benchmarks._comun import crear_esquema, preparar_entorno, sembrar_datos, silenciar_logs
+
+preparar_entorno("bulk.db")
+
+from app import crud, schemas  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+CLIENTES = 500
+
+
+def solicitudes(n):
+    return [
+        schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1 + i % CLIENTES)
+        for i in range(n)
+    ]
+
+
+def notificaciones(n):
+    return [schemas.NotificacionCreate(titulo="Aviso", mensaje=f"Mensaje {i}", id_usuario=1 + i % CLIENTES) for i in range(n)]
+
+
+def servicios(n, primero):
+    # Un par (conductor, tipo) nuevo por fila: la siembra asocia a cada conductor c los tipos 1 y 2 + c % 4
+    return [
+        schemas.ConductorServicioCreate(
+            id_conductor=c, id_tipo_servicio=2 + (c + 1) % 4, fecha_habilitacion=date(2024, 1, 1)
+        )
+        for c in range(primero, primero + n)
+    ]
+
+
+CASOS = {
+    "solicitudes": (solicitudes, crud.create_solicitud, crud.create_solicitudes_bulk),
+    "notificaciones": (notificaciones, crud.create_notificacion, crud.create_notificaciones_bulk),
+}
+
+
+def una_a_una(crear, elementos):
+    inicio = time.perf_counter()
+    for elemento in elementos:
+        with SessionLocal() as db:
+            crear(db, elemento)
+    return time.perf_counter() - inicio
+
+
+def en_lote(crear_lote, elementos):
+    inicio = time.perf_counter()
+    with SessionLocal() as db:
+        respuesta = crear_lote(db, elementos)
+    assert respuesta.fallidos == 0, respuesta.resultados[:3]
+    return time.perf_counter() - inicio
+
+
+def informe(etiqueta, filas, segundos):
+    print(f"{etiqueta:<28} {filas:>7} filas  {segundos:8.2f} s  {filas / segundos:10.0f} filas/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--max-una-a-una", type=int, default=10000)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    conteos = sembrar_datos(0.05)
+
+    for nombre, (generar, crear, crear_lote) in CASOS.items():
+        for filas in args.filas:
+            print(f"== {nombre}, {filas} filas")
+            muestra = min(filas, args.max_una_a_una)
+            informe("una a una", muestra, una_a_una(crear, generar(muestra)))
+            informe("lote", filas, en_lote(crear_lote, generar(filas)))
+
+    # conductor_servicio tiene PK compuesta: cada fila necesita un conductor distinto
+    filas = conteos["conductores"] // 2
+    print(f"== conductor_servicio, {filas} filas")
+    informe("una a una", filas, una_a_una(crud.create_conductor_servicio, servicios(filas, 1)))
+    informe("lote", filas, en_lote(crud.create_conductor_servicios_bulk, servicios(filas, 1 + filas)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_campos.py
+"""
+Listados completos frente a `?fields=` (sparse fieldsets).
+
+Sirve páginas de 1.000 solicitudes y usuarios como los routers: consulta de
+`crud.get_*` y `respuesta_modelo`. Con `campos`, la consulta lee solo esas
+columnas (load_only) y la respuesta solo las incluye. Mide la latencia y el
+tamaño del cuerpo.
+
+    python -m benchmarks.bench_campos [--limite 1000] [--repeticiones 100]
+"""
+
+import argparse
+import time
+from typing import List
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("campos.db")
+
+from app import crud, schemas  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.utils.campos import esquema_parcial, parsear_campos  # noqa: E402
+from app.utils.serializacion import respuesta_modelo  # noqa: E402
+
+CASOS = [
+    ("solicitudes", crud.get_solicitudes, schemas.SolicitudInDB, "id_solicitud,fecha_solicitud,id_estado_solicitud"),
+    ("usuarios", crud.get_usuarios, schemas.UsuarioInDB, "id_usuario,nombre,telefono"),
+]
+
+
+def servir(listar, esquema, campos, limite):
+    with SessionLocal() as db:
+        filas = listar(db, limit=limite, campos=campos)
+        return respuesta_modelo(List[esquema_parcial(esquema, campos)], filas).body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limite", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos()
+
+    for nombre, listar, esquema, fields in CASOS:
+        print(f"== {nombre} ({args.limite} filas)")
+        for etiqueta, campos in (("completo", None), (f"fields={fields}", parsear_campos(fields, esquema))):
+            tiempos = []
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                cuerpo = servir(listar, esquema, campos, args.limite)
+                tiempos.append(time.perf_counter() - inicio)
+            print(resumen_ms(etiqueta[:40], tiempos), f" {len(cuerpo):8d} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_catalogos.py
+"""
+GET /catalogos/* con y sin la caché de catálogos.
+
+"sin caché" vacía la caché antes de cada petición: abre sesión, consulta y
+serializa como hacía el router antes. "caché" sirve los bytes guardados y
+"304" es la revalidación con If-None-Match de un cliente que ya los tiene.
+
+Después compara un arranque de la app cliente: las seis rutas por separado
+frente a un único GET /catalogos/snapshot (gzip), en tiempo y bytes.
+
+    python -m benchmarks.bench_catalogos [--peticiones 2000]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("catalogos.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.utils.catalogo_cache import catalogo_cache  # noqa: E402
+
+RUTAS = [
+    "/catalogos/tipos_cliente",
+    "/catalogos/estados_conductor",
+    "/catalogos/tipos_vehiculo",
+    "/catalogos/estados_vehiculo",
+    "/catalogos/tipos_servicio",
+    "/catalogos/estados_solicitud",
+]
+
+
+def medir(cliente, peticiones, vaciar=False, etags=None):
+    tiempos = []
+    for i in range(peticiones):
+        ruta = RUTAS[i % len(RUTAS)]
+        cabeceras = {"If-None-Match": etags[ruta]} if etags else {}
+        if vaciar:
+            catalogo_cache.clear()
+        inicio = time.perf_counter()
+        respuesta = cliente.get(ruta, headers=cabeceras)
+        tiempos.append(time.perf_counter() - inicio)
+        assert respuesta.status_code == (304 if etags else 200), respuesta.status_code
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+
+    with TestClient(app) as cliente:
+        etags = {ruta: cliente.get(ruta).headers["etag"] for ruta in RUTAS}
+        print(resumen_ms("sin caché (sesión + consulta)", medir(cliente, args.peticiones, vaciar=True)))
+        print(resumen_ms("caché (bytes serializados)", medir(cliente, args.peticiones)))
+        print(resumen_ms("304 con If-None-Match", medir(cliente, args.peticiones, etags=etags)))
+        arranque(cliente, args.peticiones // len(RUTAS))
+
+
+def arranque(cliente, repeticiones):
+    por_rutas, bytes_rutas = [], 0
+    por_snapshot, bytes_snapshot = [], 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        bytes_rutas = sum(len(cliente.get(ruta).content) for ruta in RUTAS)
+        por_rutas.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        respuesta = cliente.get("/catalogos/snapshot", headers={"Accept-Encoding": "gzip"})
+        por_snapshot.append(time.perf_counter() - inicio)
+        bytes_snapshot = int(respuesta.headers["content-length"])
+    print(resumen_ms(f"arranque: {len(RUTAS)} rutas", por_rutas), f" {bytes_rutas} bytes")
+    print(resumen_ms("arranque: snapshot (16 tablas)", por_snapshot), f" {bytes_snapshot} bytes (gzip)")
+
+
+if __name__ == "__main__":
+    main()
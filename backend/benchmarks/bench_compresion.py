@@ -0,0 +1,76 @@
+# benchmarks/bench_compresion.py
+"""
+Compresión de respuestas: bytes en la red y coste de CPU.
+
+Pide las páginas de 100 filas de los listados de administración sin
+Accept-Encoding, con gzip y con brotli (si está instalado) a través de la
+app completa (CompresionMiddleware). Para cada variante muestra latencia,
+tamaño y el tiempo de transferencia estimado en una red móvil lenta.
+
+Después compara /catalogos/snapshot, servido desde la caché con la
+variante comprimida guardada, con lo que costaría comprimirlo en cada
+petición.
+
+    python -m benchmarks.bench_compresion [--peticiones 100] [--kbps 1000]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("compresion.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import security  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.compresion import CODIFICACIONES, comprimir  # noqa: E402
+
+RUTAS = ["/users/?limit=100", "/conductores/?limit=100", "/solicitudes/?limit=100"]
+
+
+def medir(cliente, ruta, cabeceras, peticiones):
+    tiempos, tamano = [], 0
+    for _ in range(peticiones):
+        inicio = time.perf_counter()
+        with cliente.stream("GET", ruta, headers=cabeceras) as respuesta:
+            tamano = len(b"".join(respuesta.iter_raw()))
+        tiempos.append(time.perf_counter() - inicio)
+        assert respuesta.status_code == 200, respuesta.status_code
+    return tiempos, tamano, respuesta.headers.get("content-encoding")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=100)
+    parser.add_argument("--kbps", type=float, default=1000, help="ancho de banda para estimar la transferencia")
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+    token = {"Authorization": f"Bearer {security.create_access_token({'sub': 'usuario1@kerapido.cu'})}"}
+    variantes = [("sin compresión", "identity")] + [(c, c) for c in CODIFICACIONES]
+
+    with TestClient(app) as cliente:
+        for ruta in RUTAS + ["/catalogos/snapshot"]:
+            print(f"== {ruta}")
+            for etiqueta, codificacion in variantes:
+                tiempos, tamano, aplicada = medir(cliente, ruta, {**token, "Accept-Encoding": codificacion}, args.peticiones)
+                assert aplicada == (None if codificacion == "identity" else codificacion)
+                red_ms = tamano * 8 / args.kbps
+                print(resumen_ms(etiqueta, tiempos), f" {tamano:7d} bytes  ~{red_ms:7.1f} ms a {args.kbps:g} kbps")
+
+        cuerpo = cliente.get("/catalogos/snapshot", headers={"Accept-Encoding": "identity"}).content
+        for codificacion in CODIFICACIONES:
+            tiempos = []
+            for _ in range(args.peticiones):
+                inicio = time.perf_counter()
+                comprimir(cuerpo, codificacion, cache=True)
+                tiempos.append(time.perf_counter() - inicio)
+            print(resumen_ms(f"snapshot: {codificacion} por petición (solo CPU)", tiempos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_difusion.py
+"""
+Difusión de una notificación a todos los clientes.
+
+"ORM fila a fila" es lo que tenía que hacer un llamador sin el motor de
+difusión: cargar los usuarios del segmento y llamar a `crud.create_notificacion`
+por cada uno (se mide sobre una muestra y se extrapola). "INSERT ... SELECT"
+es `crud.difundir_notificacion`: un conteo y una sentencia por rango de ids.
+
+La siembra base se amplía con usuarios clientes hasta `--usuarios`.
+
+    python -m benchmarks.bench_difusion [--usuarios 200000] [--muestra 5000] [--bloque 5000]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, sembrar_datos, silenciar_logs
+
+preparar_entorno("difusion.db")
+
+from sqlalchemy import event, insert, select  # noqa: E402
+
+from app import crud, models, schemas  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+
+
+def ampliar_usuarios(hasta: int, desde: int):
+    filas = [
+        {
+            "id_usuario": i,
+            "nombre": f"Usuario {i}",
+            "email": f"usuario{i}@kerapido.cu",
+            "telefono": f"5{i:08d}",
+            "password_hash": "x",
+            "es_cliente": True,
+            "carnet_identidad": f"{i:011d}",
+        }
+        for i in range(desde, hasta + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Usuario), filas)
+
+
+def contar_sentencias():
+    sentencias = [0]
+    event.listen(engine, "before_cursor_execute", lambda *_: sentencias.__setitem__(0, sentencias[0] + 1))
+    return sentencias
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--usuarios", type=int, default=200000)
+    parser.add_argument("--muestra", type=int, default=5000)
+    parser.add_argument("--bloque", type=int, default=5000)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    conteos = sembrar_datos(0.05)
+    ampliar_usuarios(args.usuarios, conteos["usuarios"] + 1)
+    sentencias = contar_sentencias()
+    segmento = schemas.SegmentoNotificacion(es_cliente=True)
+
+    with SessionLocal() as db:
+        sentencias[0] = 0
+        inicio = time.perf_counter()
+        ids = db.execute(crud._consulta_segmento(segmento, models.Usuario.id_usuario)).scalars().all()
+        for id_usuario in ids[:args.muestra]:
+            crud.create_notificacion(db, schemas.NotificacionCreate(titulo="Aviso", mensaje="ORM", id_usuario=id_usuario))
+        muestra = min(args.muestra, len(ids))
+        por_fila = (time.perf_counter() - inicio) / muestra
+        print(f"{'ORM fila a fila':<20} {len(ids):>7} destinatarios  {por_fila * len(ids):8.2f} s (estimado)  "
+              f"{sentencias[0] / muestra * len(ids):9.0f} sentencias")
+
+    with SessionLocal() as db:
+        sentencias[0] = 0
+        inicio = time.perf_counter()
+        creadas = crud.difundir_notificacion(
+            db, schemas.DifusionCreate(titulo="Aviso", mensaje="Difusión", segmento=segmento), tamano_bloque=args.bloque
+        )
+        segundos = time.perf_counter() - inicio
+        print(f"{'INSERT ... SELECT':<20} {creadas:>7} destinatarios  {segundos:8.2f} s             "
+              f"{sentencias[0]:9d} sentencias")
+        enviadas = db.execute(
+            select(models.Notificacion.id_usuario).where(models.Notificacion.mensaje == "Difusión")
+        ).scalars().all()
+        assert sorted(enviadas) == sorted(ids), "la difusión no coincide con el segmento"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_escrituras.py
+"""
+Coste por escritura de `crud.create_*` con y sin el refresh posterior al commit.
+
+"commit + refresh" reproduce el camino anterior: sesión que expira al hacer
+commit y `db.refresh(obj)` para recargar la fila recién escrita. El camino
+actual usa `SessionLocal` (expire_on_commit=False) y se queda con lo que
+devuelve el INSERT ... RETURNING. Se cuentan las sentencias SQL por
+operación y la latencia de cada una.
+
+    python -m benchmarks.bench_escrituras [--operaciones 2000]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("escrituras.db")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, schemas  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+
+SesionAnterior = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+OPERACIONES = {
+    "create_solicitud": lambda db, i: crud.create_solicitud(
+        db, schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1 + i % 100)
+    ),
+    "create_notificacion": lambda db, i: crud.create_notificacion(
+        db, schemas.NotificacionCreate(titulo="Aviso", mensaje=f"Mensaje {i}", id_usuario=1 + i % 100)
+    ),
+}
+
+
+def medir(fabrica_sesion, operacion, refrescar, n):
+    sentencias = [0]
+
+    def contar(*_):
+        sentencias[0] += 1
+
+    event.listen(engine, "before_cursor_execute", contar)
+    tiempos = []
+    try:
+        for i in range(n):
+            with fabrica_sesion() as db:
+                inicio = time.perf_counter()
+                obj = operacion(db, i)
+                if refrescar:
+                    db.refresh(obj)
+                tiempos.append(time.perf_counter() - inicio)
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    return tiempos, sentencias[0] / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operaciones", type=int, default=2000)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+
+    for nombre, operacion in OPERACIONES.items():
+        print(f"== {nombre}")
+        for etiqueta, fabrica, refrescar in (
+            ("commit + refresh (anterior)", SesionAnterior, True),
+            ("INSERT ... RETURNING (actual)", SessionLocal, False),
+        ):
+            tiempos, por_op = medir(fabrica, operacion, refrescar, args.operaciones)
+            print(resumen_ms(etiqueta, tiempos), f" {por_op:.1f} sentencias/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_group_commit.py
+"""
+Escrituras concurrentes con y sin group commit.
+
+Varios hilos crean notificaciones y solicitudes con `crud.create_*` durante
+un tiempo fijo. Sin group commit cada inserción es su propia transacción y
+todas compiten por el lock de escritura de SQLite; con él, el escritor las
+agrupa en un commit cada pocos milisegundos.
+
+El modo se alterna en el mismo proceso sustituyendo `crud.group_commit_writer`,
+que es lo que haría GROUP_COMMIT_ENABLED=true al arrancar.
+
+    python -m benchmarks.bench_group_commit [--hilos 32] [--segundos 5] [--ventana-ms 2] [--synchronous NORMAL]
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("group_commit.db", GROUP_COMMIT_ENABLED="false")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, schemas  # noqa: E402
+from app.database import SQLALCHEMY_DATABASE_URL, SessionLocal, build_engine, engine  # noqa: E402
+from app.utils.group_commit import GroupCommitWriter, _begin_immediate  # noqa: E402
+
+
+def escribir(i):
+    with SessionLocal() as db:
+        if i % 2:
+            crud.create_notificacion(
+                db, schemas.NotificacionCreate(titulo="Aviso", mensaje=f"Mensaje {i}", id_usuario=1 + i % 500)
+            )
+        else:
+            crud.create_solicitud(
+                db, schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1 + i % 500)
+            )
+
+
+def ejecutar(nombre, hilos, segundos):
+    fin = time.perf_counter() + segundos
+    tiempos, errores, lock = [], [0], threading.Lock()
+
+    def trabajador(n):
+        propios, i = [], n
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                escribir(i)
+                propios.append(time.perf_counter() - inicio)
+            except Exception:  # noqa: BLE001
+                with lock:
+                    errores[0] += 1
+            i += hilos
+        with lock:
+            tiempos.extend(propios)
+
+    threads = [threading.Thread(target=trabajador, args=(n,)) for n in range(hilos)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(resumen_ms(nombre, tiempos), f" {len(tiempos) / segundos:8.0f} escrituras/s  errores={errores[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hilos", type=int, default=32)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--ventana-ms", type=float, default=2.0)
+    parser.add_argument("--lote-max", type=int, default=64)
+    parser.add_argument("--synchronous", default="NORMAL", help="NORMAL (perfil de producción) o FULL (fsync por commit)")
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+
+    writer_engine = _begin_immediate(build_engine(SQLALCHEMY_DATABASE_URL))
+    for e in (engine, writer_engine):
+        event.listen(e, "connect", lambda conn, _: conn.execute(f"PRAGMA synchronous={args.synchronous}"))
+
+    print(f"== {args.hilos} hilos, synchronous={args.synchronous}")
+    crud.group_commit_writer = None
+    ejecutar("un commit por escritura", args.hilos, args.segundos)
+
+    writer = GroupCommitWriter(
+        sessionmaker(bind=writer_engine, autoflush=False, expire_on_commit=False),
+        window_ms=args.ventana_ms,
+        max_batch=args.lote_max,
+    )
+    crud.group_commit_writer = writer
+    ejecutar(f"group commit ({args.ventana_ms} ms, lote <= {args.lote_max})", args.hilos, args.segundos)
+    writer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
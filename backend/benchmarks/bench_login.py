@@ -0,0 +1,101 @@
+# benchmarks/bench_login.py
+"""
+Latencia de un endpoint ajeno (`GET /`) mientras hay inicios de sesión en curso.
+
+Compara el comportamiento anterior (bcrypt dentro del event loop) con el
+actual (`/auth/token` usando el pool acotado de `app.utils.login_pool`).
+
+    python -m benchmarks.bench_login [--logins 8] [--segundos 5]
+
+Requiere `httpx`.
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms
+
+preparar_entorno()
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from fastapi.security import OAuth2PasswordRequestForm  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud, models, security  # noqa: E402
+from app.database import SessionLocal, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@kerapido.cu"
+PASSWORD = "Bench1234!"
+
+
+@app.post("/bench/token-inline", include_in_schema=False)
+async def token_inline(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+):
+    """Réplica del /auth/token original: consulta y bcrypt en el event loop."""
+    user = crud.get_usuario_by_email(db, email=form_data.username)
+    if not user or not security.verify_password(form_data.password, user.password_hash):
+        raise HTTPException(status_code=401)
+    return {"access_token": security.create_access_token({"sub": user.email})}
+
+
+def sembrar():
+    crear_esquema()
+    db = SessionLocal()
+    db.add(
+        models.Usuario(
+            nombre="Bench",
+            email=EMAIL,
+            password_hash=security.get_password_hash(PASSWORD),
+            email_verificado=True,
+        )
+    )
+    db.commit()
+    db.close()
+
+
+async def medir(ruta_login: str, logins: int, segundos: float):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        fin = time.perf_counter() + segundos
+        latencias = []
+        completados = {"login": 0, "rechazados": 0}
+
+        async def bucle_login():
+            while time.perf_counter() < fin:
+                r = await cliente.post(ruta_login, data={"username": EMAIL, "password": PASSWORD})
+                if r.status_code == 503:
+                    completados["rechazados"] += 1
+                else:
+                    completados["login"] += 1
+
+        async def bucle_health():
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                await cliente.get("/")
+                latencias.append(time.perf_counter() - inicio)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(bucle_health(), *(bucle_login() for _ in range(logins)))
+        return latencias, completados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=8, help="logins concurrentes")
+    parser.add_argument("--segundos", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sembrar()
+    for nombre, ruta in (("antes (bcrypt en el event loop)", "/bench/token-inline"),
+                         ("después (pool de login acotado)", "/auth/token")):
+        latencias, completados = asyncio.run(medir(ruta, args.logins, args.segundos))
+        print(resumen_ms(f"GET / — {nombre}", latencias))
+        print(f"{'':<40} logins={completados['login']} rechazados_503={completados['rechazados']}")
+
+
+if __name__ == "__main__":
+    main()
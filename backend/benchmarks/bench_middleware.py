@@ -0,0 +1,113 @@
+# benchmarks/bench_middleware.py
+"""
+Sobrecoste de la pila de middlewares sobre `GET /` (health_check).
+
+Invoca la aplicación ASGI directamente (sin servidor ni cliente HTTP) para
+aislar el coste de los middlewares. Variantes:
+
+- sin middlewares
+- CORS + rate limiter sobre BaseHTTPMiddleware (pila anterior)
+- CORS + rate limiter ASGI puro (pila actual de app.main)
+
+    python -m benchmarks.bench_middleware [--peticiones 20000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._comun import preparar_entorno
+
+preparar_entorno()
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.main import app as app_actual, health_check  # noqa: E402
+from app.middleware.rate_limiter import RateLimiterMiddleware  # noqa: E402
+
+
+class RateLimiterBaseHTTP(BaseHTTPMiddleware):
+    """La misma lógica de limitación montada sobre BaseHTTPMiddleware."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.asgi = RateLimiterMiddleware(app)
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host if request.client else "desconocido"
+        self.asgi.limiter.consume(client_ip, self.asgi.route_cost(request.scope["path"]))
+        return await call_next(request)
+
+
+def construir_app(middleware=None):
+    app = FastAPI()
+    app.get("/")(health_check)
+    if middleware is not None:
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True,
+                           allow_methods=["*"], allow_headers=["*"])
+        app.add_middleware(middleware)
+    return app
+
+
+async def medir(app, peticiones: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("bench", 80),
+    }
+
+    async def peticion():
+        enviado = False
+        completada = asyncio.Event()
+
+        async def receive():
+            nonlocal enviado
+            if not enviado:
+                enviado = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await completada.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                completada.set()
+
+        await app(dict(scope), receive, send)
+
+    for _ in range(200):  # calentamiento
+        await peticion()
+    inicio = time.perf_counter()
+    for _ in range(peticiones):
+        await peticion()
+    return peticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=20000)
+    args = parser.parse_args()
+
+    variantes = [
+        ("sin middlewares", construir_app()),
+        ("CORS + rate limiter (BaseHTTPMiddleware)", construir_app(RateLimiterBaseHTTP)),
+        ("CORS + rate limiter (ASGI puro)", construir_app(RateLimiterMiddleware)),
+        ("app.main (pila actual completa)", app_actual),
+    ]
+    for nombre, app in variantes:
+        rps = asyncio.run(medir(app, args.peticiones))
+        print(f"{nombre:<45} {rps:10.0f} req/s  {1e6 / rps:8.1f} µs/req")
+
+
+if __name__ == "__main__":
+    main()
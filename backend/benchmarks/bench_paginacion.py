@@ -0,0 +1,91 @@
+# benchmarks/bench_paginacion.py
+"""
+Paginación por OFFSET frente a paginación por cursor (keyset).
+
+Siembra 100k solicitudes y 20k usuarios y mide cuánto tarda en servirse la
+página 1 y una página profunda (por defecto la 5.000 de 20 filas) con cada
+método. Con OFFSET la latencia crece con la profundidad; con cursor debe
+mantenerse plana. Antes de medir comprueba que ambos métodos devuelven las
+mismas filas en la página profunda.
+
+    python -m benchmarks.bench_paginacion [--limite 20] [--pagina 5000] [--repeticiones 50]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("paginacion.db")
+
+from app import crud  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.utils.paginacion import codificar_cursor  # noqa: E402
+
+
+def cursor_de_pagina(db, listar, orden, limite, pagina):
+    """Cursor que apunta al inicio de `pagina` (se calcula una vez, con OFFSET)."""
+    if pagina == 1:
+        return None
+    previa = listar(db, skip=(pagina - 1) * limite - 1, limit=1)
+    return codificar_cursor(getattr(previa[0], c.key) for c in orden)
+
+
+def medir(llamada, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        with SessionLocal() as db:
+            inicio = time.perf_counter()
+            llamada(db)
+            tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def comparar(nombre, listar, orden, limite, paginas, repeticiones):
+    print(f"== {nombre} ({limite} filas por página)")
+    for pagina in paginas:
+        skip = (pagina - 1) * limite
+        with SessionLocal() as db:
+            cursor = cursor_de_pagina(db, listar, orden, limite, pagina)
+            por_offset = [r for r in listar(db, skip=skip, limit=limite)]
+            por_cursor = [r for r in listar(db, limit=limite, cursor=cursor)]
+            claves = lambda filas: [tuple(getattr(f, c.key) for c in orden) for f in filas]  # noqa: E731
+            assert claves(por_offset) == claves(por_cursor), f"página {pagina}: OFFSET y cursor difieren"
+
+        offset = medir(lambda db: listar(db, skip=skip, limit=limite), repeticiones)
+        keyset = medir(lambda db: listar(db, limit=limite, cursor=cursor), repeticiones)
+        print(resumen_ms(f"página {pagina:>5} con OFFSET", offset))
+        print(resumen_ms(f"página {pagina:>5} con cursor", keyset))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--pagina", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos()
+
+    comparar(
+        "solicitudes (fecha desc, id desc)",
+        crud.get_solicitudes,
+        crud.ORDEN_SOLICITUDES,
+        args.limite,
+        (1, args.pagina),
+        args.repeticiones,
+    )
+    comparar(
+        "usuarios (id)",
+        crud.get_usuarios,
+        crud.ORDEN_USUARIOS,
+        args.limite,
+        (1, min(args.pagina, 20000 // args.limite)),
+        args.repeticiones,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_por_ids.py
+"""
+N peticiones de detalle frente a una petición /batch.
+
+Un administrador resuelve `--ids` usuarios y solicitudes dispersos, como
+hace un panel al pintar una tabla de referencias: primero con un GET
+/{id} por cada uno y después con un solo GET /batch?ids=... (una consulta
+IN por cada bloque de 500 ids).
+
+    python -m benchmarks.bench_por_ids [--ids 100] [--repeticiones 30]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("por_ids.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import security  # noqa: E402
+from app.main import app  # noqa: E402
+
+CASOS = [("usuarios", "/users", "usuarios"), ("solicitudes", "/solicitudes", "solicitudes")]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=30)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    conteos = sembrar_datos(0.2)
+    cabeceras = {"Authorization": f"Bearer {security.create_access_token({'sub': 'usuario1@kerapido.cu'})}"}
+    azar = random.Random(7)
+
+    with TestClient(app) as cliente:
+        for nombre, prefijo, tabla in CASOS:
+            ids = azar.sample(range(1, conteos[tabla] + 1), args.ids)
+            print(f"== {nombre} ({args.ids} ids)")
+            individuales, lote = [], []
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                for id_ in ids:
+                    assert cliente.get(f"{prefijo}/{id_}", headers=cabeceras).status_code == 200
+                individuales.append(time.perf_counter() - inicio)
+
+                inicio = time.perf_counter()
+                respuesta = cliente.get(f"{prefijo}/batch?ids={','.join(map(str, ids))}", headers=cabeceras)
+                lote.append(time.perf_counter() - inicio)
+                assert all(r["estado"] == "ok" for r in respuesta.json())
+            print(resumen_ms(f"{args.ids} x GET {prefijo}/{{id}}", individuales))
+            print(resumen_ms(f"GET {prefijo}/batch", lote))
+
+
+if __name__ == "__main__":
+    main()
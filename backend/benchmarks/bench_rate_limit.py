@@ -0,0 +1,87 @@
+# benchmarks/bench_rate_limit.py
+"""
+Rate limiting con varios procesos (simula N workers de uvicorn).
+
+Cada proceso lanza peticiones contra el mismo conjunto de claves. Con el
+backend "memory" cada worker tiene sus propios buckets y el total admitido
+crece con N. Con "sqlite" el límite se mantiene para todo el host. También
+se mide el coste medio de cada comprobación.
+
+    python -m benchmarks.bench_rate_limit [--procesos 4] [--peticiones 20000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks._comun import preparar_entorno
+
+preparar_entorno()
+
+from app.middleware.rate_limiter import (  # noqa: E402
+    SQLiteTokenBucketLimiter,
+    TokenBucketLimiter,
+)
+
+CAPACIDAD = 100
+# Recarga casi nula: lo admitido por clave debería ser ~CAPACIDAD en todo el host
+TASA = 0.001
+
+
+def crear_limitador(backend: str, ruta: str):
+    if backend == "sqlite":
+        return SQLiteTokenBucketLimiter(ruta, CAPACIDAD, TASA, max_keys=100000)
+    return TokenBucketLimiter(CAPACIDAD, TASA, max_keys=100000)
+
+
+def trabajador(backend, ruta, claves, peticiones, salida):
+    limitador = crear_limitador(backend, ruta)
+    admitidas = 0
+    inicio = time.perf_counter()
+    for i in range(peticiones):
+        if limitador.consume(f"10.0.0.{i % claves}") == 0.0:
+            admitidas += 1
+    salida.put((admitidas, time.perf_counter() - inicio))
+
+
+def ejecutar(backend, procesos, claves, peticiones):
+    ruta = os.path.join(tempfile.mkdtemp(prefix="kerapido_rl_"), "rate_limit.db")
+    if backend == "sqlite":
+        # Crea la tabla antes de arrancar los workers
+        crear_limitador(backend, ruta)._connection()
+    salida = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=trabajador, args=(backend, ruta, claves, peticiones, salida))
+        for _ in range(procesos)
+    ]
+    for w in workers:
+        w.start()
+    resultados = [salida.get() for _ in workers]
+    for w in workers:
+        w.join()
+
+    admitidas = sum(r[0] for r in resultados)
+    us_por_comprobacion = sum(r[1] for r in resultados) / (procesos * peticiones) * 1e6
+    esperado = claves * CAPACIDAD
+    print(
+        f"{backend:<7} procesos={procesos}  admitidas={admitidas:>7}  "
+        f"límite_esperado={esperado:>6}  exceso={admitidas / esperado:5.2f}x  "
+        f"coste={us_por_comprobacion:7.2f} µs/comprobación"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--claves", type=int, default=50)
+    parser.add_argument("--peticiones", type=int, default=20000, help="por proceso")
+    args = parser.parse_args()
+
+    for backend in ("memory", "sqlite"):
+        ejecutar(backend, args.procesos, args.claves, args.peticiones)
+
+
+if __name__ == "__main__":
+    main()
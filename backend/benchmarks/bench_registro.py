@@ -0,0 +1,116 @@
+# benchmarks/bench_registro.py
+"""
+Rendimiento del alta de clientes (/registro/cliente y /auth/signup).
+
+"dos transacciones" reproduce el flujo anterior: SELECT previo del email,
+INSERT del usuario, commit y refresh; SELECT previo del cliente, INSERT,
+commit y refresh. "una transacción" es `crud.create_usuario_cliente`: dos
+INSERT y un único commit, con los duplicados detectados por los índices
+únicos.
+
+bcrypt se baja al mínimo de rondas para que el coste medido sea el de la
+base de datos y no el del hash.
+
+    python -m benchmarks.bench_registro [--altas 2000] [--hilos 8]
+"""
+
+import argparse
+import threading
+import time
+from itertools import count
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, silenciar_logs
+
+preparar_entorno("registro.db")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models, schemas, security  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.exceptions import ConflictException  # noqa: E402
+
+SesionAnterior = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_secuencia = count(1)
+
+
+def datos_alta() -> schemas.UsuarioCreate:
+    n = next(_secuencia)
+    return schemas.UsuarioCreate(
+        nombre="Cliente",
+        apellidos="Benchmark",
+        telefono=f"5{n:08d}",
+        email=f"cliente{n}@kerapido.cu",
+        password="Secreto123!",
+        carnet_identidad=f"900101{n:05d}",
+    )
+
+
+def alta_dos_transacciones(datos):
+    with SesionAnterior() as db:
+        if db.query(models.Usuario).filter(models.Usuario.email == datos.email).first():
+            raise ConflictException(detail="El correo electrónico ya está registrado.")
+        usuario = crud._nuevo_usuario(datos)
+        db.add(usuario)
+        db.commit()
+        db.refresh(usuario)
+        if db.query(models.Cliente).filter(models.Cliente.id_usuario == usuario.id_usuario).first():
+            raise ConflictException(detail="Ya es cliente.")
+        cliente = models.Cliente(id_usuario=usuario.id_usuario)
+        db.add(cliente)
+        db.commit()
+        db.refresh(cliente)
+
+
+def alta_una_transaccion(datos):
+    with SessionLocal() as db:
+        crud.create_usuario_cliente(db, datos)
+
+
+def ejecutar(nombre, alta, altas, hilos):
+    lotes = [[datos_alta() for _ in range(altas // hilos)] for _ in range(hilos)]
+    tiempos, lock = [], threading.Lock()
+    sentencias = [0]
+
+    def contar(*_):
+        sentencias[0] += 1
+
+    def trabajador(lote):
+        propios = []
+        for datos in lote:
+            inicio = time.perf_counter()
+            alta(datos)
+            propios.append(time.perf_counter() - inicio)
+        with lock:
+            tiempos.extend(propios)
+
+    event.listen(engine, "before_cursor_execute", contar)
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=trabajador, args=(lote,)) for lote in lotes]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = time.perf_counter() - inicio
+    event.remove(engine, "before_cursor_execute", contar)
+
+    print(resumen_ms(nombre, tiempos), f" {len(tiempos) / total:8.0f} altas/s  "
+          f"{sentencias[0] / len(tiempos):.1f} sentencias/alta")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--altas", type=int, default=2000)
+    parser.add_argument("--hilos", type=int, default=8)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    security.pwd_context.update(bcrypt__rounds=4)
+
+    ejecutar("dos transacciones (anterior)", alta_dos_transacciones, args.altas, args.hilos)
+    ejecutar("una transacción (actual)", alta_una_transaccion, args.altas, args.hilos)
+
+
+if __name__ == "__main__":
+    main()
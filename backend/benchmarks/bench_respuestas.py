@@ -0,0 +1,65 @@
+# benchmarks/bench_respuestas.py
+"""
+Sondeo de endpoints de detalle con y sin la caché de respuestas.
+
+Un conductor consulta en bucle sus vehículos, sus servicios y /users/me,
+como hacen las apps cada pocos segundos. "sin caché" vacía la caché antes
+de cada petición (dependencias, sesión, consultas y serialización); "caché"
+sirve los bytes guardados y "304" revalida con If-None-Match.
+
+    python -m benchmarks.bench_respuestas [--peticiones 3000]
+"""
+
+import argparse
+import time
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("respuestas.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models, security  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.respuesta_cache import respuesta_cache  # noqa: E402
+
+ID_CONDUCTOR = 3
+RUTAS = [f"/vehiculos/conductor/{ID_CONDUCTOR}", f"/conductores/servicios/{ID_CONDUCTOR}", "/users/me"]
+
+
+def medir(cliente, cabeceras, peticiones, vaciar=False, etags=None):
+    tiempos = []
+    for i in range(peticiones):
+        ruta = RUTAS[i % len(RUTAS)]
+        extra = {"If-None-Match": etags[ruta]} if etags else {}
+        if vaciar:
+            respuesta_cache.clear()
+        inicio = time.perf_counter()
+        respuesta = cliente.get(ruta, headers={**cabeceras, **extra})
+        tiempos.append(time.perf_counter() - inicio)
+        assert respuesta.status_code == (304 if etags else 200), respuesta.status_code
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=3000)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+    with SessionLocal() as db:
+        email = db.get(models.Conductor, ID_CONDUCTOR).usuario.email
+    cabeceras = {"Authorization": f"Bearer {security.create_access_token({'sub': email})}"}
+
+    with TestClient(app) as cliente:
+        etags = {ruta: cliente.get(ruta, headers=cabeceras).headers["etag"] for ruta in RUTAS}
+        print(resumen_ms("sin caché", medir(cliente, cabeceras, args.peticiones, vaciar=True)))
+        print(resumen_ms("caché", medir(cliente, cabeceras, args.peticiones)))
+        print(resumen_ms("304 con If-None-Match", medir(cliente, cabeceras, args.peticiones, etags=etags)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_serializacion.py
+"""
+Serialización de 1.000 filas de `SolicitudInDB` por cada camino de respuesta.
+
+- "FastAPI + json": lo que hace FastAPI con response_model: valida los objetos
+  ORM, los vuelca a dicts en modo JSON y los codifica con la stdlib.
+- "FastAPI + orjson": igual, con ORJSONResponse (default_response_class).
+- "respuesta_modelo": validación y dump_json en pydantic-core en una pasada,
+  con el TypeAdapter cacheado.
+
+Comprueba antes que los tres producen el mismo JSON.
+
+    python -m benchmarks.bench_serializacion [--filas 1000] [--repeticiones 200]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from benchmarks._comun import crear_esquema, preparar_entorno, resumen_ms, sembrar_datos, silenciar_logs
+
+preparar_entorno("serializacion.db")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app import crud, schemas  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.utils.serializacion import respuesta_modelo  # noqa: E402
+
+CAMPO = create_response_field(name="Response_get_all_solicitudes", type_=List[schemas.SolicitudInDB])
+
+
+BUCLE = asyncio.new_event_loop()
+
+
+def por_fastapi(clase_respuesta):
+    def serializar(filas):
+        contenido = BUCLE.run_until_complete(serialize_response(field=CAMPO, response_content=filas))
+        return clase_respuesta(contenido).body
+
+    return serializar
+
+
+CAMINOS = {
+    "FastAPI + json": por_fastapi(JSONResponse),
+    "FastAPI + orjson": por_fastapi(ORJSONResponse),
+    "respuesta_modelo": lambda filas: respuesta_modelo(List[schemas.SolicitudInDB], filas).body,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    sembrar_datos(0.05)
+    with SessionLocal() as db:
+        filas = crud.get_solicitudes(db, limit=args.filas)
+
+    referencia = json.loads(CAMINOS["FastAPI + json"](filas))
+    for nombre, serializar in CAMINOS.items():
+        assert json.loads(serializar(filas)) == referencia, f"{nombre} no produce el mismo JSON"
+
+    print(f"== {len(filas)} SolicitudInDB")
+    for nombre, serializar in CAMINOS.items():
+        tiempos = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            serializar(filas)
+            tiempos.append(time.perf_counter() - inicio)
+        print(resumen_ms(nombre, tiempos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_sqlite.py
+"""
+Concurrencia de escritura/lectura sobre una copia de `db/sql_app.db`.
+
+Compara el engine anterior (solo check_same_thread=False: journal de
+rollback, synchronous=FULL, sin busy_timeout) con el perfil de producción de
+`app.database.build_engine`. Hay hilos escritores que insertan en
+`registro_actividades` con un commit por fila y lectores que consultan
+catálogos y el propio registro. La base original nunca se modifica.
+
+    python -m benchmarks.bench_sqlite [--escritores 4] [--lectores 16] [--segundos 5]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks._comun import preparar_entorno, resumen_ms
+
+preparar_entorno()
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.database import build_engine  # noqa: E402
+
+DB_ORIGEN = os.path.join(os.path.dirname(__file__), "..", "..", "db", "sql_app.db")
+
+
+def copia_de_la_base() -> str:
+    destino = os.path.join(tempfile.mkdtemp(prefix="kerapido_sqlite_"), "sql_app.db")
+    shutil.copyfile(DB_ORIGEN, destino)
+    return destino
+
+
+def ejecutar(nombre, engine, escritores, lectores, segundos):
+    fin = time.perf_counter() + segundos
+    escrituras, lecturas, bloqueos = [], [], [0]
+    lock = threading.Lock()
+
+    def escritor(n):
+        propias = []
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO registro_actividades (accion, recurso_afectado_tipo, fecha_hora) "
+                             "VALUES (:accion, 'bench', CURRENT_TIMESTAMP)"),
+                        {"accion": f"escritor-{n}"},
+                    )
+                propias.append(time.perf_counter() - inicio)
+            except OperationalError:
+                with lock:
+                    bloqueos[0] += 1
+        with lock:
+            escrituras.extend(propias)
+
+    def lector():
+        propias = []
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT * FROM tipos_servicio")).all()
+                    conn.execute(
+                        text("SELECT * FROM registro_actividades ORDER BY id_registro DESC LIMIT 20")
+                    ).all()
+                propias.append(time.perf_counter() - inicio)
+            except OperationalError:
+                with lock:
+                    bloqueos[0] += 1
+        with lock:
+            lecturas.extend(propias)
+
+    hilos = [threading.Thread(target=escritor, args=(i,)) for i in range(escritores)]
+    hilos += [threading.Thread(target=lector) for _ in range(lectores)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    engine.dispose()
+
+    print(f"== {nombre}")
+    print(resumen_ms("escrituras (commit por fila)", escrituras), f" {len(escrituras) / segundos:8.0f}/s")
+    print(resumen_ms("lecturas", lecturas), f" {len(lecturas) / segundos:8.0f}/s")
+    print(f"{'errores database is locked':<40} {bloqueos[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--lectores", type=int, default=16)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    args = parser.parse_args()
+
+    anterior = create_engine(
+        f"sqlite:///{copia_de_la_base()}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.escritores + args.lectores,
+    )
+    ejecutar("engine anterior", anterior, args.escritores, args.lectores, args.segundos)
+
+    produccion = build_engine(f"sqlite:///{copia_de_la_base()}")
+    ejecutar("perfil de producción", produccion, args.escritores, args.lectores, args.segundos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+# benchmarks/verificar_planes.py
+"""
+Verificación de planes de consulta de `app/crud.py`.
+
+Siembra una base SQLite con volumen realista (`sembrar_datos`) y ejecuta cada
+función pública de `crud.py` capturando las sentencias que emite. Falla si:
+
+- el `EXPLAIN QUERY PLAN` de alguna sentencia contiene un `SCAN` completo de
+  una tabla grande que esa función no tenga permitido,
+- la función emite más sentencias que su presupuesto,
+- hay funciones en `crud.py` sin caso definido aquí,
+- la paginación por cursor repite o pierde filas creadas con los valores por
+  defecto del modelo (no con las fechas explícitas de `sembrar_datos`).
+
+Termina con código 1 si hay fallos, para usarlo en CI. La suite de pytest
+lo ejecuta en `tests/test_planes.py`:
+
+    python -m benchmarks.verificar_planes [--escala 0.2] [-v]
+    python -m pytest -q   # pip install -r requirements-dev.txt
+
+Al añadir una función a `crud.py` hay que añadir su caso en `CASOS`.
+"""
+
+import argparse
+import inspect
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable
+
+from benchmarks._comun import crear_esquema, preparar_entorno, sembrar_datos, silenciar_logs
+
+preparar_entorno("planes.db")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import crud, schemas  # noqa: E402
+from app.exceptions import BadRequestException  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.utils.paginacion import codificar_cursor, siguiente_cursor  # noqa: E402
+
+# Tablas con menos filas que esto se consideran catálogos: recorrerlas es lo esperado
+UMBRAL_TABLA_GRANDE = 100
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+@dataclass
+class Caso:
+    llamada: Callable
+    presupuesto: int
+    # Tablas grandes que la función puede recorrer (p. ej. listados con LIMIT)
+    escaneos_permitidos: frozenset = field(default_factory=frozenset)
+
+
+def _usuario_nuevo(ctx):
+    return schemas.UsuarioCreate(
+        nombre="Plan",
+        apellidos="Consulta",
+        telefono="599999999",
+        email="planes@kerapido.cu",
+        password="Secreto123!",
+        carnet_identidad="85010112345",
+    )
+
+
+def _actualizar_precio_como_router(db, ctx):
+    # Como en PUT /asignaciones/{id}/precio: detalle para autorizar y luego actualizar
+    # sobre la misma instancia, que sigue en la identity map de la sesión
+    asignacion = crud.get_asignacion_detalle(db, 1)
+    assert asignacion.conductor.id_usuario
+    return crud.update_asignacion_precio(db, asignacion.id_asignacion, 999.0)
+
+
+# Cada llamada recibe (db, ctx); `ctx` comparte ids entre casos (se ejecutan en orden)
+CASOS = {
+    # --- Usuario ---
+    "get_usuario": Caso(lambda db, ctx: crud.get_usuario(db, ctx["usuario"]), 1),
+    # Por lotes: un IN por cada 500 ids
+    "get_usuarios_by_ids": Caso(lambda db, ctx: crud.get_usuarios_by_ids(db, range(1, 1000, 3)), 1),
+    "get_usuario_by_email": Caso(lambda db, ctx: crud.get_usuario_by_email(db, "usuario10@kerapido.cu"), 1),
+    # Los listados se verifican en una página intermedia, por cursor
+    "get_usuarios": Caso(lambda db, ctx: crud.get_usuarios(db, limit=100, cursor=codificar_cursor([500])), 1),
+    "create_usuario": Caso(
+        lambda db, ctx: ctx.update(nuevo=crud.create_usuario(db, _usuario_nuevo(ctx)).id_usuario), 1
+    ),
+    # Alta de usuario + cliente: dos INSERT, un commit
+    "create_usuario_cliente": Caso(
+        lambda db, ctx: crud.create_usuario_cliente(
+            db,
+            schemas.UsuarioCreate(
+                nombre="Registro", apellidos="Cliente", telefono="577777777",
+                email="registro@kerapido.cu", password="Secreto123!", carnet_identidad="92030354321",
+            ),
+        ),
+        2,
+    ),
+    "update_usuario": Caso(
+        lambda db, ctx: crud.update_usuario(db, ctx["nuevo"], schemas.UsuarioUpdate(nombre="Planes", email="planes@kerapido.cu")), 2
+    ),
+    "delete_usuario": Caso(lambda db, ctx: crud.delete_usuario(db, ctx["nuevo"]), 4),
+    # --- Cliente ---
+    "get_cliente": Caso(lambda db, ctx: crud.get_cliente(db, 1), 1),
+    "create_cliente": Caso(
+        lambda db, ctx: crud.create_cliente(db, schemas.ClienteCreate(id_usuario=ctx["sin_rol"], id_tipo_cliente=1)), 2
+    ),
+    "get_cliente_by_user_id": Caso(lambda db, ctx: crud.get_cliente_by_user_id(db, 1), 1),
+    # --- Conductor ---
+    "get_conductor": Caso(lambda db, ctx: crud.get_conductor(db, 1), 1),
+    "get_conductores_by_ids": Caso(lambda db, ctx: crud.get_conductores_by_ids(db, range(1, 1000, 20)), 1),
+    "create_conductor": Caso(
+        lambda db, ctx: crud.create_conductor(
+            db, schemas.ConductorCreate(id_usuario=ctx["sin_rol"], numero_licencia="LIC-PLANES")
+        ),
+        2,
+    ),
+    "get_conductores": Caso(lambda db, ctx: crud.get_conductores(db, limit=100, cursor=codificar_cursor([500])), 1),
+    # --- Vehiculo ---
+    "get_vehiculo": Caso(lambda db, ctx: crud.get_vehiculo(db, 1), 1),
+    "get_vehiculos_by_ids": Caso(lambda db, ctx: crud.get_vehiculos_by_ids(db, range(1, 1000, 20)), 1),
+    "get_vehiculos_by_conductor": Caso(lambda db, ctx: crud.get_vehiculos_by_conductor(db, 1), 1),
+    "create_vehiculo": Caso(
+        lambda db, ctx: crud.create_vehiculo(
+            db,
+            schemas.VehiculoCreate(
+                marca="Moskvich", modelo="412", matricula="PLAN001", id_tipo_vehiculo=1, id_conductor=1
+            ),
+        ),
+        2,
+    ),
+    # --- Solicitud ---
+    "get_solicitud": Caso(lambda db, ctx: crud.get_solicitud(db, 1), 1),
+    "get_solicitudes_by_ids": Caso(
+        lambda db, ctx: crud.get_solicitudes_by_ids(db, range(1, 1000, 2), campos=("id_estado_solicitud",)), 1
+    ),
+    "get_solicitudes": Caso(
+        lambda db, ctx: crud.get_solicitudes(db, limit=100, cursor=codificar_cursor([datetime(2024, 1, 1, 12), 1440])), 1
+    ),
+    "get_solicitudes_by_cliente": Caso(lambda db, ctx: crud.get_solicitudes_by_cliente(db, 1), 1),
+    "create_solicitud": Caso(
+        lambda db, ctx: ctx.update(
+            solicitud=crud.create_solicitud(
+                db, schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1)
+            ).id_solicitud
+        ),
+        1,
+    ),
+    # Serializa el viaje completo como GET /viajes/{id}: ninguna relación debe cargarse aparte
+    "get_viaje": Caso(
+        lambda db, ctx: schemas.ViajeDetalle.model_validate(crud.get_viaje(db, 1)).model_dump(), 1
+    ),
+    # --- Asignacion ---
+    "get_asignacion": Caso(lambda db, ctx: crud.get_asignacion(db, 1), 1),
+    # Incluye la comprobación de participantes de routers/asignaciones: no debe haber cargas perezosas
+    "get_asignacion_detalle": Caso(
+        lambda db, ctx: (
+            lambda a: (a.solicitud.cliente.id_usuario, a.conductor.id_usuario)
+        )(crud.get_asignacion_detalle(db, 1)),
+        1,
+    ),
+    "get_asignaciones_by_conductor": Caso(lambda db, ctx: crud.get_asignaciones_by_conductor(db, 1), 1),
+    "create_asignacion": Caso(
+        lambda db, ctx: ctx.update(
+            asignacion=crud.create_asignacion(
+                db, schemas.AsignacionCreate(id_solicitud=ctx["solicitud"], id_conductor=1, id_vehiculo=1)
+            ).id_asignacion
+        ),
+        2,
+    ),
+    "update_asignacion_precio": Caso(_actualizar_precio_como_router, 2),
+    # --- TransaccionPago ---
+    "get_transaccion_pago": Caso(lambda db, ctx: crud.get_transaccion_pago(db, 1), 1),
+    "create_transaccion_pago": Caso(
+        lambda db, ctx: crud.create_transaccion_pago(
+            db,
+            schemas.TransaccionPagoCreate(
+                monto=100.0,
+                id_moneda=1,
+                id_tipo_metodo_pago=1,
+                id_canal_pago=1,
+                id_estado_pago=1,
+                id_asignacion=ctx["asignacion"],
+                id_usuario=1,
+            ),
+        ),
+        1,
+    ),
+    # --- Notificacion ---
+    "get_notificaciones_by_user": Caso(lambda db, ctx: crud.get_notificaciones_by_user(db, 1), 1),
+    # Conteo del segmento (recorre usuarios) y un INSERT ... SELECT por rango de ids
+    "difundir_notificacion": Caso(
+        lambda db, ctx: crud.difundir_notificacion(
+            db,
+            schemas.DifusionCreate(
+                titulo="Aviso", mensaje="A todos los clientes", segmento=schemas.SegmentoNotificacion(es_cliente=True)
+            ),
+            tamano_bloque=100000,
+        ),
+        2,
+        frozenset({"usuarios"}),
+    ),
+    "create_notificacion": Caso(
+        lambda db, ctx: crud.create_notificacion(
+            db, schemas.NotificacionCreate(titulo="Aviso", mensaje="Prueba", id_usuario=1)
+        ),
+        1,
+    ),
+    # --- Incidente ---
+    "get_incidente": Caso(lambda db, ctx: crud.get_incidente(db, 1), 1),
+    "create_incidente": Caso(
+        lambda db, ctx: crud.create_incidente(
+            db, schemas.IncidenteCreate(descripcion="Pinchazo", id_tipo_incidente=1, id_usuario=1, id_solicitud=1)
+        ),
+        1,
+    ),
+    # --- Ruta ---
+    "get_ruta": Caso(lambda db, ctx: crud.get_ruta(db, 1), 1),
+    "get_rutas": Caso(lambda db, ctx: crud.get_rutas(db, limit=100, cursor=codificar_cursor([50])), 1),
+    "create_ruta": Caso(
+        lambda db, ctx: crud.create_ruta(
+            db, schemas.RutaCreate(nombre="Habana-Matanzas", origen_lat=23.1, origen_lon=-82.3, destino_lat=23.0, destino_lon=-81.5)
+        ),
+        1,
+    ),
+    # --- ConductorServicio ---
+    "create_conductor_servicio": Caso(
+        lambda db, ctx: crud.create_conductor_servicio(
+            db, schemas.ConductorServicioCreate(id_conductor=1, id_tipo_servicio=5, fecha_habilitacion=date(2024, 1, 1))
+        ),
+        2,
+    ),
+    "get_servicios_by_conductor": Caso(lambda db, ctx: crud.get_servicios_by_conductor(db, 1), 1),
+    "get_conductor_by_user_id": Caso(lambda db, ctx: crud.get_conductor_by_user_id(db, 15001), 1),
+    # --- Lotes: una consulta por FK validada (IN por bloques), un executemany y el max(id) ---
+    "create_solicitudes_bulk": Caso(
+        lambda db, ctx: crud.create_solicitudes_bulk(
+            db,
+            [
+                schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1 + i)
+                for i in range(200)
+            ],
+        ),
+        5,
+    ),
+    "create_notificaciones_bulk": Caso(
+        lambda db, ctx: crud.create_notificaciones_bulk(
+            db, [schemas.NotificacionCreate(titulo="Aviso", mensaje="Lote", id_usuario=1 + i) for i in range(200)]
+        ),
+        3,
+    ),
+    "create_conductor_servicios_bulk": Caso(
+        lambda db, ctx: crud.create_conductor_servicios_bulk(
+            db,
+            [
+                schemas.ConductorServicioCreate(id_conductor=2 + i, id_tipo_servicio=5, fecha_habilitacion=date(2024, 1, 1))
+                for i in range(200)
+            ],
+        ),
+        4,
+    ),
+    # --- Catálogos ---
+    **{
+        nombre: Caso(lambda db, ctx, f=getattr(crud, nombre): f(db), 1)
+        for nombre in (
+            "get_tipos_cliente",
+            "get_estados_conductor",
+            "get_tipos_vehiculo",
+            "get_estados_vehiculo",
+            "get_tipos_servicio",
+            "get_estados_solicitud",
+            "get_all_tipos_carga",
+            "get_all_tipos_incidente",
+            "get_all_estados_incidente",
+            "get_all_estados_reserva",
+            "get_all_monedas",
+            "get_all_tipos_metodo_pago",
+            "get_all_canales_pago",
+            "get_all_estados_pago",
+            "get_all_tipos_tarifa",
+            "get_all_tarifas",
+        )
+    },
+}
+
+
+class CapturaSentencias:
+    """Registra las sentencias que el engine envía a SQLite mientras está activa."""
+
+    def __init__(self, bind):
+        self.activa = False
+        self.sentencias = []
+        event.listen(bind, "before_cursor_execute", self._registrar)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        if self.activa:
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            self.sentencias.append((statement, parameters))
+
+    def __enter__(self):
+        self.sentencias = []
+        self.activa = True
+        return self
+
+    def __exit__(self, *exc):
+        self.activa = False
+
+
+def plan_de(statement, parameters) -> list[str]:
+    with engine.connect() as conn:
+        filas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [fila[-1] for fila in filas]
+
+
+def funciones_de_crud() -> list[str]:
+    return [
+        nombre
+        for nombre, objeto in inspect.getmembers(crud, inspect.isfunction)
+        if objeto.__module__ == crud.__name__ and not nombre.startswith("_")
+    ]
+
+
+def verificar(caso_nombre, caso, captura, tablas_grandes, ctx, verbose) -> list[str]:
+    fallos = []
+    db = SessionLocal()
+    try:
+        with captura:
+            caso.llamada(db, ctx)
+    except Exception as exc:  # noqa: BLE001
+        return [f"{caso_nombre}: lanzó {type(exc).__name__}: {exc}"]
+    finally:
+        db.close()
+
+    sentencias = captura.sentencias
+    if len(sentencias) > caso.presupuesto:
+        fallos.append(f"{caso_nombre}: {len(sentencias)} sentencias (presupuesto {caso.presupuesto})")
+
+    for statement, parameters in sentencias:
+        inicio = statement.lstrip().upper()
+        # INSERT ... VALUES no tiene plan; INSERT ... SELECT sí
+        if not inicio.startswith(("SELECT", "UPDATE", "DELETE", "WITH")) and not (
+            inicio.startswith("INSERT") and "SELECT" in inicio
+        ):
+            continue
+        plan = plan_de(statement, parameters)
+        if verbose:
+            print(f"  {caso_nombre}: {' '.join(statement.split())[:100]}")
+            for linea in plan:
+                print(f"      {linea}")
+        for linea in plan:
+            coincide = _SCAN.match(linea)
+            if not coincide:
+                continue
+            tabla = coincide.group(1)
+            if tabla in tablas_grandes and tabla not in caso.escaneos_permitidos:
+                fallos.append(f"{caso_nombre}: {linea!r} en «{' '.join(statement.split())[:120]}»")
+    return fallos
+
+
+def verificar_cursor_solicitudes(limite: int = 3, nuevas: int = 10) -> list[str]:
+    """
+    Crea `nuevas` solicitudes con crud.create_solicitud (fecha por defecto del
+    modelo, casi todas en el mismo segundo) y recorre get_solicitudes por
+    cursor: las primeras páginas deben devolverlas una sola vez cada una.
+    Un cursor con valores del tipo equivocado debe rechazarse (400), no dar
+    una página vacía que parezca el final de la lista.
+    """
+    with SessionLocal() as db:
+        creadas = [
+            crud.create_solicitud(
+                db, schemas.SolicitudCreate(origen_lat=23.1, origen_lon=-82.3, id_tipo_servicio=1, id_cliente=1)
+            ).id_solicitud
+            for _ in range(nuevas)
+        ]
+        vistas, cursor = [], None
+        for _ in range(-(-nuevas // limite)):
+            filas = crud.get_solicitudes(db, limit=limite, cursor=cursor)
+            vistas += [f.id_solicitud for f in filas]
+            cursor = siguiente_cursor(filas, limite, crud.ORDEN_SOLICITUDES)
+            if cursor is None:
+                break
+        fallos = []
+        invalidos = {
+            "get_solicitudes": [[datetime.utcnow(), "a"], [datetime.utcnow(), True], ["a", 1]],
+            "get_usuarios": [["a"], [True], [1.5]],
+        }
+        for nombre, cursores in invalidos.items():
+            for valores in cursores:
+                try:
+                    filas = getattr(crud, nombre)(db, limit=limite, cursor=codificar_cursor(valores))
+                except BadRequestException:
+                    continue
+                except Exception as exc:  # p. ej. ArgumentError de SQLAlchemy: sería un 500
+                    fallos.append(f"cursor de {nombre}: {valores!r} -> {type(exc).__name__} en vez de 400")
+                    continue
+                fallos.append(f"cursor de {nombre}: {valores!r} aceptado ({len(filas)} filas) en vez de 400")
+    vistas = vistas[:nuevas]
+    if vistas != sorted(creadas, reverse=True):
+        fallos.append(f"cursor de get_solicitudes: esperadas {sorted(creadas, reverse=True)}, recorridas {vistas}")
+    return fallos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escala", type=float, default=0.2)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    silenciar_logs()
+    crear_esquema()
+    conteos = sembrar_datos(args.escala)
+    tablas_grandes = {tabla for tabla, n in conteos.items() if n >= UMBRAL_TABLA_GRANDE}
+
+    # Usuario sin cliente ni conductor, para los casos que crean esos roles
+    with SessionLocal() as db:
+        ctx = {
+            "usuario": 1,
+            "sin_rol": crud.create_usuario(
+                db,
+                schemas.UsuarioCreate(
+                    nombre="Sin", apellidos="Rol", telefono="588888888",
+                    email="sinrol@kerapido.cu", password="Secreto123!", carnet_identidad="90020254321",
+                ),
+            ).id_usuario,
+        }
+
+    captura = CapturaSentencias(engine)
+    fallos = []
+    sin_caso = sorted(set(funciones_de_crud()) - set(CASOS))
+    fallos += [f"{nombre}: sin caso en verificar_planes.CASOS" for nombre in sin_caso]
+
+    for nombre, caso in CASOS.items():
+        resultado = verificar(nombre, caso, captura, tablas_grandes, ctx, args.verbose)
+        estado = "FALLO" if resultado else "ok"
+        print(f"{nombre:<32} {len(captura.sentencias):>2}/{caso.presupuesto:<2} sentencias  {estado}")
+        fallos += resultado
+
+    resultado = verificar_cursor_solicitudes()
+    print(f"{'cursores':<32} {'FALLO' if resultado else 'ok'}")
+    fallos += resultado
+
+    if fallos:
+        print(f"\n{len(fallos)} fallos:")
+        for fallo in fallos:
+            print(f"  - {fallo}")
+        sys.exit(1)
+    print(f"\nTodas las funciones de crud.py ({len(CASOS)}) dentro de plan y presupuesto.")
+
+
+if __name__ == "__main__":
+    main()
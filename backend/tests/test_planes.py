@@ -0,0 +1,26 @@
+# tests/test_planes.py
+"""
+Ejecuta `benchmarks.verificar_planes` como parte de la suite:
+
+    cd backend && python -m pytest -q
+
+Va en un subproceso porque el script configura la base temporal antes de
+importar `app` (la configuración y el engine se crean al importar).
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_planes_y_presupuesto_de_crud():
+    resultado = subprocess.run(
+        [sys.executable, "-m", "benchmarks.verificar_planes"],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        timeout=900,
+    )
+    assert resultado.returncode == 0, resultado.stdout[-4000:] + resultado.stderr[-4000:]
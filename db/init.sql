@@ -112,7 +112,7 @@ CREATE TABLE usuarios (
 CREATE TABLE clientes (
     id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
     id_tipo_cliente INTEGER,
-    id_usuario INTEGER NOT NULL,
+    id_usuario INTEGER UNIQUE NOT NULL,
     FOREIGN KEY (id_tipo_cliente) REFERENCES tipos_cliente(id_tipo_cliente),
     FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
 );
@@ -123,7 +123,7 @@ CREATE TABLE conductores (
     fecha_vencimiento_licencia DATE,
     id_estado_conductor INTEGER NOT NULL DEFAULT 1,
     calificacion_promedio REAL DEFAULT 0.0,
-    id_usuario INTEGER NOT NULL,
+    id_usuario INTEGER UNIQUE NOT NULL,
     FOREIGN KEY (id_estado_conductor) REFERENCES estados_conductor(id_estado_conductor),
     FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
 );
@@ -300,6 +300,22 @@ CREATE TABLE IF NOT EXISTS registro_actividades (
     FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario) ON DELETE SET NULL
 );
 
+-- Trabajos en segundo plano (difusiones); el progreso se guarda por bloque para poder retomarlos
+CREATE TABLE IF NOT EXISTS trabajos (
+    id_trabajo VARCHAR(32) PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    total INTEGER,
+    procesados INTEGER NOT NULL DEFAULT 0,
+    ultimo_id INTEGER,
+    propietario TEXT,
+    creado DATETIME NOT NULL,
+    actualizado DATETIME NOT NULL,
+    terminado DATETIME,
+    error TEXT
+);
+
 -- ******************************************************************************
 -- INSERCIÓN DE DATOS INICIALES EN LAS TABLAS DE CATÁLOGO
 -- ******************************************************************************
@@ -412,3 +428,26 @@ INSERT INTO tipos_tarifa (nombre, descripcion) VALUES
 ('Por Tiempo', 'Tarifa basada en la duración del servicio'),
 ('Tarifa Fija', 'Precio preestablecido para una ruta o servicio'),
 ('Tarifa por Paquete', 'Tarifa por el tipo de paquete/servicio de carga');
+
+-- ******************************************************************************
+-- ÍNDICES PARA LAS CLAVES FORÁNEAS QUE FILTRA LA CAPA CRUD
+-- (mismos nombres que en models.py; app/migrations.py los añade a bases existentes)
+-- ******************************************************************************
+
+CREATE INDEX IF NOT EXISTS ix_conductores_id_estado_conductor ON conductores (id_estado_conductor);
+CREATE INDEX IF NOT EXISTS ix_vehiculos_id_conductor ON vehiculos (id_conductor);
+CREATE INDEX IF NOT EXISTS ix_vehiculos_id_estado_vehiculo ON vehiculos (id_estado_vehiculo);
+CREATE INDEX IF NOT EXISTS ix_solicitudes_id_cliente ON solicitudes (id_cliente);
+CREATE INDEX IF NOT EXISTS ix_solicitudes_id_cliente_fecha ON solicitudes (id_cliente, fecha_hora_solicitud);
+CREATE INDEX IF NOT EXISTS ix_solicitudes_fecha_id ON solicitudes (fecha_hora_solicitud, id_solicitud);
+CREATE INDEX IF NOT EXISTS ix_solicitudes_id_estado_solicitud ON solicitudes (id_estado_solicitud);
+CREATE INDEX IF NOT EXISTS ix_asignaciones_id_conductor ON asignaciones (id_conductor);
+CREATE INDEX IF NOT EXISTS ix_asignaciones_id_conductor_fecha ON asignaciones (id_conductor, fecha_hora_inicio_asignacion);
+CREATE INDEX IF NOT EXISTS ix_asignaciones_id_solicitud ON asignaciones (id_solicitud);
+CREATE INDEX IF NOT EXISTS ix_asignaciones_id_vehiculo ON asignaciones (id_vehiculo);
+CREATE INDEX IF NOT EXISTS ix_transacciones_pago_id_solicitud ON transacciones_pago (id_solicitud);
+CREATE INDEX IF NOT EXISTS ix_transacciones_pago_id_cliente ON transacciones_pago (id_cliente);
+CREATE INDEX IF NOT EXISTS ix_transacciones_pago_id_estado_pago ON transacciones_pago (id_estado_pago);
+CREATE INDEX IF NOT EXISTS ix_incidente_emergencia_id_solicitud ON incidente_emergencia (id_solicitud);
+CREATE INDEX IF NOT EXISTS ix_incidente_emergencia_id_estado_incidente ON incidente_emergencia (id_estado_incidente);
+CREATE INDEX IF NOT EXISTS ix_trabajos_estado_actualizado ON trabajos (estado, actualizado);
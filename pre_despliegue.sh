@@ -30,6 +30,9 @@ echo "🚀 Iniciando despliegue del contenedor..."
 docker-compose down --remove-orphans --volumes --rmi all
 docker-compose up --build -d
 
+echo "🗂️  Aplicando índices pendientes a la base existente..."
+docker-compose exec -T api python -m app.migrations
+
 echo "📋 Mostrando logs en tiempo real:"
 docker-compose logs -f --tail=50
 